@@ -1,6 +1,4 @@
-from grammar import Grammar
-from parser import create_parser
-from generator import StringGenerator
+from gramatica import Budget, BudgetExceeded, Grammar, StringGenerator, create_parser
 
 # Cargar la gramática
 grammar = Grammar.load_from_file("punto2.json")
@@ -29,9 +27,15 @@ if is_valid:
     
     test_strings = ["a", "b", "aa", "ab", "ba", "bb", "aaa", "aab", "aba", "abb", "baa", "bab", "bba", "bbb"]
     
+    # Presupuesto por cadena para acotar la latencia ante entradas adversarias
+    budget = Budget(max_steps=1_000_000, timeout=2.0)
+    
     for test in test_strings:
-        result = parser.parse(test)
-        status = "✓ ACEPTADA" if result[0] else "✗ RECHAZADA"
+        try:
+            result = parser.parse(test, budget)
+            status = "✓ ACEPTADA" if result[0] else f"✗ RECHAZADA ({result[1]})"
+        except BudgetExceeded as e:
+            status = f"⚠ LÍMITE EXCEDIDO ({e.reason})"
         print(f"  '{test}': {status}")
     
     # Generar cadenas
@@ -40,7 +44,11 @@ if is_valid:
     print("=" * 60)
     
     generator = StringGenerator(grammar)
-    strings = generator.generate_strings(10)
+    try:
+        strings = generator.generate_strings(10, Budget(timeout=5.0))
+    except BudgetExceeded as e:
+        print(f"  ⚠ {e}; se muestran las cadenas obtenidas hasta entonces")
+        strings = e.partial
     
     if strings:
         for i, s in enumerate(strings, 1):
@@ -0,0 +1,93 @@
+"""
+Analizador sintáctico y generador de lenguajes para gramáticas Tipo 2 y Tipo 3
+
+El paquete se importa sin cargar ningún motor: cada nombre público se importa
+de su módulo la primera vez que se usa (PEP 562), de modo que un proceso que
+solo carga una gramática y reconoce una cadena no paga por GLR, el compilador
+de expresiones regulares, el servidor ni la interfaz gráfica.
+
+    import gramatica
+    g = gramatica.Grammar.load_from_file("punto2.json")
+    gramatica.cached_parser(g).recognize("aab")
+"""
+
+from typing import TYPE_CHECKING
+import importlib
+
+# Nombre público → módulo del paquete que lo define
+_EXPORTS = {
+    "Grammar": "grammar",
+    "FrozenGrammar": "grammar",
+    "Parser": "parser",
+    "Type2Parser": "parser",
+    "Type3Parser": "parser",
+    "ParseError": "parser",
+    "END_OF_INPUT": "parser",
+    "create_parser": "parser",
+    "cached_parser": "parser",
+    "parse_batch": "parser",
+    "load_engine_recommendations": "parser",
+    "DerivationTree": "tree",
+    "TreeNode": "tree",
+    "StringGenerator": "generator",
+    "GenerationReport": "generator",
+    "Budget": "budget",
+    "BudgetExceeded": "budget",
+    "ParseStats": "stats",
+    "ExactVisitedSet": "visited",
+    "BloomVisitedSet": "visited",
+    "SpillingVisitedSet": "visited",
+    "IncrementalParser": "incremental",
+    "GLRParser": "glr",
+    "CYKParser": "cyk",
+    "ParallelCYKParser": "cyk",
+    "RegexType3Parser": "regex_compiler",
+    "RegularScanner": "scanner",
+    "DerivationCounter": "ambiguity",
+    "run_differential": "differential",
+    "DifferentialReport": "differential",
+    "dumps": "serialize",
+    "loads": "serialize",
+    "encode_derivation": "serialize",
+    "decode_derivation": "serialize",
+    "DerivationWriter": "serialize",
+    "read_derivations": "serialize",
+    "ParseServer": "server",
+    "ParseClient": "server",
+}
+
+__all__ = sorted(_EXPORTS)
+
+if TYPE_CHECKING:
+    from .grammar import Grammar, FrozenGrammar
+    from .parser import (Parser, Type2Parser, Type3Parser, ParseError, END_OF_INPUT,
+                         create_parser, cached_parser, parse_batch, load_engine_recommendations)
+    from .tree import DerivationTree, TreeNode
+    from .generator import StringGenerator, GenerationReport
+    from .budget import Budget, BudgetExceeded
+    from .stats import ParseStats
+    from .visited import ExactVisitedSet, BloomVisitedSet, SpillingVisitedSet
+    from .incremental import IncrementalParser
+    from .glr import GLRParser
+    from .cyk import CYKParser, ParallelCYKParser
+    from .regex_compiler import RegexType3Parser
+    from .scanner import RegularScanner
+    from .ambiguity import DerivationCounter
+    from .differential import run_differential, DifferentialReport
+    from .serialize import (dumps, loads, encode_derivation, decode_derivation,
+                            DerivationWriter, read_derivations)
+    from .server import ParseServer, ParseClient
+
+
+def __getattr__(name: str):
+    """Importa el módulo que define name la primera vez que se pide"""
+    module = _EXPORTS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(f".{module}", __name__), name)
+    globals()[name] = value  # Las siguientes consultas no vuelven a pasar por aquí
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_EXPORTS))
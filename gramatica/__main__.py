@@ -0,0 +1,7 @@
+"""Permite ejecutar el paquete: python -m gramatica reconocer punto2.json aab"""
+
+import sys
+
+from .cli import main
+
+sys.exit(main())
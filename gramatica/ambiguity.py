@@ -0,0 +1,335 @@
+"""
+Módulo para contar árboles de derivación y localizar la ambigüedad
+
+Usa el algoritmo "inside" sobre una tabla de (símbolo, inicio, fin) con
+contadores enteros de precisión arbitraria: el número de árboles de una
+producción es la suma, sobre cada forma de repartir el tramo entre sus
+símbolos, del producto de los árboles de cada parte. Las producciones se
+recorren símbolo a símbolo guardando los prefijos ya reconocidos, de modo
+que el coste es O(|G|·n³) aunque las producciones sean largas, y admite
+producciones ε y terminales de varios caracteres. Como en los motores, la
+cadena se separa en terminales con GreedyLexer y solo se consideran los
+tramos entre límites de esos terminales (n es su número).
+
+Si un tramo puede derivarse de sí mismo (A → B, B → A, o A → A A con A
+anulable) y alguna de esas derivaciones termina, el número de árboles es
+infinito y se devuelve math.inf.
+
+Los símbolos se interpretan como en GLRParser: un símbolo con producciones
+es no terminal (y, si además es terminal, también puede reconocerse como
+tal), y una producción con símbolos desconocidos nunca se aplica.
+"""
+
+from typing import Dict, Iterable, Iterator, List, NamedTuple, Optional, Set, Tuple, Union
+import math
+
+from .grammar import Grammar
+from .parser import GreedyLexer, split_production, _strongly_connected_components
+from .budget import Budget, BudgetExceeded
+
+
+Count = Union[int, float]  # entero, o math.inf si hay infinitos árboles
+INFINITE = math.inf
+
+
+class Alternative(NamedTuple):
+    """Una producción aplicable a un tramo"""
+    production: str  # "A → α"
+    splits: int  # formas de repartir el tramo entre los símbolos de la producción
+    trees: Count  # árboles del tramo que empiezan por esta producción
+
+
+class AmbiguousSpan(NamedTuple):
+    """Tramo donde nace la ambigüedad: admite más de una alternativa (producción o reparto)"""
+    symbol: str
+    start: int
+    end: int
+    text: str
+    trees: Count
+    alternatives: List[Alternative]
+
+
+class AmbiguityReport(NamedTuple):
+    """Resultado del conteo de una cadena"""
+    string: str
+    trees: Count  # árboles de derivación de la cadena completa (0 si no pertenece)
+    ambiguous_spans: List[AmbiguousSpan]  # solo tramos que forman parte de algún árbol completo
+
+    @property
+    def ambiguous(self) -> bool:
+        return self.trees > 1
+
+
+class DerivationCounter:
+    """
+    Cuenta los árboles de derivación de una cadena en tiempo polinómico
+
+    Ejemplo:
+        counter = DerivationCounter(grammar)
+        report = counter.analyze("a+a*a")
+        report.trees, [(s.symbol, s.text) for s in report.ambiguous_spans]
+    """
+
+    def __init__(self, grammar: Grammar):
+        self.grammar = grammar
+        sorted_non_terminals = sorted(grammar.non_terminals, key=len, reverse=True)
+        sorted_terminals = sorted(grammar.terminals, key=len, reverse=True)
+
+        # Producciones aplicables: (izquierdo, derecho, símbolos sin ε)
+        self._productions: List[Tuple[str, str, Tuple[str, ...]]] = []
+        for left, rights in grammar.productions.items():
+            for right in rights:
+                symbols = tuple(symbol for symbol in split_production(right, sorted_non_terminals, sorted_terminals)
+                                if symbol != 'ε' and symbol != '')
+                if all(symbol in grammar.productions or symbol in grammar.terminals for symbol in symbols):
+                    self._productions.append((left, right, symbols))
+        self._by_left: Dict[str, List[int]] = {left: [] for left in grammar.productions}
+        for index, (left, _, _) in enumerate(self._productions):
+            self._by_left[left].append(index)
+        self._lexer = GreedyLexer(grammar.terminals)
+
+        self._epsilon = self._epsilon_counts()
+
+        # Dependencias dentro de un mismo tramo: A → α B β con α y β anulables
+        same_span: Dict[str, List[str]] = {left: [] for left in grammar.productions}
+        for left, _, symbols in self._productions:
+            for k, symbol in enumerate(symbols):
+                if symbol in grammar.productions and all(
+                        self._epsilon.get(other, 0) for other in symbols[:k] + symbols[k + 1:]):
+                    same_span[left].append(symbol)
+        # Componentes en orden de dependencia, marcando las que tienen ciclos
+        self._components: List[Tuple[List[str], bool]] = []
+        for component in _strongly_connected_components(same_span):
+            cyclic = len(component) > 1 or component[0] in same_span[component[0]]
+            self._components.append((component, cyclic))
+
+    def _epsilon_counts(self) -> Dict[str, Count]:
+        """Árboles de la cadena vacía para cada no terminal anulable"""
+        nullable: Set[str] = set()
+        changed = True
+        while changed:
+            changed = False
+            for left, _, symbols in self._productions:
+                if left not in nullable and all(symbol in nullable for symbol in symbols):
+                    nullable.add(left)
+                    changed = True
+
+        # Entre anulables, A depende de B si A → ...B... con todos los símbolos anulables
+        graph: Dict[str, List[str]] = {symbol: [] for symbol in nullable}
+        for left, _, symbols in self._productions:
+            if left in nullable and all(symbol in nullable for symbol in symbols):
+                graph[left].extend(symbols)
+
+        counts: Dict[str, Count] = {}
+        for component in _strongly_connected_components(graph):
+            if len(component) > 1 or component[0] in graph[component[0]]:
+                # Un ciclo entre anulables permite derivaciones vacías arbitrariamente largas
+                for symbol in component:
+                    counts[symbol] = INFINITE
+                continue
+            symbol = component[0]
+            total: Count = 0
+            for index in self._by_left.get(symbol, []):
+                _, _, symbols = self._productions[index]
+                if all(other in nullable for other in symbols):
+                    total += math.prod(counts[other] for other in symbols)
+            counts[symbol] = total
+        return counts
+
+    # Tabla
+    def _tokens(self, string: str) -> Dict[int, str]:
+        """Posición → terminal que empieza en ella según GreedyLexer"""
+        tokens, _ = self._lexer.tokenize(string)
+        starts: Dict[int, str] = {}
+        pos = 0
+        for token in tokens:
+            starts[pos] = token
+            pos += len(token)
+        return starts
+
+    def _chart(self, string: str, tokens: Dict[int, str],
+               budget: Optional[Budget]) -> Tuple[Dict[str, List[Dict[int, Count]]], List[List[Dict[int, Count]]]]:
+        """
+        Calcula la tabla inside sobre los terminales de _tokens
+
+        Returns:
+            (tabla[símbolo][inicio] = {fin: árboles},
+             prefijos[producción][k - 1][inicio] = {fin: formas de derivar los k primeros símbolos})
+        """
+        length = len(string)
+        productions = self.grammar.productions
+        # Límites de los terminales: los únicos inicios y fines de tramos
+        bounds = sorted(set(tokens) | {pos + len(token) for pos, token in tokens.items()} | {0})
+        chart: Dict[str, List[Dict[int, Count]]] = {}
+        for terminal in self.grammar.terminals:
+            if terminal and terminal not in productions:
+                chart[terminal] = [{} for _ in range(length + 1)]
+        for pos, token in tokens.items():
+            if token not in productions:
+                chart[token][pos][pos + len(token)] = 1
+        for symbol in productions:
+            chart[symbol] = [{} for _ in range(length + 1)]
+        prefixes = [[[{} for _ in range(length + 1)] for _ in range(max(0, len(symbols) - 1))]
+                    for _, _, symbols in self._productions]
+
+        def literal(symbol: str, i: int, j: int) -> int:
+            """1 si un no terminal que también es terminal es el terminal string[i:j]"""
+            return int(tokens.get(i) == symbol and j - i == len(symbol))
+
+        def production_count(index: int, i: int, j: int, store: bool) -> Count:
+            """Formas de derivar string[i:j] con la producción (guardando los prefijos si store)"""
+            symbols = self._productions[index][2]
+            table = prefixes[index]
+            same: Count = 1 if i == j else 0  # prefijo vacío
+            for k, symbol in enumerate(symbols):
+                cells = chart[symbol]
+                epsilon = self._epsilon.get(symbol, 0)
+                total: Count = same * epsilon if same and epsilon else 0
+                previous = table[k - 1][i] if k else {i: 1}
+                for middle, ways in previous.items():
+                    if middle < j:
+                        count = cells[middle].get(j)
+                        if count:
+                            total += ways * count
+                same = total
+                if store and total and k < len(symbols) - 1:
+                    table[k][i][j] = total
+            return same
+
+        for first in range(len(bounds) - 1, -1, -1):
+            i = bounds[first]
+            for j in bounds[first:]:
+                if budget is not None:
+                    budget.tick()
+                if i == j:
+                    for symbol, count in self._epsilon.items():
+                        chart[symbol][i][i] = count
+                else:
+                    for component, cyclic in self._components:
+                        values = [literal(symbol, i, j) + sum(production_count(index, i, j, False)
+                                                              for index in self._by_left[symbol])
+                                  for symbol in component]
+                        if cyclic and any(values):
+                            values = [INFINITE] * len(component)
+                        for symbol, value in zip(component, values):
+                            if value:
+                                chart[symbol][i][j] = value
+                # Prefijos de este tramo, ya con todos los símbolos calculados
+                for index in range(len(self._productions)):
+                    production_count(index, i, j, True)
+        return chart, prefixes
+
+    # Consultas
+    def count(self, string: str, budget: Optional[Budget] = None) -> Count:
+        """Número de árboles de derivación de la cadena (0 si no pertenece, math.inf si son infinitos)"""
+        return self.analyze(string, budget).trees
+
+    def analyze(self, string: str, budget: Optional[Budget] = None) -> AmbiguityReport:
+        """
+        Cuenta los árboles y localiza los tramos ambiguos
+
+        Args:
+            string: Cadena a analizar
+            budget: Límite opcional de pasos, tiempo y memoria
+
+        Raises:
+            BudgetExceeded: Si se agota el presupuesto antes de terminar
+        """
+        if budget is None:
+            return self._analyze(string, None)
+        with budget:
+            return self._analyze(string, budget)
+
+    def _analyze(self, string: str, budget: Optional[Budget]) -> AmbiguityReport:
+        """Tabla inside y recorrido de los tramos alcanzables desde la raíz (ver analyze)"""
+        start = self.grammar.start_symbol
+        if start not in self.grammar.productions:
+            return AmbiguityReport(string, 0, [])
+        tokens = self._tokens(string)
+        chart, prefixes = self._chart(string, tokens, budget)
+        trees = chart[start][0].get(len(string), 0)
+
+        ambiguous: List[AmbiguousSpan] = []
+        seen = {(start, 0, len(string))} if trees else set()
+        pending = list(seen)
+        while pending:
+            symbol, i, j = pending.pop()
+            if budget is not None:
+                budget.tick()
+            alternatives = []
+            splits_total = int(tokens.get(i) == symbol and j - i == len(symbol))
+            for index in self._by_left[symbol]:
+                left, right, symbols = self._productions[index]
+                splits = 0
+                for children in self._splits(chart, prefixes, index, i, j):
+                    splits += 1
+                    for child in children:
+                        if child[0] in self.grammar.productions and child not in seen:
+                            seen.add(child)
+                            pending.append(child)
+                if splits:
+                    trees_here = self._production_trees(chart, prefixes, index, i, j)
+                    alternatives.append(Alternative(f"{left} → {right}", splits, trees_here))
+                    splits_total += splits
+            if splits_total > 1:
+                ambiguous.append(AmbiguousSpan(symbol, i, j, string[i:j], chart[symbol][i][j], alternatives))
+
+        ambiguous.sort(key=lambda span: (span.start, -span.end, span.symbol))
+        return AmbiguityReport(string, trees, ambiguous)
+
+    def _production_trees(self, chart, prefixes, index: int, i: int, j: int) -> Count:
+        """Árboles de string[i:j] que empiezan por la producción"""
+        symbols = self._productions[index][2]
+        if not symbols:
+            return 1 if i == j else 0
+        total: Count = 0
+        last = symbols[-1]
+        previous = prefixes[index][len(symbols) - 2][i] if len(symbols) > 1 else {i: 1}
+        for middle, ways in previous.items():
+            if middle <= j:
+                count = chart[last][middle].get(j)
+                if count:
+                    total += ways * count
+        return total
+
+    def _splits(self, chart, prefixes, index: int, i: int, j: int) -> Iterator[Tuple[Tuple[str, int, int], ...]]:
+        """Repartos de string[i:j] entre los símbolos de la producción, como tramos (símbolo, inicio, fin)"""
+        symbols = self._productions[index][2]
+        if not symbols:
+            if i == j:
+                yield ()
+            return
+
+        def backwards(k: int, end: int) -> Iterator[Tuple[Tuple[str, int, int], ...]]:
+            """Repartos de los k + 1 primeros símbolos que terminan en end"""
+            symbol = symbols[k]
+            cells = chart[symbol]
+            if k == 0:
+                if cells[i].get(end):
+                    yield ((symbol, i, end),)
+                return
+            for middle, ways in prefixes[index][k - 1][i].items():
+                if middle <= end and cells[middle].get(end):
+                    for head in backwards(k - 1, middle):
+                        yield head + ((symbol, middle, end),)
+
+        yield from backwards(len(symbols) - 1, j)
+
+    def count_batch(self, strings: Iterable[str],
+                    budget: Optional[Budget] = None) -> List[Optional[AmbiguityReport]]:
+        """
+        Analiza un lote de cadenas
+
+        Args:
+            budget: Presupuesto aplicado a cada cadena por separado
+
+        Returns:
+            Un informe por cadena, o None si se agotó el presupuesto para esa cadena
+        """
+        reports: List[Optional[AmbiguityReport]] = []
+        for string in strings:
+            try:
+                reports.append(self.analyze(string, budget))
+            except BudgetExceeded:
+                reports.append(None)
+        return reports
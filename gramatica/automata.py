@@ -0,0 +1,328 @@
+"""
+Módulo de autómatas a nivel de carácter para gramáticas Tipo 3
+
+Combina el autómata de Type3Parser (cuyas transiciones son terminales,
+posiblemente de varios caracteres) con el analizador léxico voraz de los
+motores en un AFD sobre caracteres o bytes, construido de forma perezosa:
+cada estado se crea la primera vez que se alcanza. Sobre esos autómatas se
+definen operaciones de lenguajes (intersección, unión, complemento,
+vacuidad, equivalencia e inclusión) mediante productos también perezosos.
+"""
+
+from typing import Callable, Dict, FrozenSet, Hashable, Iterable, List, Optional, Set, Tuple, Union
+from collections import deque
+from .grammar import FrozenGrammar, Grammar
+from .parser import Type3Parser
+
+
+# Unidades leídas y aún no separadas en terminales: texto, o bytes en modo binario
+Pending = Union[str, bytes]
+
+
+class TerminalNFA:
+    """
+    AFND de Type3Parser con estados enteros, cuyas transiciones consumen un terminal
+
+    Los terminales se guardan como secuencias de unidades (str, o bytes UTF-8
+    en modo binario), junto con lo que necesita el analizador léxico voraz:
+    sus prefijos propios y el terminal más largo que es prefijo de una
+    secuencia.
+    """
+
+    def __init__(self, grammar: Grammar, binary: bool = False):
+        """
+        Args:
+            grammar: Gramática Tipo 3
+            binary: Si es True las unidades son bytes UTF-8 (enteros), si no caracteres
+        """
+        automaton = Type3Parser(grammar).automaton
+        self.binary = binary
+        self.transitions: List[Dict[Pending, Set[int]]] = []  # estado → {terminal: destinos}
+        self.epsilon: List[Set[int]] = []  # estado → destinos por ε
+
+        ids: Dict[str, int] = {}
+        for state in sorted(automaton['states']):
+            ids[state] = len(self.transitions)
+            self.transitions.append({})
+            self.epsilon.append(set())
+
+        for state, edges in automaton['transitions'].items():
+            source = ids[state]
+            for symbol, targets in edges.items():
+                target_ids = {ids[target] for target in targets}
+                if symbol == 'ε':
+                    self.epsilon[source].update(target_ids)
+                else:
+                    self.transitions[source].setdefault(self._units(symbol), set()).update(target_ids)
+
+        self.initial = ids[automaton['initial']]
+        self.accepting = frozenset([ids[automaton['final']]])
+        self.empty: Pending = b'' if binary else ''
+
+        # Analizador léxico: todos los terminales de la gramática, tengan o no transiciones
+        terminals = {self._units(terminal) for terminal in grammar.terminals if terminal}
+        self.terminals = sorted(terminals, key=len, reverse=True)
+        self.prefixes = frozenset(terminal[:i] for terminal in terminals for i in range(1, len(terminal)))
+        self.alphabet = frozenset(unit for terminal in terminals for unit in terminal)
+        self._longest: Dict[Pending, Optional[Pending]] = {}
+
+    def _units(self, terminal: str) -> Pending:
+        """Terminal como secuencia de unidades"""
+        return terminal.encode('utf-8') if self.binary else terminal
+
+    def closure(self, states: Iterable[int]) -> FrozenSet[int]:
+        """Clausura ε de un conjunto de estados"""
+        result = set(states)
+        stack = list(result)
+        while stack:
+            state = stack.pop()
+            for target in self.epsilon[state]:
+                if target not in result:
+                    result.add(target)
+                    stack.append(target)
+        return frozenset(result)
+
+    def move(self, states: FrozenSet[int], terminal: Pending) -> FrozenSet[int]:
+        """Estados alcanzados al consumir un terminal (con su clausura ε)"""
+        reached = set()
+        for state in states:
+            reached.update(self.transitions[state].get(terminal, ()))
+        return self.closure(reached) if reached else frozenset()
+
+    def longest_terminal(self, pending: Pending) -> Optional[Pending]:
+        """Terminal más largo que es prefijo de pending (None si ninguno; con caché)"""
+        if pending not in self._longest:
+            self._longest[pending] = next((terminal for terminal in self.terminals
+                                           if pending.startswith(terminal)), None)
+        return self._longest[pending]
+
+
+class LazyDFA:
+    """
+    AFD obtenido por construcción de subconjuntos perezosa
+
+    Cada estado es un conjunto de estados del AFND más las unidades leídas
+    que aún pueden ser el comienzo de un terminal más largo. En cuanto dejan
+    de serlo se separa el terminal más largo que las empieza, como hace
+    GreedyLexer, y el AFND avanza con él; al final de la cadena se separa lo
+    que quede. Así el AFD acepta lo mismo que Type3Parser.
+
+    Los estados son enteros; el 0 es el estado muerto.
+    """
+
+    DEAD = 0
+
+    def __init__(self, nfa: TerminalNFA):
+        self.nfa = nfa
+        self.binary = nfa.binary
+        self.alphabet = nfa.alphabet
+        self._ids: Dict[Tuple[FrozenSet[int], Pending], int] = {}
+        self._sets: List[Tuple[FrozenSet[int], Pending]] = []
+        self._delta: List[Dict[Hashable, int]] = []
+        self._accepting: List[bool] = []
+        self._add((frozenset(), nfa.empty))
+        self.initial = self._add((nfa.closure([nfa.initial]), nfa.empty))
+
+    def _add(self, key: Tuple[FrozenSet[int], Pending]) -> int:
+        """Devuelve el identificador de (estados, pendiente), creándolo si es nuevo"""
+        state = self._ids.get(key)
+        if state is None:
+            state = len(self._sets)
+            self._ids[key] = state
+            self._sets.append(key)
+            self._delta.append({})
+            self._accepting.append(self._accepts_at_end(*key))
+        return state
+
+    def _separate(self, states: FrozenSet[int], pending: Pending,
+                  at_end: bool) -> Tuple[FrozenSet[int], Pending]:
+        """
+        Separa terminales de pending mientras esté decidido cuál es el más largo
+
+        Returns:
+            (estados, pendiente restante); los estados son vacíos si la
+            separación falla o el AFND no acepta el terminal
+        """
+        nfa = self.nfa
+        while pending and (at_end or pending not in nfa.prefixes):
+            terminal = nfa.longest_terminal(pending)
+            if terminal is None:
+                return frozenset(), nfa.empty
+            states = nfa.move(states, terminal)
+            if not states:
+                return states, nfa.empty
+            pending = pending[len(terminal):]
+        return states, pending
+
+    def _accepts_at_end(self, states: FrozenSet[int], pending: Pending) -> bool:
+        """Verifica si la cadena puede terminar aquí (separando lo pendiente)"""
+        states, _ = self._separate(states, pending, True)
+        return not states.isdisjoint(self.nfa.accepting)
+
+    def step(self, state: int, unit: Hashable) -> int:
+        """Estado alcanzado al consumir una unidad"""
+        row = self._delta[state]
+        target = row.get(unit)
+        if target is None:
+            states, pending = self._sets[state]
+            if state != self.DEAD:
+                states, pending = self._separate(states, pending + (bytes((unit,)) if self.binary else unit), False)
+            target = self._add((states, pending)) if states else self.DEAD
+            row[unit] = target
+        return target
+
+    def is_accepting(self, state: int) -> bool:
+        """Verifica si un estado del AFD es de aceptación"""
+        return self._accepting[state]
+
+    def accepts(self, data) -> bool:
+        """Verifica si una cadena completa (o bytes, en modo binario) pertenece al lenguaje"""
+        state = self.initial
+        for unit in data:
+            state = self.step(state, unit)
+            if state == self.DEAD:
+                return False
+        return self._accepting[state]
+
+    def __len__(self) -> int:
+        """Número de estados del AFD construidos hasta ahora"""
+        return len(self._sets)
+
+
+def compile_regular(grammar: Grammar, binary: bool = False) -> LazyDFA:
+    """Compila una gramática Tipo 3 a un AFD perezoso sobre caracteres (o bytes)"""
+    return LazyDFA(TerminalNFA(grammar, binary))
+
+
+class ProductDFA:
+    """
+    Producto perezoso de dos AFD
+
+    Los estados son pares (estado_izquierdo, estado_derecho) y solo se exploran
+    los que se alcanzan; la operación decide qué pares son de aceptación.
+    """
+
+    def __init__(self, left, right, operation: Callable[[bool, bool], bool]):
+        if left.binary != right.binary:
+            raise ValueError("No se pueden combinar autómatas de caracteres y de bytes")
+        self.left = left
+        self.right = right
+        self.operation = operation
+        self.binary = left.binary
+        self.alphabet = left.alphabet | right.alphabet
+        self.initial = (left.initial, right.initial)
+
+    def step(self, state: Tuple, unit: Hashable) -> Tuple:
+        """Avanza ambos autómatas con la misma unidad"""
+        return self.left.step(state[0], unit), self.right.step(state[1], unit)
+
+    def is_accepting(self, state: Tuple) -> bool:
+        """Combina la aceptación de ambos autómatas"""
+        return self.operation(self.left.is_accepting(state[0]), self.right.is_accepting(state[1]))
+
+
+class ComplementDFA:
+    """Complemento perezoso de un AFD respecto a un alfabeto"""
+
+    def __init__(self, dfa, alphabet: Optional[FrozenSet] = None):
+        self.dfa = dfa
+        self.binary = dfa.binary
+        self.alphabet = frozenset(alphabet) if alphabet is not None else dfa.alphabet
+        self.initial = dfa.initial
+
+    def step(self, state, unit: Hashable):
+        """Mismo estado que el autómata original"""
+        return self.dfa.step(state, unit)
+
+    def is_accepting(self, state) -> bool:
+        """Acepta justo lo que el original rechaza"""
+        return not self.dfa.is_accepting(state)
+
+
+def _as_dfa(language):
+    """Acepta una gramática Tipo 3 o un autómata ya compilado"""
+    if isinstance(language, (Grammar, FrozenGrammar)):
+        return compile_regular(language)
+    return language
+
+
+def intersection(a, b) -> ProductDFA:
+    """L(a) ∩ L(b)"""
+    return ProductDFA(_as_dfa(a), _as_dfa(b), lambda x, y: x and y)
+
+
+def union(a, b) -> ProductDFA:
+    """L(a) ∪ L(b)"""
+    return ProductDFA(_as_dfa(a), _as_dfa(b), lambda x, y: x or y)
+
+
+def difference(a, b) -> ProductDFA:
+    """L(a) − L(b)"""
+    return ProductDFA(_as_dfa(a), _as_dfa(b), lambda x, y: x and not y)
+
+
+def symmetric_difference(a, b) -> ProductDFA:
+    """(L(a) − L(b)) ∪ (L(b) − L(a))"""
+    return ProductDFA(_as_dfa(a), _as_dfa(b), lambda x, y: x != y)
+
+
+def complement(a, alphabet: Optional[Iterable] = None) -> ComplementDFA:
+    """Σ* − L(a), con Σ el alfabeto dado o el del autómata"""
+    return ComplementDFA(_as_dfa(a), frozenset(alphabet) if alphabet is not None else None)
+
+
+def shortest_string(language):
+    """
+    Cadena más corta (y menor en orden alfabético entre las más cortas) del lenguaje
+
+    Recorre en anchura solo los estados alcanzables del autómata (o del producto).
+
+    Returns:
+        La cadena (bytes en modo binario), o None si el lenguaje es vacío
+    """
+    dfa = _as_dfa(language)
+    alphabet = sorted(dfa.alphabet)
+    parents = {dfa.initial: None}
+    queue = deque([dfa.initial])
+    while queue:
+        state = queue.popleft()
+        if dfa.is_accepting(state):
+            units = []
+            while parents[state] is not None:
+                state, unit = parents[state]
+                units.append(unit)
+            units.reverse()
+            return bytes(units) if dfa.binary else ''.join(units)
+        for unit in alphabet:
+            target = dfa.step(state, unit)
+            if target not in parents:
+                parents[target] = (state, unit)
+                queue.append(target)
+    return None
+
+
+def is_empty(language) -> bool:
+    """Verifica si el lenguaje no tiene ninguna cadena"""
+    return shortest_string(language) is None
+
+
+def is_equivalent(a, b) -> Tuple[bool, Optional[str]]:
+    """
+    Verifica si dos gramáticas (o autómatas) generan el mismo lenguaje
+
+    Returns:
+        (equivalentes, contraejemplo más corto que está en uno solo de los lenguajes)
+    """
+    witness = shortest_string(symmetric_difference(a, b))
+    return witness is None, witness
+
+
+def is_subset(a, b) -> Tuple[bool, Optional[str]]:
+    """
+    Verifica si L(a) ⊆ L(b)
+
+    Returns:
+        (incluido, contraejemplo más corto de L(a) que no está en L(b))
+    """
+    witness = shortest_string(difference(a, b))
+    return witness is None, witness
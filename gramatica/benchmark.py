@@ -0,0 +1,503 @@
+"""
+Suite de benchmarks con familias sintéticas de gramáticas escalables
+
+Mide latencia (percentiles) y rendimiento de los parsers y del generador
+para distintos tamaños de entrada, guarda los resultados en JSON y falla
+si hay regresiones respecto a una referencia guardada.
+
+También mide el arranque en frío: cuánto tarda un proceso nuevo en importar
+el paquete, cargar una gramática y reconocer una cadena.
+
+Uso:
+    python -m gramatica.benchmark --salida resultados.json
+    python -m gramatica.benchmark --referencia referencia.json --guardar-referencia
+    python -m gramatica.benchmark --referencia referencia.json --tolerancia 0.3
+    python -m gramatica.benchmark --arranque --presupuesto-arranque 0.1
+    python -m gramatica.benchmark --cyk --procesos 1 2 4 8
+"""
+
+from typing import Callable, Dict, List, Optional, Tuple
+import argparse
+import json
+import math
+import os
+import platform
+import random
+import subprocess
+import sys
+import tempfile
+import time
+
+from .grammar import Grammar
+from .parser import Type2Parser, Type3Parser
+from .regex_compiler import RegexType3Parser
+from .glr import GLRParser
+from .cyk import CYKParser, ParallelCYKParser
+from .generator import StringGenerator
+from .budget import Budget, BudgetExceeded
+
+
+# Familias de gramáticas
+def _make_grammar(name: str, grammar_type: str, productions: Dict[str, List[str]],
+                  terminals: List[str], start: str) -> Grammar:
+    """Construye una gramática sintética"""
+    grammar = Grammar(name, grammar_type)
+    for terminal in terminals:
+        grammar.add_terminal(terminal)
+    for left, rights in productions.items():
+        for right in rights:
+            grammar.add_production(left, right)
+    grammar.set_start_symbol(start)
+    return grammar
+
+
+def left_recursive_list() -> Tuple[Grammar, Callable[[int], str]]:
+    """Lista recursiva por la izquierda: L → L,a | a"""
+    grammar = _make_grammar("lista izquierda", "Tipo 2", {"L": ["L,a", "a"]}, ["a", ","], "L")
+    return grammar, lambda size: ",".join(["a"] * size)
+
+
+def right_recursive_list() -> Tuple[Grammar, Callable[[int], str]]:
+    """Lista recursiva por la derecha: L → a,L | a"""
+    grammar = _make_grammar("lista derecha", "Tipo 2", {"L": ["a,L", "a"]}, ["a", ","], "L")
+    return grammar, lambda size: ",".join(["a"] * size)
+
+
+def nested_parentheses() -> Tuple[Grammar, Callable[[int], str]]:
+    """Paréntesis anidados: P → (P) | a"""
+    grammar = _make_grammar("paréntesis", "Tipo 2", {"P": ["(P)", "a"]}, ["(", ")", "a"], "P")
+    return grammar, lambda size: "(" * size + "a" + ")" * size
+
+
+def ambiguous_pairs() -> Tuple[Grammar, Callable[[int], str]]:
+    """Gramática muy ambigua: S → SS | a"""
+    grammar = _make_grammar("ambigua", "Tipo 2", {"S": ["SS", "a"]}, ["a"], "S")
+    return grammar, lambda size: "a" * size
+
+
+def keyword_set(keywords: int = 200) -> Tuple[Grammar, Callable[[int], str]]:
+    """Conjunto grande de palabras clave: S → k S | k (regular)"""
+    words = [f"k{i:04d}" for i in range(keywords)]
+    rights = [f"{word} S" for word in words] + words
+    grammar = _make_grammar("palabras clave", "Tipo 3", {"S": rights}, words, "S")
+
+    def make_input(size: int) -> str:
+        rng = random.Random(size)
+        return "".join(rng.choice(words) for _ in range(size))
+
+    return grammar, make_input
+
+
+def wide_automaton(states: int = 500) -> Tuple[Grammar, Callable[[int], str]]:
+    """Autómata regular ancho: estados Q0..Qn con transiciones pseudoaleatorias"""
+    rng = random.Random(states)
+    productions = {}
+    for i in range(states):
+        productions[f"Q{i}"] = [
+            f"a Q{(i + 1) % states}",
+            f"b Q{rng.randrange(states)}",
+            f"b Q{rng.randrange(states)}",
+            "a",
+        ]
+    grammar = _make_grammar("autómata ancho", "Tipo 3", productions, ["a", "b"], "Q0")
+
+    def make_input(size: int) -> str:
+        rng_input = random.Random(size)
+        return "".join(rng_input.choice("ab") for _ in range(size - 1)) + "a"
+
+    return grammar, make_input
+
+
+# familia → (constructor, motores, tamaños, tamaños en modo rápido)
+FAMILIES = {
+    "lista_izquierda": (left_recursive_list, ["tipo2", "glr", "cyk", "generador"], [10, 50, 150], [10, 50]),
+    "lista_derecha": (right_recursive_list, ["tipo2", "generador"], [10, 50, 150], [10, 50]),
+    "parentesis": (nested_parentheses, ["tipo2", "cyk", "generador"], [10, 50, 150], [10, 50]),
+    "ambigua": (ambiguous_pairs, ["tipo2", "glr", "cyk", "generador"], [4, 8, 12, 40], [4, 8]),
+    "palabras_clave": (keyword_set, ["tipo2", "tipo3", "regex", "tipo3-rec", "regex-rec"],
+                       [10, 100, 300], [10, 100]),
+    "automata_ancho": (wide_automaton, ["tipo3", "regex", "tipo3-rec", "regex-rec"],
+                       [100, 1000, 3000], [100, 1000]),
+}
+
+
+# Motores: nombre → constructor de una función que procesa una entrada
+def _parser_runner(parser_class) -> Callable[[Grammar], Callable]:
+    def factory(grammar: Grammar) -> Callable:
+        parser = parser_class(grammar)
+        return lambda text, size, budget: parser.parse(text, budget)
+    return factory
+
+
+def _recognizer_runner(parser_class) -> Callable[[Grammar], Callable]:
+    def factory(grammar: Grammar) -> Callable:
+        parser = parser_class(grammar)
+        return lambda text, size, budget: parser.recognize(text, budget)
+    return factory
+
+
+def _generator_runner(grammar: Grammar) -> Callable:
+    generator = StringGenerator(grammar)
+    return lambda text, size, budget: generator.generate_strings(size, budget)
+
+
+ENGINES: Dict[str, Callable[[Grammar], Callable]] = {
+    "tipo2": _parser_runner(Type2Parser),
+    "tipo3": _parser_runner(Type3Parser),
+    "regex": _parser_runner(RegexType3Parser),
+    "glr": _parser_runner(GLRParser),
+    "cyk": _recognizer_runner(CYKParser),
+    # Solo reconocimiento (sin árbol): compara el motor re con el bucle del autómata
+    "tipo3-rec": _recognizer_runner(Type3Parser),
+    "regex-rec": _recognizer_runner(RegexType3Parser),
+    "generador": _generator_runner,
+}
+
+
+def percentile(values: List[float], fraction: float) -> float:
+    """Percentil por el método del rango más cercano: el valor de rango ⌈fraction·n⌉"""
+    ordered = sorted(values)
+    # Se redondea el producto para que errores como 0.07 * 100 = 7.000000000000001 no suban un rango
+    rank = math.ceil(round(fraction * len(ordered), 9))
+    return ordered[min(len(ordered) - 1, max(0, rank - 1))]
+
+
+def measure(run: Callable, text: str, size: int, repetitions: int, timeout: float) -> dict:
+    """
+    Ejecuta una entrada varias veces y resume las latencias
+
+    Returns:
+        dict con percentiles en segundos, o con "exceeded"/"error" si no terminó
+    """
+    budget = Budget(timeout=timeout)
+    latencies = []
+    for _ in range(repetitions):
+        started = time.perf_counter()
+        try:
+            run(text, size, budget)
+        except BudgetExceeded:
+            return {"exceeded": True}
+        except RecursionError:
+            return {"error": "RecursionError"}
+        latencies.append(time.perf_counter() - started)
+
+    mean = sum(latencies) / len(latencies)
+    units = len(text) if text else size
+    return {
+        "p50": percentile(latencies, 0.50),
+        "p90": percentile(latencies, 0.90),
+        "p99": percentile(latencies, 0.99),
+        "mean": mean,
+        "throughput": units / mean if mean > 0 else None,  # caracteres (o cadenas generadas) por segundo
+    }
+
+
+def run_suite(families: Optional[List[str]] = None, quick: bool = False, repetitions: int = 5,
+              timeout: float = 10.0, verbose: bool = True) -> dict:
+    """
+    Ejecuta las familias indicadas y devuelve los resultados
+
+    Args:
+        families: Nombres de familias (todas si es None)
+        quick: Usar solo los tamaños pequeños
+        repetitions: Repeticiones por entrada
+        timeout: Límite de tiempo por repetición; los tamaños mayores se omiten al superarlo
+    """
+    results = []
+    for family in families or list(FAMILIES):
+        builder, engines, sizes, quick_sizes = FAMILIES[family]
+        grammar, make_input = builder()
+
+        for engine in engines:
+            run = ENGINES[engine](grammar)
+            for size in quick_sizes if quick else sizes:
+                # El generador recibe el número de cadenas, los parsers una cadena de entrada
+                text = "" if engine == "generador" else make_input(size)
+                summary = measure(run, text, size, repetitions, timeout)
+                summary.update({"family": family, "engine": engine, "size": size})
+                results.append(summary)
+                if verbose:
+                    print(_format_result(summary))
+                if "p50" not in summary:
+                    break  # Los tamaños mayores tampoco terminarían
+
+    return {
+        "meta": {
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "date": time.strftime("%Y-%m-%d %H:%M:%S"),
+            "repetitions": repetitions,
+        },
+        "results": results,
+    }
+
+
+# Aceleración de la tabla CYK en paralelo: familia → tamaño de la entrada
+CYK_SPEEDUP_SIZES = {"ambigua": 300, "lista_izquierda": 600, "parentesis": 500, "palabras_clave": 120}
+
+
+def _process_counts() -> List[int]:
+    """1, 2, 4… hasta el número de CPU, y el número de CPU"""
+    cpus = os.cpu_count() or 1
+    counts = {cpus}
+    count = 1
+    while count <= cpus:
+        counts.add(count)
+        count *= 2
+    return sorted(counts)
+
+
+def measure_cyk_speedup(families: Optional[List[str]] = None, processes: Optional[List[int]] = None,
+                        repetitions: int = 3, timeout: float = 60.0, verbose: bool = True) -> List[dict]:
+    """
+    Compara ParallelCYKParser con distintos números de procesos frente a CYKParser
+
+    Args:
+        families: Familias de CYK_SPEEDUP_SIZES (todas si es None)
+        processes: Números de procesos a probar (por defecto, potencias de 2 hasta el número de CPU)
+        repetitions: Repeticiones por medida (se toma la mediana)
+        timeout: Límite de tiempo por repetición
+
+    Returns:
+        Lista de {"family", "length", "processes", "p50", "speedup"} (processes = 0 es CYKParser),
+        o con "exceeded" en lugar de "p50" si no terminó a tiempo
+    """
+    results = []
+    for family in families or list(CYK_SPEEDUP_SIZES):
+        grammar, make_input = FAMILIES[family][0]()
+        text = make_input(CYK_SPEEDUP_SIZES[family])
+
+        runs = [(0, CYKParser(grammar))] + [(count, ParallelCYKParser(grammar, count, threshold=0))
+                                            for count in processes or _process_counts()]
+        baseline = None
+        for count, parser in runs:
+            parser.recognize(text[:64])  # Arranca el grupo de procesos fuera de la medida
+            summary = measure(lambda text, size, budget: parser.recognize(text, budget),
+                              text, len(text), repetitions, timeout)
+            if isinstance(parser, ParallelCYKParser):
+                parser.close()
+            result = {"family": family, "length": len(text), "processes": count}
+            label = f"cyk {family:<16} n={len(text):<6} {'secuencial' if count == 0 else f'{count} procesos':<12}"
+            if "p50" not in summary:
+                result["exceeded"] = True
+                results.append(result)
+                if verbose:
+                    print(f"{label} límite excedido")
+                continue
+            baseline = baseline or summary["p50"]
+            result.update({"p50": summary["p50"], "speedup": baseline / summary["p50"]})
+            results.append(result)
+            if verbose:
+                print(f"{label} p50={summary['p50'] * 1000:10.1f} ms  aceleración={result['speedup']:5.2f}x")
+    return results
+
+
+# Arranque en frío
+# Tiempo máximo (s) que "cargar gramática + reconocer una cadena" puede sumar al intérprete vacío
+STARTUP_BUDGET = 0.1
+
+
+def _run_process(arguments: List[str], environment: Dict[str, str]) -> float:
+    """Segundos de reloj que tarda un intérprete nuevo con los argumentos dados"""
+    started = time.perf_counter()
+    subprocess.run([sys.executable, *arguments], env=environment, check=True,
+                   stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    return time.perf_counter() - started
+
+
+def measure_startup(repetitions: int = 20, family: str = "palabras_clave", size: int = 10,
+                    verbose: bool = True) -> dict:
+    """
+    Mide el arranque en frío en procesos nuevos
+
+    Escenarios: el intérprete vacío (referencia), "import gramatica" y la línea
+    de comandos "reconocer" con una gramática de la familia indicada.
+
+    Args:
+        repetitions: Procesos lanzados por escenario
+        family: Familia de la gramática que se guarda en un archivo temporal
+        size: Tamaño de la cadena reconocida
+
+    Returns:
+        dict escenario → percentiles en segundos, más "overhead" (mediana de
+        "reconocer" menos la del intérprete vacío)
+    """
+    grammar, make_input = FAMILIES[family][0]()
+    package_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    environment = dict(os.environ)
+    environment["PYTHONPATH"] = os.pathsep.join(filter(None, [package_root, environment.get("PYTHONPATH")]))
+    environment.pop("PYTHONSTARTUP", None)
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, f"{family}.json")
+        grammar.save_to_file(path)
+        scenarios = {
+            "interprete": ["-c", "pass"],
+            "importar": ["-c", "import gramatica"],
+            "reconocer": ["-m", "gramatica", "reconocer", path, make_input(size)],
+        }
+        _run_process(scenarios["reconocer"], environment)  # Calienta la caché de bytecode y del sistema de archivos
+        results = {}
+        for scenario, arguments in scenarios.items():
+            latencies = [_run_process(arguments, environment) for _ in range(repetitions)]
+            results[scenario] = {
+                "p50": percentile(latencies, 0.50),
+                "p90": percentile(latencies, 0.90),
+                "p99": percentile(latencies, 0.99),
+                "min": min(latencies),
+            }
+            if verbose:
+                summary = results[scenario]
+                print(f"arranque {scenario:<12} p50={summary['p50'] * 1000:8.1f} ms  "
+                      f"p90={summary['p90'] * 1000:8.1f} ms  min={summary['min'] * 1000:8.1f} ms")
+
+    results["overhead"] = results["reconocer"]["p50"] - results["interprete"]["p50"]
+    return results
+
+
+def _format_result(result: dict) -> str:
+    """Línea legible para un resultado"""
+    label = f"{result['family']:<16} {result['engine']:<10} n={result['size']:<6}"
+    if "p50" not in result:
+        return f"{label} {'límite excedido' if result.get('exceeded') else result.get('error')}"
+    return (f"{label} p50={result['p50'] * 1000:9.3f} ms  p90={result['p90'] * 1000:9.3f} ms  "
+            f"p99={result['p99'] * 1000:9.3f} ms  {result['throughput']:12.0f} u/s")
+
+
+def compare_with_baseline(current: dict, baseline: dict, tolerance: float = 0.25,
+                          min_delta: float = 0.0005) -> List[str]:
+    """
+    Compara la mediana de cada (familia, motor, tamaño) con la referencia
+
+    Args:
+        tolerance: Aumento relativo permitido de la mediana (0.25 = 25 %)
+        min_delta: Diferencia absoluta mínima en segundos para considerar regresión (filtra ruido)
+
+    Returns:
+        Lista de descripciones de regresiones (vacía si no hay)
+    """
+    reference = {(r["family"], r["engine"], r["size"]): r for r in baseline.get("results", [])}
+    regressions = []
+    for result in current["results"]:
+        key = (result["family"], result["engine"], result["size"])
+        previous = reference.get(key)
+        if previous is None:
+            continue
+        if "p50" in previous and "p50" not in result:
+            regressions.append(f"{key}: antes terminaba en {previous['p50'] * 1000:.3f} ms, ahora no termina")
+            continue
+        if "p50" not in previous or "p50" not in result:
+            continue
+        if result["p50"] > previous["p50"] * (1 + tolerance) and result["p50"] - previous["p50"] > min_delta:
+            regressions.append(f"{key}: p50 {previous['p50'] * 1000:.3f} ms → {result['p50'] * 1000:.3f} ms")
+    return regressions
+
+
+def load_baseline(path: str) -> dict:
+    """
+    Lee un archivo de referencia guardado con --guardar-referencia
+
+    Raises:
+        FileNotFoundError: Si el archivo no existe
+        ValueError: Si no es JSON o no tiene la forma de los resultados de run_suite
+    """
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            baseline = json.load(f)
+    except json.JSONDecodeError as e:
+        raise ValueError(f"La referencia {path} no es JSON válido: {e}") from None
+    results = baseline.get("results") if isinstance(baseline, dict) else None
+    if not isinstance(results, list) or not all(
+            isinstance(r, dict) and {"family", "engine", "size"} <= r.keys() for r in results):
+        raise ValueError(f"La referencia {path} no tiene la forma de los resultados de la suite")
+    return baseline
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """
+    Punto de entrada de línea de comandos
+
+    Returns:
+        0 si todo fue bien, 1 si hay regresiones o el arranque supera su
+        presupuesto, 2 si la referencia no se puede leer
+    """
+    arg_parser = argparse.ArgumentParser(description="Benchmarks de parsers y generador")
+    arg_parser.add_argument("--familias", nargs="*", choices=list(FAMILIES), help="Familias a ejecutar")
+    arg_parser.add_argument("--rapido", action="store_true", help="Solo tamaños pequeños")
+    arg_parser.add_argument("--repeticiones", type=int, default=5)
+    arg_parser.add_argument("--timeout", type=float, default=10.0, help="Segundos por repetición")
+    arg_parser.add_argument("--salida", help="Archivo JSON donde guardar los resultados")
+    arg_parser.add_argument("--referencia", help="Archivo JSON de referencia para detectar regresiones")
+    arg_parser.add_argument("--guardar-referencia", action="store_true",
+                            help="Sobrescribir la referencia con los resultados actuales")
+    arg_parser.add_argument("--tolerancia", type=float, default=0.25,
+                            help="Aumento relativo permitido de la mediana")
+    arg_parser.add_argument("--cyk", action="store_true",
+                            help="Medir solo la aceleración de la tabla CYK en paralelo")
+    arg_parser.add_argument("--procesos", type=int, nargs="*", help="Números de procesos para --cyk")
+    arg_parser.add_argument("--arranque", action="store_true",
+                            help="Medir solo el arranque en frío (procesos nuevos)")
+    arg_parser.add_argument("--presupuesto-arranque", type=float, default=STARTUP_BUDGET,
+                            help="Segundos que el arranque puede sumar al intérprete vacío")
+    args = arg_parser.parse_args(argv)
+
+    if args.cyk:
+        speedups = measure_cyk_speedup(args.familias and [f for f in args.familias if f in CYK_SPEEDUP_SIZES],
+                                       args.procesos, min(args.repeticiones, 3), args.timeout * 6)
+        if args.salida:
+            with open(args.salida, 'w', encoding='utf-8') as f:
+                json.dump({"cyk_speedup": speedups, "cpus": os.cpu_count()}, f, indent=2)
+        return 0
+
+    if args.arranque:
+        startup = measure_startup(max(args.repeticiones, 10))
+        if args.salida:
+            with open(args.salida, 'w', encoding='utf-8') as f:
+                json.dump({"startup": startup, "budget": args.presupuesto_arranque}, f, indent=2)
+        if startup["overhead"] > args.presupuesto_arranque:
+            print(f"\n✗ El arranque suma {startup['overhead'] * 1000:.1f} ms al intérprete "
+                  f"(presupuesto: {args.presupuesto_arranque * 1000:.1f} ms)")
+            return 1
+        print(f"\n✓ El arranque suma {startup['overhead'] * 1000:.1f} ms al intérprete "
+              f"(presupuesto: {args.presupuesto_arranque * 1000:.1f} ms)")
+        return 0
+
+    # La referencia se lee antes de medir, para no descubrir tras la suite que no sirve
+    baseline = None
+    if args.referencia and not args.guardar_referencia:
+        try:
+            baseline = load_baseline(args.referencia)
+        except FileNotFoundError:
+            pass  # Primera ejecución: se guarda la de ahora
+        except (OSError, ValueError) as e:
+            print(f"Error: {e}", file=sys.stderr)
+            return 2
+
+    results = run_suite(args.familias, args.rapido, args.repeticiones, args.timeout)
+
+    if args.salida:
+        with open(args.salida, 'w', encoding='utf-8') as f:
+            json.dump(results, f, indent=2, ensure_ascii=False)
+
+    if args.referencia and baseline is None:
+        try:
+            with open(args.referencia, 'w', encoding='utf-8') as f:
+                json.dump(results, f, indent=2, ensure_ascii=False)
+        except OSError as e:
+            print(f"Error: no se pudo guardar la referencia: {e}", file=sys.stderr)
+            return 2
+        print(f"Referencia guardada en {args.referencia}")
+    elif args.referencia:
+        regressions = compare_with_baseline(results, baseline, args.tolerancia)
+        if regressions:
+            print("\nREGRESIONES:")
+            for regression in regressions:
+                print(f"  ✗ {regression}")
+            return 1
+        print("\n✓ Sin regresiones respecto a la referencia")
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
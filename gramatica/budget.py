@@ -0,0 +1,118 @@
+"""
+Módulo para limitar el trabajo de los parsers y del generador
+(pasos, tiempo de reloj y memoria)
+"""
+
+from typing import List, Optional
+import time
+
+
+class BudgetExceeded(Exception):
+    """
+    Se lanza cuando un análisis o una generación agota su presupuesto
+
+    No es un rechazo: la cadena puede pertenecer o no al lenguaje,
+    simplemente no hubo recursos suficientes para decidirlo.
+    """
+
+    def __init__(self, reason: str, steps: int, elapsed: float, partial: Optional[List[str]] = None):
+        """
+        Args:
+            reason: "pasos", "tiempo" o "memoria"
+            steps: Pasos realizados hasta agotar el presupuesto
+            elapsed: Segundos transcurridos
+            partial: Resultados parciales (cadenas ya generadas), si los hay
+        """
+        super().__init__(f"Presupuesto de {reason} excedido tras {steps} pasos ({elapsed:.3f} s)")
+        self.reason = reason
+        self.steps = steps
+        self.elapsed = elapsed
+        self.partial = partial
+
+
+class Budget:
+    """
+    Presupuesto de pasos, tiempo y memoria para una llamada a parse o generate_strings
+
+    El presupuesto se reinicia al comienzo de cada llamada, por lo que el mismo
+    objeto puede reutilizarse para analizar muchas cadenas.
+    """
+
+    # Cada cuántos pasos se consultan el reloj y la memoria (consultarlos es más caro que contar)
+    CHECK_INTERVAL = 256
+
+    def __init__(self, max_steps: Optional[int] = None, timeout: Optional[float] = None,
+                 max_memory: Optional[int] = None):
+        """
+        Args:
+            max_steps: Número máximo de pasos (llamadas recursivas, tokens, formas sentenciales)
+            timeout: Tiempo máximo de reloj en segundos
+            max_memory: Memoria máxima asignada durante la llamada, en bytes
+        """
+        self.max_steps = max_steps
+        self.timeout = timeout
+        self.max_memory = max_memory
+        self.steps = 0
+        self._started = 0.0
+        self._deadline: Optional[float] = None
+        self._memory_base = 0
+        self._owns_tracemalloc = False
+
+    def start(self):
+        """Reinicia los contadores al comienzo de una llamada"""
+        self.steps = 0
+        self._started = time.monotonic()
+        self._deadline = self._started + self.timeout if self.timeout is not None else None
+        if self.max_memory is not None:
+            # tracemalloc solo se importa y se activa si hay límite de memoria, porque ralentiza todo el proceso
+            import tracemalloc
+            if not tracemalloc.is_tracing():
+                tracemalloc.start()
+                self._owns_tracemalloc = True
+            self._memory_base = tracemalloc.get_traced_memory()[0]
+
+    def stop(self):
+        """Libera los recursos usados para medir la memoria"""
+        if self._owns_tracemalloc:
+            import tracemalloc
+            tracemalloc.stop()
+            self._owns_tracemalloc = False
+
+    def elapsed(self) -> float:
+        """Segundos transcurridos desde start()"""
+        return time.monotonic() - self._started
+
+    def tick(self, steps: int = 1):
+        """
+        Cuenta pasos y verifica los límites
+
+        Raises:
+            BudgetExceeded: Si se agotó algún límite
+        """
+        self.steps += steps
+        if self.max_steps is not None and self.steps > self.max_steps:
+            raise BudgetExceeded("pasos", self.steps, self.elapsed())
+        if self.steps % self.CHECK_INTERVAL < steps:
+            self.check()
+
+    def check(self):
+        """
+        Verifica los límites de tiempo y memoria sin contar pasos
+
+        Raises:
+            BudgetExceeded: Si se agotó algún límite
+        """
+        if self._deadline is not None and time.monotonic() > self._deadline:
+            raise BudgetExceeded("tiempo", self.steps, self.elapsed())
+        if self.max_memory is not None:
+            import tracemalloc
+            if tracemalloc.is_tracing() and tracemalloc.get_traced_memory()[0] - self._memory_base > self.max_memory:
+                raise BudgetExceeded("memoria", self.steps, self.elapsed())
+
+    def __enter__(self) -> 'Budget':
+        self.start()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.stop()
+        return False
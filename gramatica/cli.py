@@ -0,0 +1,153 @@
+"""
+Línea de comandos sin interfaz gráfica
+
+Solo importa lo necesario para cada orden: reconocer cadenas no carga tkinter
+ni los motores que no se usan, así que una invocación corta arranca rápido.
+
+Uso:
+    python main.py reconocer punto2.json aab ba          # ✓/✗ por cadena
+    cat cadenas.txt | python main.py reconocer punto2.json --motor glr
+    python main.py reconocer punto2.json aab --recomendaciones motores.json
+    python main.py reconocer punto2.json aab --formato sexpr   # árbol en una línea
+    cat cadenas.txt | python main.py reconocer punto2.json --derivaciones arboles.gdrv
+    python main.py generar punto2.json -n 20
+    python main.py                                       # interfaz gráfica
+"""
+
+from typing import Iterable, List, Optional
+import argparse
+import sys
+
+from .grammar import Grammar
+from .parser import cached_parser, load_engine_recommendations
+from .budget import Budget, BudgetExceeded
+
+
+def _strings(arguments: List[str]) -> Iterable[str]:
+    """Cadenas de los argumentos o, si no hay, una por línea de la entrada estándar"""
+    if arguments:
+        return arguments
+    return (line.rstrip("\n") for line in sys.stdin)
+
+
+def _load(path: str) -> Grammar:
+    """Carga y valida una gramática"""
+    grammar = Grammar.load_from_file(path)
+    is_valid, message = grammar.validate()
+    if not is_valid:
+        raise ValueError(f"Gramática inválida: {message}")
+    return grammar
+
+
+def recognize(args: argparse.Namespace) -> int:
+    """
+    Orden "reconocer"
+
+    Returns:
+        0 si se aceptan todas las cadenas, 1 si se rechaza o no se decide alguna
+    """
+    if args.recomendaciones:
+        load_engine_recommendations(args.recomendaciones)
+    grammar = _load(args.gramatica)
+    parser = cached_parser(grammar, args.motor)
+    fmt = args.formato or ("texto" if args.arbol else None)
+    writer = output = None
+    if args.derivaciones:
+        from .serialize import DerivationWriter
+        output = open(args.derivaciones, "wb")
+        writer = DerivationWriter(output, grammar)
+    if fmt not in (None, "texto"):
+        from .serialize import dumps
+    status = 0
+    try:
+        for string in _strings(args.cadenas):
+            budget = Budget(max_steps=args.pasos, timeout=args.plazo)
+            try:
+                accepted, result = parser.parse(string, budget)
+            except BudgetExceeded as e:
+                print(f"⚠ {string}: {e}")
+                status = 1
+                accepted, result = False, None
+            else:
+                if accepted:
+                    print(f"✓ {string}")
+                    if fmt == "texto":
+                        print(result.to_text())
+                    elif fmt:
+                        print(dumps(result, fmt).rstrip("\n"))
+                else:
+                    print(f"✗ {string}: {result}")
+                    status = 1
+            if writer:
+                writer.write(result if accepted else None)
+    finally:
+        if output:
+            output.close()
+    return status
+
+
+def generate(args: argparse.Namespace) -> int:
+    """Orden "generar": las cadenas más cortas del lenguaje, una por línea"""
+    from .generator import StringGenerator
+    try:
+        strings = StringGenerator(_load(args.gramatica)).generate_strings(args.n, Budget(timeout=args.plazo))
+    except BudgetExceeded as e:
+        print(f"⚠ {e}; se muestran las cadenas obtenidas hasta entonces", file=sys.stderr)
+        strings = e.partial
+    for string in strings:
+        print(string if string else "ε")
+    return 0
+
+
+def interface(args: argparse.Namespace) -> int:
+    """Orden "interfaz": abre la interfaz gráfica (la única que importa tkinter)"""
+    from .gui import main as gui_main
+    gui_main()
+    return 0
+
+
+def build_arg_parser() -> argparse.ArgumentParser:
+    """Analizador de argumentos con una suborden por tarea"""
+    arg_parser = argparse.ArgumentParser(description="Analizador sintáctico y generador de lenguajes")
+    commands = arg_parser.add_subparsers(dest="orden")
+
+    recognize_parser = commands.add_parser("reconocer", help="Decide si cada cadena pertenece al lenguaje")
+    recognize_parser.add_argument("gramatica", help="Archivo JSON de la gramática")
+    recognize_parser.add_argument("cadenas", nargs="*", help="Cadenas (por defecto, una por línea de stdin)")
+    recognize_parser.add_argument("--motor", default="auto", help="Motor de create_parser")
+    recognize_parser.add_argument("--recomendaciones",
+                                  help="Motores recomendados por gramatica.differential (para --motor auto)")
+    recognize_parser.add_argument("--arbol", action="store_true", help="Mostrar el árbol de las aceptadas")
+    recognize_parser.add_argument("--formato", choices=["texto", "json", "sexpr", "dot"],
+                                  help="Formato del árbol de las aceptadas (implica --arbol)")
+    recognize_parser.add_argument("--derivaciones",
+                                  help="Archivo binario con la derivación de cada cadena (ver gramatica.serialize)")
+    recognize_parser.add_argument("--pasos", type=int, default=5_000_000, help="Pasos máximos por cadena")
+    recognize_parser.add_argument("--plazo", type=float, default=5.0, help="Segundos máximos por cadena")
+    recognize_parser.set_defaults(run=recognize)
+
+    generate_parser = commands.add_parser("generar", help="Genera las cadenas más cortas")
+    generate_parser.add_argument("gramatica", help="Archivo JSON de la gramática")
+    generate_parser.add_argument("-n", type=int, default=10, help="Número de cadenas")
+    generate_parser.add_argument("--plazo", type=float, default=5.0, help="Segundos máximos")
+    generate_parser.set_defaults(run=generate)
+
+    interface_parser = commands.add_parser("interfaz", help="Abre la interfaz gráfica")
+    interface_parser.set_defaults(run=interface)
+    return arg_parser
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Punto de entrada; sin orden abre la interfaz gráfica"""
+    args = build_arg_parser().parse_args(argv)
+    if args.orden is None:
+        return interface(args)
+    try:
+        return args.run(args)
+    except (OSError, ValueError) as e:
+        print(f"Error: {e}", file=sys.stderr)
+        return 2
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,477 @@
+"""
+Módulo de reconocimiento CYK para gramáticas Tipo 2, secuencial y en paralelo
+
+La cadena se separa en terminales con GreedyLexer, como en los demás
+motores, y la tabla se llena sobre esa secuencia. La gramática se lleva a
+forma normal binaria sobre terminales: los lados derechos largos se parten
+en pares (compartiendo los sufijos comunes), las producciones ε se eliminan
+y las cadenas de producciones unitarias se pliegan en los resultados de cada
+regla. Así la celda (i, l) de la tabla es una máscara de bits con los
+símbolos que derivan los terminales i a i + l - 1, y combinar dos celdas es
+un AND de enteros.
+
+Además de las celdas, la tabla guarda dos mapas de bits por posición: qué
+tramos no vacíos empiezan y cuáles terminan en ella. Los puntos de corte de
+una celda son la intersección de ambos, de modo que en gramáticas poco
+ambiguas (tablas casi vacías) solo se examinan los cortes útiles.
+
+Las celdas de una misma antidiagonal (tramos de igual longitud) solo dependen
+de tramos más cortos, así que ParallelCYKParser las reparte entre un grupo de
+procesos que leen y escriben la tabla en memoria compartida
+(multiprocessing.shared_memory); cada antidiagonal espera a la anterior.
+
+Reconocer es O(|G|·n³) en el peor caso. parse construye el árbol (o el
+diagnóstico del rechazo) con GLRParser, que acepta las mismas gramáticas.
+"""
+
+from typing import Dict, List, NamedTuple, Optional, Set, Tuple
+from concurrent.futures import ProcessPoolExecutor
+import os
+
+from .grammar import Grammar
+from .parser import GreedyLexer, ParseResult, Parser, split_production
+from .budget import Budget
+from .stats import ParseStats
+
+
+# Terminales mínimos de la cadena para repartir la tabla entre procesos
+PARALLEL_THRESHOLD = 256
+
+# Cortes mínimos por tarea: las antidiagonales con menos trabajo se calculan en el proceso principal
+MIN_TASK_WORK = 20_000
+
+# Pares de celdas (izquierda, derecha) cuya combinación se memoriza antes de vaciar la caché
+COMBINE_CACHE_SIZE = 1 << 16
+
+
+class CNFTables(NamedTuple):
+    """Gramática en forma normal binaria, con los símbolos como bits"""
+    symbols: List[str]  # nombre de cada bit (no terminales, terminales y pares intermedios)
+    start: Optional[int]  # bit del símbolo inicial (None si no tiene producciones)
+    start_nullable: bool  # el símbolo inicial deriva ε
+    base: Dict[str, int]  # terminal → máscara de los símbolos que lo derivan
+    left_symbols: int  # máscara de los símbolos que aparecen a la izquierda de algún par
+    right_of: List[int]  # bit B → máscara de los C con alguna regla X → B C
+    results: List[Dict[int, int]]  # bit B → {bit C: máscara de los X que derivan B C}
+    words: int  # palabras de 64 bits por celda
+
+
+def compile_cnf(grammar: Grammar) -> CNFTables:
+    """
+    Lleva una gramática a forma normal binaria sobre terminales
+
+    Los símbolos se interpretan como en GLRParser: un símbolo con producciones
+    es no terminal (y, si además es terminal, también deriva su texto) y una
+    producción con símbolos desconocidos nunca se aplica.
+    """
+    sorted_non_terminals = sorted(grammar.non_terminals, key=len, reverse=True)
+    sorted_terminals = sorted(grammar.terminals, key=len, reverse=True)
+
+    symbols: List[str] = []
+    ids: Dict[object, int] = {}
+
+    def symbol_id(key: object, name: str) -> int:
+        if key not in ids:
+            ids[key] = len(symbols)
+            symbols.append(name)
+        return ids[key]
+
+    for left in grammar.productions:
+        symbol_id(left, left)
+
+    # Lados derechos como secuencias de bits: cada terminal es un bit propio
+    sequences: List[Tuple[int, Tuple[int, ...]]] = []
+    for left, rights in grammar.productions.items():
+        alternatives = list(rights)
+        if left in grammar.terminals and left:
+            alternatives.append(None)  # el no terminal también deriva su texto
+        for right in alternatives:
+            if right is None:
+                parts = [(None, left)]
+            else:
+                parts = [(symbol in grammar.productions, symbol)
+                         for symbol in split_production(right, sorted_non_terminals, sorted_terminals)
+                         if symbol != 'ε' and symbol != '']
+                if not all(known or symbol in grammar.terminals for known, symbol in parts):
+                    continue
+            sequence = tuple(ids[symbol] if is_non_terminal else symbol_id(('terminal', symbol), repr(symbol))
+                             for is_non_terminal, symbol in parts)
+            sequences.append((ids[left], sequence))
+
+    # Pares: X → B C, partiendo los lados derechos largos por la izquierda
+    pairs: List[Tuple[int, int, int]] = []
+    units: List[Tuple[int, int]] = []
+    empty: Set[int] = set()
+    suffixes: Dict[Tuple[int, ...], int] = {}
+
+    def suffix_id(sequence: Tuple[int, ...]) -> int:
+        if len(sequence) == 1:
+            return sequence[0]
+        if sequence not in suffixes:
+            suffixes[sequence] = symbol_id(('suffix', sequence), "⟨" + " ".join(symbols[s] for s in sequence) + "⟩")
+            pairs.append((suffixes[sequence], sequence[0], suffix_id(sequence[1:])))
+        return suffixes[sequence]
+
+    for left, sequence in sequences:
+        if not sequence:
+            empty.add(left)
+        elif len(sequence) == 1:
+            units.append((left, sequence[0]))
+        else:
+            pairs.append((left, sequence[0], suffix_id(sequence[1:])))
+
+    # Anulables, y producciones unitarias que dejan los pares con un hijo anulable
+    nullable = set(empty)
+    changed = True
+    while changed:
+        changed = False
+        for left, child in units:
+            if child in nullable and left not in nullable:
+                nullable.add(left)
+                changed = True
+        for left, first, second in pairs:
+            if first in nullable and second in nullable and left not in nullable:
+                nullable.add(left)
+                changed = True
+    for left, first, second in pairs:
+        if first in nullable:
+            units.append((left, second))
+        if second in nullable:
+            units.append((left, first))
+
+    # up[X]: símbolos que derivan X solo con producciones unitarias (X incluido)
+    up = [1 << s for s in range(len(symbols))]
+    changed = True
+    while changed:
+        changed = False
+        for left, child in units:
+            merged = up[child] | up[left]
+            if merged != up[child]:
+                up[child] = merged
+                changed = True
+
+    right_of = [0] * len(symbols)
+    results: List[Dict[int, int]] = [{} for _ in symbols]
+    left_symbols = 0
+    for left, first, second in pairs:
+        right_of[first] |= 1 << second
+        results[first][second] = results[first].get(second, 0) | up[left]
+        left_symbols |= 1 << first
+
+    start = ids.get(grammar.start_symbol) if grammar.start_symbol in grammar.productions else None
+    return CNFTables(
+        symbols=symbols,
+        start=start,
+        start_nullable=start is not None and start in nullable,
+        base={key[1]: up[s] for key, s in ids.items() if isinstance(key, tuple) and key[0] == 'terminal'},
+        left_symbols=left_symbols,
+        right_of=right_of,
+        results=results,
+        words=max(1, (len(symbols) + 63) // 64),
+    )
+
+
+class _Chart:
+    """
+    Tabla CYK sobre un búfer de bytes (bytearray o memoria compartida)
+
+    Celdas ordenadas por longitud de tramo, cada una de `words` palabras de 64
+    bits, seguidas de dos mapas de bits de n + 1 bits por posición: en
+    starts[i] el bit e indica que la celda de string[i:e] no está vacía, y en
+    ends[e] el bit i indica lo mismo.
+    """
+
+    def __init__(self, buffer, n: int, words: int):
+        self.n = n
+        self.words = words
+        self._cell_bytes = 8 * words
+        self._row_words = n // 64 + 1
+        cells = n * (n + 1) // 2
+        # Primera celda de cada longitud de tramo
+        self.offsets = [0, 0] + [(length - 1) * (n + 1) - (length - 1) * length // 2 for length in range(2, n + 1)]
+
+        view = memoryview(buffer)
+        rows_start = cells * self._cell_bytes
+        rows_size = (n + 1) * self._row_words * 8
+        self._cells = view[:rows_start]
+        self.cell_words = self._cells.cast('Q')
+        self._starts = view[rows_start:rows_start + rows_size]
+        self._ends = view[rows_start + rows_size:rows_start + 2 * rows_size]
+        self._start_words = self._starts.cast('Q')
+        self._end_words = self._ends.cast('Q')
+        self._view = view
+        # Celdas de varias palabras ya convertidas a entero en este proceso (no cambian una vez escritas)
+        self._decoded: Dict[int, int] = {}
+
+    @staticmethod
+    def size(n: int, words: int) -> int:
+        """Bytes que ocupa la tabla de una cadena de longitud n"""
+        return n * (n + 1) // 2 * 8 * words + 2 * (n + 1) * (n // 64 + 1) * 8
+
+    def cell(self, start: int, length: int) -> int:
+        index = self.offsets[length] + start
+        if self.words == 1:
+            return self.cell_words[index]
+        value = self._decoded.get(index)
+        if value is None:
+            value = int.from_bytes(self._cells[index * self._cell_bytes:(index + 1) * self._cell_bytes], 'little')
+            self._decoded[index] = value
+        return value
+
+    def store(self, start: int, length: int, mask: int):
+        index = self.offsets[length] + start
+        if self.words == 1:
+            self.cell_words[index] = mask
+        else:
+            self._cells[index * self._cell_bytes:(index + 1) * self._cell_bytes] = mask.to_bytes(self._cell_bytes, 'little')
+            self._decoded[index] = mask
+        end = start + length
+        self._start_words[start * self._row_words + end // 64] |= 1 << (end % 64)
+        self._end_words[end * self._row_words + start // 64] |= 1 << (start % 64)
+
+    def split_points(self, start: int, length: int) -> int:
+        """Máscara de los k (bit k - 1) tales que las celdas (start, k) y (start + k, length - k) no están vacías"""
+        size = self._row_words * 8
+        end = start + length
+        starts = int.from_bytes(self._starts[start * size:(start + 1) * size], 'little')
+        ends = int.from_bytes(self._ends[end * size:(end + 1) * size], 'little')
+        return ((starts & ends) >> (start + 1)) & ((1 << (length - 1)) - 1)
+
+    def release(self):
+        """Libera las vistas del búfer (necesario antes de cerrar la memoria compartida)"""
+        for view in (self.cell_words, self._start_words, self._end_words,
+                     self._cells, self._starts, self._ends, self._view):
+            view.release()
+
+
+def _combine(tables: CNFTables, left: int, right: int) -> int:
+    """Símbolos X con alguna regla X → B C, B en left y C en right"""
+    result = 0
+    candidates = left & tables.left_symbols
+    while candidates:
+        low = candidates & -candidates
+        candidates ^= low
+        first = low.bit_length() - 1
+        hits = right & tables.right_of[first]
+        if hits:
+            row = tables.results[first]
+            while hits:
+                low = hits & -hits
+                hits ^= low
+                result |= row[low.bit_length() - 1]
+    return result
+
+
+def _fill_cells(tables: CNFTables, chart: _Chart, length: int, first: int, last: int,
+                memo: Dict[Tuple[int, int], int]) -> Tuple[int, int]:
+    """
+    Calcula las celdas de longitud `length` que empiezan en [first, last)
+
+    Returns:
+        (cortes examinados, combinaciones tomadas de memo)
+    """
+    work = 0
+    hits = 0
+    cell = chart.cell
+    # Con una palabra por celda se lee directamente de la vista (es el bucle más caliente)
+    offsets = chart.offsets
+    words = chart.cell_words if chart.words == 1 else None
+    for start in range(first, last):
+        splits = chart.split_points(start, length)
+        mask = 0
+        while splits:
+            low = splits & -splits
+            splits ^= low
+            k = low.bit_length()
+            if words is not None:
+                key = (words[offsets[k] + start], words[offsets[length - k] + start + k])
+            else:
+                key = (cell(start, k), cell(start + k, length - k))
+            combined = memo.get(key)
+            if combined is None:
+                if len(memo) >= COMBINE_CACHE_SIZE:
+                    memo.clear()
+                combined = memo[key] = _combine(tables, *key)
+            else:
+                hits += 1
+            mask |= combined
+            work += 1
+        if mask:
+            chart.store(start, length, mask)
+    return work, hits
+
+
+class CYKParser(Parser):
+    """
+    Reconocedor CYK con máscaras de bits para gramáticas Tipo 2
+
+    Ejemplo:
+        parser = CYKParser(grammar)
+        parser.recognize("a+a*a")
+    """
+
+    def __init__(self, grammar: Grammar):
+        super().__init__(grammar)
+        self.tables = compile_cnf(grammar)
+        self._lexer = GreedyLexer(grammar.terminals)
+        self._memo: Dict[Tuple[int, int], int] = {}
+        self._tree_parser: Optional[Parser] = None
+
+    def parse(self, string: str, budget: Optional[Budget] = None,
+              stats: Optional[ParseStats] = None) -> ParseResult:
+        """
+        Analiza la cadena con GLRParser, que construye el árbol o el diagnóstico
+
+        La tabla CYK solo decide la pertenencia; para eso basta recognize.
+        """
+        if self._tree_parser is None:
+            from .glr import GLRParser
+            self._tree_parser = GLRParser(self.grammar)
+        return self._tree_parser.parse(string, budget, stats)
+
+    def recognize(self, string: str, budget: Optional[Budget] = None) -> bool:
+        """
+        Decide si la cadena pertenece al lenguaje llenando la tabla CYK
+
+        Raises:
+            BudgetExceeded: Si se agota el presupuesto (un paso por corte examinado)
+        """
+        if budget is None:
+            return self._recognize(string)
+        with self._session(budget, None):
+            return self._recognize(string)
+
+    def _recognize(self, string: str) -> bool:
+        tables = self.tables
+        if tables.start is None:
+            return False
+        tokens, stop = self._lexer.tokenize(string)
+        if stop < len(string):
+            return False  # ningún terminal empieza en stop
+        if not tokens:
+            return tables.start_nullable
+        bases = [tables.base.get(token, 0) for token in tokens]
+        if not all(bases):
+            return False  # algún terminal no aparece en ninguna producción
+        return self._fill(bases)
+
+    def _fill(self, bases: List[int]) -> bool:
+        """Llena la tabla por antidiagonales en este proceso"""
+        n = len(bases)
+        chart = _Chart(bytearray(_Chart.size(n, self.tables.words)), n, self.tables.words)
+        try:
+            for start, mask in enumerate(bases):
+                chart.store(start, 1, mask)
+            for length in range(2, n + 1):
+                self._account(*_fill_cells(self.tables, chart, length, 0, n - length + 1, self._memo),
+                              n - length + 1)
+            return bool(chart.cell(0, n) >> self.tables.start & 1)
+        finally:
+            chart.release()
+
+    def _account(self, work: int, hits: int, cells: int):
+        """Descuenta del presupuesto y suma a las estadísticas el trabajo de una antidiagonal"""
+        if self._budget is not None:
+            self._budget.tick(work + 1)
+        if self._stats is not None:
+            self._stats.states_visited += cells
+            self._stats.memo_hits += hits
+
+
+# Trabajadores: reciben la gramática compilada una sola vez al arrancar
+_worker_tables: Optional[CNFTables] = None
+_worker_memo: Dict[Tuple[int, int], int] = {}
+
+
+def _init_worker(tables: CNFTables):
+    """Inicializa un proceso trabajador con la gramática en forma normal"""
+    global _worker_tables
+    _worker_tables = tables
+    _worker_memo.clear()
+
+
+def _fill_in_worker(name: str, n: int, length: int, first: int, last: int) -> Tuple[int, int]:
+    """Tarea ejecutada en un proceso trabajador sobre la tabla en memoria compartida"""
+    from multiprocessing import shared_memory
+    memory = shared_memory.SharedMemory(name=name)
+    chart = _Chart(memory.buf, n, _worker_tables.words)
+    try:
+        return _fill_cells(_worker_tables, chart, length, first, last, _worker_memo)
+    finally:
+        chart.release()
+        memory.close()
+
+
+class ParallelCYKParser(CYKParser):
+    """
+    Reconocedor CYK que reparte cada antidiagonal entre un grupo de procesos
+
+    Las cadenas cortas (menos de `threshold` terminales) se reconocen en el
+    propio proceso, igual que con CYKParser. El grupo se crea con el primer
+    análisis largo y se detiene con close() o al salir de un bloque with.
+
+    Ejemplo:
+        with ParallelCYKParser(grammar, processes=4) as parser:
+            parser.recognize(cadena_larga)
+    """
+
+    def __init__(self, grammar: Grammar, processes: Optional[int] = None,
+                 threshold: int = PARALLEL_THRESHOLD):
+        """
+        Args:
+            grammar: Gramática a analizar
+            processes: Procesos trabajadores (por defecto, uno por CPU)
+            threshold: Terminales mínimos de la cadena para usar el grupo
+        """
+        super().__init__(grammar)
+        self.processes = processes or os.cpu_count() or 1
+        self.threshold = threshold
+        self._pool: Optional[ProcessPoolExecutor] = None
+
+    def _fill(self, bases: List[int]) -> bool:
+        n = len(bases)
+        if n < self.threshold or self.processes < 2:
+            return super()._fill(bases)
+        if self._pool is None:
+            self._pool = ProcessPoolExecutor(self.processes, initializer=_init_worker,
+                                             initargs=(self.tables,))
+
+        from multiprocessing import shared_memory
+        memory = shared_memory.SharedMemory(create=True, size=_Chart.size(n, self.tables.words))
+        chart = _Chart(memory.buf, n, self.tables.words)
+        try:
+            for start, mask in enumerate(bases):
+                chart.store(start, 1, mask)
+            for length in range(2, n + 1):
+                cells = n - length + 1
+                tasks = min(self.processes * 2, cells * (length - 1) // MIN_TASK_WORK)
+                if tasks < 2:
+                    self._account(*_fill_cells(self.tables, chart, length, 0, cells, self._memo), cells)
+                    continue
+                bounds = [cells * task // tasks for task in range(tasks + 1)]
+                futures = [self._pool.submit(_fill_in_worker, memory.name, n, length, first, last)
+                           for first, last in zip(bounds, bounds[1:])]
+                work = hits = 0
+                for future in futures:
+                    task_work, task_hits = future.result()
+                    work += task_work
+                    hits += task_hits
+                self._account(work, hits, cells)
+            return bool(chart.cell(0, n) >> self.tables.start & 1)
+        finally:
+            chart.release()
+            memory.close()
+            memory.unlink()
+
+    def close(self):
+        """Detiene los procesos trabajadores"""
+        if self._pool is not None:
+            self._pool.shutdown()
+            self._pool = None
+
+    def __enter__(self) -> 'ParallelCYKParser':
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+        return False
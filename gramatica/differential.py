@@ -0,0 +1,406 @@
+"""
+Banco diferencial de motores: consistencia, rendimiento y recomendación
+
+Ejecuta todos los motores aplicables a una gramática sobre un corpus (leído
+de un archivo o generado con StringGenerator más mutaciones que suelen
+quedar fuera del lenguaje), comprueba que todos deciden lo mismo que el
+motor de referencia (Type2Parser) y mide, por motor, latencia (percentiles),
+rendimiento y pico de memoria (tracemalloc, en una pasada aparte para no
+falsear los tiempos).
+
+En modo "parse" se comprueba además que el árbol de cada cadena aceptada se
+recupera igual de JSON, de expresiones S y de su derivación binaria
+(gramatica.serialize).
+
+El motor recomendado es el más rápido de los que coinciden con la referencia
+en todas las cadenas (y, en modo "parse", serializan bien sus árboles). Las
+recomendaciones se guardan en un JSON indexado por FrozenGrammar.fingerprint,
+una por modo: las medidas de recognize no dicen nada del coste de construir
+árboles. Tras load_engine_recommendations, create_parser con engine="auto"
+usa el motor recomendado para esas gramáticas en el modo pedido.
+
+Uso:
+    python -m gramatica.differential punto2.json -n 300 --recomendaciones motores.json
+    python -m gramatica.differential expr.json --corpus cadenas.txt --modo recognize
+"""
+
+from typing import Dict, List, NamedTuple, Optional
+import argparse
+import json
+import random
+import sys
+import time
+
+from .grammar import Grammar
+from .parser import create_parser, ENGINE_MODES, ENGINE_RECOMMENDATIONS
+from .tree import DerivationTree, TreeNode
+from .generator import StringGenerator
+from .budget import Budget, BudgetExceeded
+from .benchmark import percentile
+
+
+# Motores que se comparan por defecto según el tipo de gramática. En las Tipo 3 no se
+# incluye "glr": su autómata LR(0) repite la construcción de subconjuntos y crece de
+# forma exponencial con las gramáticas lineales por la derecha no deterministas.
+ENGINES_BY_TYPE = {
+    "Tipo 2": ["tipo2", "incremental", "glr", "cyk"],
+    "Tipo 3": ["tipo3", "regex", "tipo2", "incremental", "cyk"],
+}
+
+# Motor cuyas decisiones se toman como correctas; se ejecuta aunque no se pida
+REFERENCE_ENGINE = "tipo2"
+
+
+class EngineResult(NamedTuple):
+    """Medidas de un motor sobre el corpus"""
+    engine: str
+    decisions: List[Optional[bool]]  # por cadena: aceptada, rechazada o None si no decidió
+    errors: int  # cadenas no decididas (presupuesto agotado o error)
+    build_time: float  # segundos en construir el parser
+    p50: float
+    p90: float
+    p99: float
+    throughput: float  # caracteres por segundo sobre todo el corpus
+    peak_memory: int  # bytes, construcción incluida
+    serialization_errors: List[str]  # árboles que no se recuperan igual al serializarlos (modo "parse")
+
+
+class Disagreement(NamedTuple):
+    """Cadena en la que algún motor no coincide con la referencia"""
+    string: str
+    expected: Optional[bool]  # decisión de la referencia; si no decidió, la de la mayoría (None si hubo empate)
+    decisions: Dict[str, Optional[bool]]
+
+
+class DifferentialReport(NamedTuple):
+    """Resultado del banco diferencial"""
+    grammar: str
+    fingerprint: str
+    mode: str  # "parse" o "recognize"
+    corpus: int  # cadenas analizadas
+    engines: List[EngineResult]
+    disagreements: List[Disagreement]
+    agreeing: List[str]  # motores que deciden todo el corpus como la referencia (y serializan bien en "parse")
+    recommended: Optional[str]  # el más rápido de agreeing, o None si está vacío
+
+    @property
+    def consistent(self) -> bool:
+        return not self.disagreements and not any(result.serialization_errors for result in self.engines)
+
+    def assert_consistent(self):
+        """
+        Raises:
+            AssertionError: Si algún motor no coincide con la referencia o sus árboles no se serializan
+        """
+        if self.disagreements:
+            raise AssertionError(f"{len(self.disagreements)} cadenas con decisiones distintas, "
+                                 f"la primera {self.disagreements[0].string!r}: {self.disagreements[0].decisions}")
+        for result in self.engines:
+            if result.serialization_errors:
+                raise AssertionError(f"{result.engine}: {len(result.serialization_errors)} árboles no se "
+                                     f"serializan, el primero {result.serialization_errors[0]}")
+
+    def to_dict(self) -> dict:
+        """Convierte el informe a un diccionario serializable a JSON"""
+        return {
+            "grammar": self.grammar,
+            "fingerprint": self.fingerprint,
+            "mode": self.mode,
+            "corpus": self.corpus,
+            "agreeing": self.agreeing,
+            "recommended": self.recommended,
+            "engines": [{key: value for key, value in result._asdict().items() if key != "decisions"}
+                        for result in self.engines],
+            "disagreements": [disagreement._asdict() for disagreement in self.disagreements],
+        }
+
+
+def generated_corpus(grammar: Grammar, count: int = 200, mutations: bool = True, seed: int = 0,
+                     timeout: float = 10.0) -> List[str]:
+    """
+    Corpus de las cadenas más cortas del lenguaje y, opcionalmente, de sus mutaciones
+
+    Las mutaciones (borrar, insertar o cambiar un carácter del alfabeto) suelen
+    quedar fuera del lenguaje y sirven para comparar también los rechazos.
+    """
+    try:
+        members = StringGenerator(grammar).generate_strings(count, Budget(timeout=timeout))
+    except BudgetExceeded as e:
+        members = e.partial or []
+    if not mutations:
+        return members
+
+    rng = random.Random(seed)
+    alphabet = sorted(set("".join(grammar.terminals))) or ["a"]
+    corpus = list(members)
+    seen = set(members)
+    for string in members:
+        position = rng.randint(0, len(string))
+        operation = rng.choice(("borrar", "insertar", "cambiar"))
+        if operation == "insertar" or not string:
+            mutated = string[:position] + rng.choice(alphabet) + string[position:]
+        elif operation == "borrar":
+            position = min(position, len(string) - 1)
+            mutated = string[:position] + string[position + 1:]
+        else:
+            position = min(position, len(string) - 1)
+            mutated = string[:position] + rng.choice(alphabet) + string[position + 1:]
+        if mutated not in seen:
+            seen.add(mutated)
+            corpus.append(mutated)
+    return corpus
+
+
+def _decide(parser, string: str, mode: str, timeout: float) -> Optional[bool]:
+    """Acepta o rechaza una cadena; None si se agotó el presupuesto o el motor falló"""
+    budget = Budget(timeout=timeout)
+    try:
+        if mode == "recognize":
+            return parser.recognize(string, budget)
+        return parser.parse(string, budget)[0]
+    except (BudgetExceeded, RecursionError):
+        return None
+
+
+def _same_tree(first: TreeNode, second: TreeNode) -> bool:
+    """Compara dos árboles nodo a nodo sin recursión"""
+    stack = [(first, second)]
+    while stack:
+        a, b = stack.pop()
+        if a.symbol != b.symbol or len(a.children) != len(b.children):
+            return False
+        stack.extend(zip(a.children, b.children))
+    return True
+
+
+def _serialization_error(tree: DerivationTree, grammar: Grammar) -> Optional[str]:
+    """Motivo por el que el árbol no se recupera igual de algún formato, o None"""
+    from . import serialize
+    try:
+        for fmt in ("json", "sexpr"):
+            if not _same_tree(serialize.loads(serialize.dumps(tree, fmt), fmt).root, tree.root):
+                return f"{fmt}: el árbol recuperado es distinto"
+        decoded = serialize.decode_derivation(serialize.encode_derivation(tree, grammar), grammar)
+        if not _same_tree(decoded.root, tree.root):
+            return "derivación: el árbol recuperado es distinto"
+    except ValueError as e:
+        return str(e)
+    return None
+
+
+def _check_serialization(parser, grammar: Grammar, corpus: List[str], decisions: List[Optional[bool]],
+                         timeout: float) -> List[str]:
+    """Serializa y recupera el árbol de cada cadena aceptada (ver _serialization_error)"""
+    errors = []
+    for string, decision in zip(corpus, decisions):
+        if not decision:
+            continue
+        accepted, tree = parser.parse(string, Budget(timeout=timeout))
+        error = _serialization_error(tree, grammar) if accepted else "la cadena ya no se acepta"
+        if error is not None:
+            errors.append(f"{string!r}: {error}")
+    return errors
+
+
+def _measure_engine(grammar: Grammar, engine: str, corpus: List[str], mode: str, repetitions: int,
+                    timeout: float) -> EngineResult:
+    """Mide un motor: una pasada con tiempos y otra con tracemalloc"""
+    started = time.perf_counter()
+    parser = create_parser(grammar, engine)
+    build_time = time.perf_counter() - started
+
+    decisions: List[Optional[bool]] = []
+    latencies: List[float] = []
+    total = 0.0
+    for string in corpus:
+        decision = None
+        for _ in range(repetitions):
+            started = time.perf_counter()
+            decision = _decide(parser, string, mode, timeout)
+            elapsed = time.perf_counter() - started
+            latencies.append(elapsed)
+            total += elapsed
+            if decision is None:
+                break  # Las demás repeticiones agotarían el plazo igual
+        decisions.append(decision)
+
+    import tracemalloc
+    already_tracing = tracemalloc.is_tracing()
+    if not already_tracing:
+        tracemalloc.start()
+    base = tracemalloc.get_traced_memory()[0]
+    if hasattr(tracemalloc, "reset_peak"):
+        tracemalloc.reset_peak()
+    try:
+        parser = create_parser(grammar, engine)
+        for string, decision in zip(corpus, decisions):
+            if decision is not None:
+                _decide(parser, string, mode, timeout)
+        peak_memory = max(0, tracemalloc.get_traced_memory()[1] - base)
+    finally:
+        del parser
+        if not already_tracing:
+            tracemalloc.stop()
+
+    serialization_errors = []
+    if mode == "parse":
+        serialization_errors = _check_serialization(create_parser(grammar, engine), grammar, corpus,
+                                                    decisions, timeout)
+
+    characters = sum(len(string) * (repetitions if decision is not None else 1)
+                     for string, decision in zip(corpus, decisions))
+    return EngineResult(
+        engine=engine,
+        decisions=decisions,
+        errors=decisions.count(None),
+        build_time=build_time,
+        p50=percentile(latencies, 0.50) if latencies else 0.0,
+        p90=percentile(latencies, 0.90) if latencies else 0.0,
+        p99=percentile(latencies, 0.99) if latencies else 0.0,
+        throughput=characters / total if total > 0 else 0.0,
+        peak_memory=peak_memory,
+        serialization_errors=serialization_errors,
+    )
+
+
+def run_differential(grammar: Grammar, corpus: List[str], engines: Optional[List[str]] = None,
+                     mode: str = "parse", repetitions: int = 3, timeout: float = 2.0,
+                     verbose: bool = False) -> DifferentialReport:
+    """
+    Ejecuta los motores sobre el corpus, compara sus decisiones y recomienda uno
+
+    Args:
+        grammar: Gramática (mutable o congelada)
+        corpus: Cadenas a analizar
+        engines: Motores de create_parser (por defecto, todos los aplicables al tipo);
+            REFERENCE_ENGINE se añade si falta
+        mode: "parse" (con árbol) o "recognize" (solo pertenencia)
+        repetitions: Medidas por cadena
+        timeout: Segundos máximos por cadena; si se agotan, la cadena queda sin decidir
+
+    Returns:
+        DifferentialReport con las medidas, las discrepancias y el motor recomendado
+    """
+    if mode not in ENGINE_MODES:
+        raise ValueError(f"Modo desconocido: {mode}")
+    frozen = grammar.freeze()
+    engines = list(engines or ENGINES_BY_TYPE.get(frozen.type, ENGINES_BY_TYPE["Tipo 2"]))
+    if REFERENCE_ENGINE not in engines:
+        engines.insert(0, REFERENCE_ENGINE)
+    results = []
+    for engine in engines:
+        result = _measure_engine(frozen, engine, corpus, mode, repetitions, timeout)
+        results.append(result)
+        if verbose:
+            print(f"{engine:<12} p50={result.p50 * 1000:9.3f} ms  p90={result.p90 * 1000:9.3f} ms  "
+                  f"p99={result.p99 * 1000:9.3f} ms  {result.throughput:12.0f} car/s  "
+                  f"pico={result.peak_memory / 1024:10.1f} KiB  sin decidir={result.errors}"
+                  + (f"  sin serializar={len(result.serialization_errors)}" if result.serialization_errors else ""))
+
+    # Cada cadena se compara con la referencia; si esta no decidió, con la mayoría de los que decidieron
+    disagreements = []
+    wrong: Dict[str, int] = {result.engine: 0 for result in results}
+    for index, string in enumerate(corpus):
+        decisions = {result.engine: result.decisions[index] for result in results}
+        expected = decisions[REFERENCE_ENGINE]
+        if expected is None:
+            votes = [decision for decision in decisions.values() if decision is not None]
+            accepted = votes.count(True)
+            expected = None if accepted * 2 == len(votes) else accepted * 2 > len(votes)
+        if any(decision is not None and decision != expected for decision in decisions.values()):
+            disagreements.append(Disagreement(string, expected, decisions))
+            for engine, decision in decisions.items():
+                if decision is not None and decision != expected:
+                    wrong[engine] += 1
+
+    # Solo cuentan los que coinciden con la referencia, deciden todas las cadenas y serializan bien
+    agreeing = [result for result in results
+                if not wrong[result.engine] and not result.errors and not result.serialization_errors]
+    recommended = max(agreeing, key=lambda result: result.throughput).engine if agreeing else None
+    return DifferentialReport(frozen.name, frozen.fingerprint, mode, len(corpus), results,
+                              disagreements, [result.engine for result in agreeing], recommended)
+
+
+def save_recommendation(path: str, report: DifferentialReport):
+    """
+    Añade (o sustituye) la recomendación del informe en el archivo JSON de recomendaciones
+
+    Cada gramática guarda una entrada por modo, con el rendimiento de los
+    motores que coincidieron con la referencia; la del otro modo se conserva.
+    """
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            recommendations = json.load(f)
+    except FileNotFoundError:
+        recommendations = {}
+    entry = recommendations.get(report.fingerprint, {})
+    if "engine" in entry:
+        entry = {}  # Formato antiguo, de un solo modo y sin comprobar contra la referencia
+    agreeing = set(report.agreeing)
+    entry["grammar"] = report.grammar
+    entry[report.mode] = {
+        "engine": report.recommended,
+        "corpus": report.corpus,
+        "throughput": {result.engine: result.throughput for result in report.engines if result.engine in agreeing},
+        "date": time.strftime("%Y-%m-%d %H:%M:%S"),
+    }
+    recommendations[report.fingerprint] = entry
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(recommendations, f, indent=2, ensure_ascii=False)
+    if report.recommended is not None:
+        ENGINE_RECOMMENDATIONS[(report.fingerprint, report.mode)] = report.recommended
+    else:
+        ENGINE_RECOMMENDATIONS.pop((report.fingerprint, report.mode), None)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Punto de entrada de línea de comandos; termina con código 1 si los motores discrepan"""
+    arg_parser = argparse.ArgumentParser(description="Banco diferencial de motores de análisis")
+    arg_parser.add_argument("gramatica", help="Archivo JSON de la gramática")
+    arg_parser.add_argument("--corpus", help="Archivo con una cadena por línea (por defecto, se genera)")
+    arg_parser.add_argument("-n", type=int, default=200, help="Cadenas del lenguaje a generar")
+    arg_parser.add_argument("--motores", nargs="*", help="Motores a comparar (por defecto, todos los aplicables)")
+    arg_parser.add_argument("--modo", choices=ENGINE_MODES, default="parse")
+    arg_parser.add_argument("--repeticiones", type=int, default=3)
+    arg_parser.add_argument("--plazo", type=float, default=2.0, help="Segundos máximos por cadena")
+    arg_parser.add_argument("--salida", help="Archivo JSON donde guardar el informe")
+    arg_parser.add_argument("--recomendaciones", help="Archivo JSON de recomendaciones que se actualiza")
+    args = arg_parser.parse_args(argv)
+
+    grammar = Grammar.load_from_file(args.gramatica)
+    is_valid, message = grammar.validate()
+    if not is_valid:
+        print(f"Gramática inválida: {message}", file=sys.stderr)
+        return 2
+    if args.corpus:
+        with open(args.corpus, 'r', encoding='utf-8') as f:
+            corpus = [line.rstrip("\n") for line in f]
+    else:
+        corpus = generated_corpus(grammar, args.n)
+
+    report = run_differential(grammar, corpus, args.motores, args.modo, args.repeticiones, args.plazo,
+                              verbose=True)
+    if args.salida:
+        with open(args.salida, 'w', encoding='utf-8') as f:
+            json.dump(report.to_dict(), f, indent=2, ensure_ascii=False)
+    if args.recomendaciones:
+        save_recommendation(args.recomendaciones, report)
+
+    print(f"\n{report.corpus} cadenas; motor recomendado en modo {report.mode}: {report.recommended or 'ninguno'}")
+    if report.disagreements:
+        print("\nDISCREPANCIAS:")
+        for disagreement in report.disagreements[:20]:
+            print(f"  ✗ {disagreement.string!r}: esperado {disagreement.expected}, {disagreement.decisions}")
+    for result in report.engines:
+        if result.serialization_errors:
+            print(f"\nÁRBOLES QUE NO SE SERIALIZAN ({result.engine}):")
+            for error in result.serialization_errors[:20]:
+                print(f"  ✗ {error}")
+    if not report.consistent:
+        return 1
+    print("✓ Todos los motores coinciden")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,157 @@
+"""
+Módulo para generar cadenas del lenguaje usando BFS
+"""
+
+from typing import Callable, List, NamedTuple, Optional, Set, Tuple, Deque
+from collections import deque
+from .grammar import Grammar
+from .budget import Budget, BudgetExceeded
+from .visited import ExactVisitedSet, VisitedSet
+
+
+class GenerationReport(NamedTuple):
+    """Resumen de la última generación, con lo que se pudo haber omitido"""
+    strings: int  # cadenas generadas
+    forms: int  # formas sentenciales distintas registradas
+    exact: bool  # deduplicación exacta (ninguna forma descartada por error)
+    false_positive_rate: float  # probabilidad estimada, al final, de descartar una forma nueva
+    depth_limited: bool  # se descartaron formas por superar la profundidad máxima
+    exhausted: bool  # no quedaban formas por explorar
+    
+    @property
+    def complete(self) -> bool:
+        """True si ninguna forma alcanzable se perdió por la deduplicación o la profundidad"""
+        return self.exact and not self.depth_limited
+
+
+class StringGenerator:
+    """Generador de cadenas para gramáticas"""
+    
+    def __init__(self, grammar: Grammar, visited_factory: Callable[[], VisitedSet] = ExactVisitedSet):
+        """
+        Args:
+            grammar: Gramática a usar
+            visited_factory: Crea el conjunto de formas visitadas de cada generación, por ejemplo
+                functools.partial(BloomVisitedSet, max_memory=1 << 20) para acotar la memoria
+        """
+        self.grammar = grammar
+        self.visited_factory = visited_factory
+        self.report: Optional[GenerationReport] = None  # Resumen de la última llamada
+        # Si un terminal es prefijo de otro, una forma puede separarse distinto que con el
+        # analizador léxico voraz (a·b frente a ab); entonces se comprueba cada cadena
+        terminals = sorted(terminal for terminal in grammar.terminals if terminal)
+        self._ambiguous_lexing = any(following.startswith(terminal)
+                                     for terminal, following in zip(terminals, terminals[1:]))
+        self._recognizer = None
+    
+    def generate_strings(self, max_count: int = 10, budget: Optional[Budget] = None) -> List[str]:
+        """
+        Genera las primeras max_count cadenas más cortas usando BFS
+        
+        Args:
+            max_count: Número máximo de cadenas a generar
+            budget: Límite opcional de pasos, tiempo y memoria
+            
+        Returns:
+            Lista de cadenas ordenadas por longitud
+        
+        Raises:
+            BudgetExceeded: Si se agota el presupuesto; las cadenas ya
+                generadas quedan en su atributo partial
+        """
+        if budget is None:
+            return self._generate(max_count, None)
+        
+        with budget:
+            return self._generate(max_count, budget)
+    
+    def _generate(self, max_count: int, budget: Optional[Budget]) -> List[str]:
+        """Búsqueda en anchura (ver generate_strings)"""
+        visited = self.visited_factory()  # Formas sentenciales ya encoladas
+        generated: List[str] = []
+        outcome = (False, False)
+        try:
+            with visited:
+                outcome = self._search(max_count, budget, visited, generated)
+        finally:
+            self.report = GenerationReport(len(generated), len(visited), visited.exact,
+                                           visited.false_positive_rate(), *outcome)
+        return generated
+    
+    def _search(self, max_count: int, budget: Optional[Budget], visited: VisitedSet,
+                generated: List[str]) -> Tuple[bool, bool]:
+        """
+        Recorre las formas sentenciales añadiendo a generated las cadenas terminales
+        
+        Returns:
+            (se descartó alguna forma por la profundidad máxima, no quedan formas por explorar)
+        """
+        emitted: Set[str] = set()  # Cadenas terminales ya vistas, del lenguaje o no (consulta en O(1))
+        depth_limited = False
+        
+        # Cola para BFS: (cadena_actual, profundidad)
+        queue: Deque[Tuple[str, int]] = deque()
+        queue.append((self.grammar.start_symbol, 0))
+        visited.add(self.grammar.start_symbol)
+        
+        max_depth = 20  # Límite de profundidad para evitar bucles infinitos
+        
+        while queue and len(generated) < max_count:
+            current, depth = queue.popleft()
+            
+            if budget is not None:
+                try:
+                    budget.tick()
+                except BudgetExceeded as exceeded:
+                    exceeded.partial = list(generated)
+                    raise
+            
+            if depth > max_depth:
+                depth_limited = True
+                continue
+            
+            # Verificar si es una cadena terminal (solo contiene terminales)
+            if self._is_terminal_string(current):
+                # Limpiar símbolos no terminales residuales (no debería pasar)
+                clean_string = self._clean_string(current)
+                if clean_string not in emitted:
+                    emitted.add(clean_string)
+                    if self._in_language(clean_string):
+                        generated.append(clean_string)
+                continue
+            
+            # Aplicar todas las producciones posibles
+            for i in range(len(current)):
+                symbol = current[i]
+                if symbol in self.grammar.non_terminals:
+                    # Reemplazar este símbolo con todas sus producciones
+                    for production in self.grammar.productions.get(symbol, []):
+                        new_string = current[:i] + production + current[i+1:]
+                        
+                        # Evitar duplicados
+                        if visited.add(new_string):
+                            queue.append((new_string, depth + 1))
+                    break  # Solo reemplazar el primer no terminal encontrado (BFS por niveles)
+        
+        return depth_limited, not queue
+    
+    def _in_language(self, string: str) -> bool:
+        """True si los parsers aceptan la cadena (solo se pregunta si la separación puede diferir)"""
+        if not self._ambiguous_lexing:
+            return True
+        if self._recognizer is None:
+            from .parser import create_parser
+            self._recognizer = create_parser(self.grammar, mode="recognize")
+        return self._recognizer.recognize(string)
+    
+    def _is_terminal_string(self, string: str) -> bool:
+        """Verifica si una cadena contiene solo símbolos terminales"""
+        for char in string:
+            if char in self.grammar.non_terminals:
+                return False
+        return True
+    
+    def _clean_string(self, string: str) -> str:
+        """Limpia una cadena eliminando espacios y caracteres especiales"""
+        return string.replace('ε', '').replace(' ', '')
+
@@ -0,0 +1,557 @@
+"""
+Módulo de análisis LR generalizado (GLR) para gramáticas Tipo 2
+
+Construye el autómata LR(0) de la gramática (con reducciones filtradas por
+los conjuntos SIGUIENTE, como en SLR) y lo simula sobre la cadena con una
+pila estructurada en grafo (GSS): cuando hay conflictos se siguen todas las
+alternativas a la vez compartiendo los prefijos comunes. Los terminales
+pueden tener varios caracteres: desde la posición i se desplaza el terminal
+que reconoce allí GreedyLexer (el más largo) y se llega a i + len(terminal),
+así que solo se crean los niveles donde empieza un terminal.
+
+El resultado es un bosque empaquetado compartido (SPPF), en el que cada
+nodo (símbolo, inicio, fin) guarda todas sus alternativas. Es casi lineal en
+gramáticas casi deterministas y polinómico en el peor caso, incluso con
+gramáticas muy ambiguas como S → SS | a.
+
+Las producciones ε se eliminan de antemano: cada producción con símbolos
+anulables se sustituye por variantes sin ellos. Los símbolos omitidos se
+restituyen con su derivación vacía al construir el árbol.
+"""
+
+from typing import Dict, FrozenSet, Iterator, List, Optional, Set, Tuple
+from collections import deque
+from contextlib import contextmanager
+from itertools import combinations
+import gc
+
+from .grammar import Grammar
+from .parser import END_OF_INPUT, GreedyLexer, ParseError, ParseResult, Parser, split_production
+from .tree import DerivationTree, TreeNode
+
+
+_EOF = -1  # Terminal ficticio de fin de entrada (para los conjuntos SIGUIENTE)
+
+
+@contextmanager
+def _gc_paused():
+    """
+    Suspende el recolector cíclico mientras se crean el bosque y el árbol
+
+    Ninguna de las dos estructuras tiene ciclos (el conteo de referencias
+    las libera), pero sus cientos de miles de objetos disparan recorridos
+    completos del recolector que llegan a triplicar el tiempo.
+    """
+    enabled = gc.isenabled()
+    gc.disable()
+    try:
+        yield
+    finally:
+        if enabled:
+            gc.enable()
+
+
+class ForestNode:
+    """
+    Nodo del bosque empaquetado: un símbolo que deriva text[start:end]
+
+    Cada alternativa es (índice_de_producción, hijos); los terminales no
+    tienen alternativas.
+    """
+
+    __slots__ = ('symbol', 'start', 'end', 'alternatives', '_seen')
+
+    def __init__(self, symbol: str, start: int, end: int):
+        self.symbol = symbol
+        self.start = start
+        self.end = end
+        self.alternatives: List[Tuple[int, Tuple['ForestNode', ...]]] = []
+        self._seen: Set[Tuple[int, Tuple['ForestNode', ...]]] = set()
+
+    def add_alternative(self, production: int, children: Tuple['ForestNode', ...]) -> bool:
+        """Añade una alternativa si es nueva; devuelve True si se añadió"""
+        key = (production, children)
+        if key in self._seen:
+            return False
+        self._seen.add(key)
+        self.alternatives.append((production, children))
+        return True
+
+    def is_ambiguous(self) -> bool:
+        """True si el nodo tiene más de una alternativa"""
+        return len(self.alternatives) > 1
+
+    def __repr__(self):
+        return f"ForestNode({self.symbol!r}, {self.start}, {self.end}, {len(self.alternatives)} alternativas)"
+
+
+class _StackNode:
+    """Nodo de la pila estructurada en grafo: estado LR alcanzado en una posición"""
+
+    __slots__ = ('state', 'level', 'edges')
+
+    def __init__(self, state: int, level: int):
+        self.state = state
+        self.level = level
+        self.edges: Dict['_StackNode', ForestNode] = {}  # nodo anterior → subárbol entre ambos
+
+
+class GLRParser(Parser):
+    """
+    Parser GLR con pila estructurada en grafo y bosque empaquetado
+
+    Decide la pertenencia al lenguaje de la gramática sobre los terminales de
+    GreedyLexer, como los demás motores. parse() devuelve uno de los árboles
+    (el primero en derivarse completo); parse_forest() devuelve el bosque con
+    todos ellos.
+    """
+
+    def __init__(self, grammar: Grammar):
+        super().__init__(grammar)
+        # Nivel más lejano alcanzado por el último parse_forest y sus nodos de pila
+        self._furthest: Tuple[int, Dict[int, _StackNode]] = (0, {})
+        self._prepare_grammar()
+        self._build_tables()
+
+    # Preparación de la gramática
+    def _prepare_grammar(self):
+        """Numera los símbolos y elimina las producciones ε"""
+        grammar = self.grammar
+        sorted_non_terminals = sorted(grammar.non_terminals, key=len, reverse=True)
+        sorted_terminals = sorted(grammar.terminals, key=len, reverse=True)
+
+        # Igual que en Type2Parser: un símbolo con producciones es no terminal, aunque también sea terminal
+        self._nt_names: List[Optional[str]] = list(grammar.productions)
+        self._nt_ids = {name: i for i, name in enumerate(self._nt_names)}
+        self._terminal_names: List[str] = [t for t in sorted_terminals if t]
+        self._terminal_ids = {name: i for i, name in enumerate(self._terminal_names)}
+        self._augmented = len(self._nt_names)  # S' → S
+        self._nt_names.append(None)
+
+        # Producciones originales como listas de símbolos (sin ε); None si usan símbolos desconocidos
+        originals: List[Tuple[str, str, List[str], Optional[List[Tuple[bool, int]]]]] = []
+        for left, rights in grammar.productions.items():
+            for right in rights:
+                symbols = split_production(right, sorted_non_terminals, sorted_terminals)
+                encoded = []
+                for symbol in symbols:
+                    if symbol == 'ε' or symbol == '':
+                        continue
+                    if symbol in self._nt_ids:
+                        encoded.append((False, self._nt_ids[symbol]))
+                    elif symbol in self._terminal_ids:
+                        encoded.append((True, self._terminal_ids[symbol]))
+                    else:
+                        encoded = None  # Símbolo desconocido: la producción nunca se aplica
+                        break
+                originals.append((left, right, symbols, encoded))
+
+        # Símbolos anulables y una derivación vacía para cada uno (sin ciclos)
+        self._nullable: Dict[int, Tuple[str, List[str]]] = {}
+        changed = True
+        while changed:
+            changed = False
+            for left, right, symbols, encoded in originals:
+                nt = self._nt_ids[left]
+                if encoded is None or nt in self._nullable:
+                    continue
+                if all(not is_terminal and symbol in self._nullable for is_terminal, symbol in encoded):
+                    self._nullable[nt] = (right, symbols)
+                    changed = True
+
+        # Producciones sin ε: (izquierdo, derecho) con símbolos codificados como
+        # (es_terminal, id), y su origen para reconstruir el árbol
+        self._productions: List[Tuple[int, Tuple[Tuple[bool, int], ...]]] = []
+        self._origins: List[Tuple[str, Optional[List[str]], Tuple[int, ...]]] = []
+        start = self._nt_ids.get(grammar.start_symbol)
+        self._productions.append((self._augmented, ((False, start),) if start is not None else ()))
+        self._origins.append(('', None, ()))
+
+        for left, right, symbols, encoded in originals:
+            if encoded is None:
+                continue
+            nt = self._nt_ids[left]
+            # Posiciones (en symbols, contando ε) de cada símbolo codificado
+            positions = [i for i, symbol in enumerate(symbols) if symbol != 'ε' and symbol != '']
+            optional = [k for k, (is_terminal, symbol) in enumerate(encoded)
+                        if not is_terminal and symbol in self._nullable]
+            for count in range(len(optional) + 1):
+                for omitted in combinations(optional, count):
+                    kept = [k for k in range(len(encoded)) if k not in omitted]
+                    if not kept:
+                        continue
+                    self._productions.append((nt, tuple(encoded[k] for k in kept)))
+                    self._origins.append((right, symbols, tuple(positions[k] for k in kept)))
+
+        # Símbolo que también es terminal: puede analizarse como ese terminal (A → 'A')
+        for name, nt in self._nt_ids.items():
+            if name in self._terminal_ids:
+                self._productions.append((nt, ((True, self._terminal_ids[name]),)))
+                self._origins.append((name, None, ()))
+
+        self._start = start
+        self._epsilon_trees: Dict[int, TreeNode] = {}
+
+        self._lexer = GreedyLexer(self._terminal_names)
+
+    # Tablas LR(0)
+    def _build_tables(self):
+        """Construye el autómata LR(0), las reducciones de cada estado y los conjuntos SIGUIENTE"""
+        by_left: Dict[int, List[int]] = {}
+        for index, (left, _) in enumerate(self._productions):
+            by_left.setdefault(left, []).append(index)
+
+        def closure(kernel: FrozenSet[Tuple[int, int]]) -> Set[Tuple[int, int]]:
+            items = set(kernel)
+            stack = list(kernel)
+            while stack:
+                production, dot = stack.pop()
+                right = self._productions[production][1]
+                if dot < len(right) and not right[dot][0]:
+                    for other in by_left.get(right[dot][1], ()):
+                        if (other, 0) not in items:
+                            items.add((other, 0))
+                            stack.append((other, 0))
+            return items
+
+        self._goto: List[Dict[Tuple[bool, int], int]] = []
+        reductions: List[List[int]] = []
+        kernels: Dict[FrozenSet[Tuple[int, int]], int] = {}
+        queue = deque()
+
+        def state_for(kernel: FrozenSet[Tuple[int, int]]) -> int:
+            state = kernels.get(kernel)
+            if state is None:
+                state = len(self._goto)
+                kernels[kernel] = state
+                self._goto.append({})
+                reductions.append([])
+                queue.append((state, kernel))
+            return state
+
+        state_for(frozenset([(0, 0)]))
+        while queue:
+            state, kernel = queue.popleft()
+            moves: Dict[Tuple[bool, int], Set[Tuple[int, int]]] = {}
+            for production, dot in sorted(closure(kernel)):
+                right = self._productions[production][1]
+                if dot < len(right):
+                    moves.setdefault(right[dot], set()).add((production, dot + 1))
+                elif production != 0:
+                    reductions[state].append(production)
+            for symbol, moved in moves.items():
+                self._goto[state][symbol] = state_for(frozenset(moved))
+
+        follow = self._follow_sets()
+        # estado → [(producción, izquierdo, longitud, SIGUIENTE(izquierdo))]
+        self._reductions = [[(production, self._productions[production][0],
+                              len(self._productions[production][1]),
+                              follow[self._productions[production][0]])
+                             for production in state_reductions]
+                            for state_reductions in reductions]
+        self._accept_state = self._goto[0].get((False, self._start)) if self._start is not None else None
+
+    def _follow_sets(self) -> Dict[int, Set[int]]:
+        """Conjuntos SIGUIENTE de los no terminales (la gramática ya no tiene producciones ε)"""
+        first: Dict[int, Set[int]] = {nt: set() for nt in range(len(self._nt_names))}
+        changed = True
+        while changed:
+            changed = False
+            for left, right in self._productions:
+                if not right:
+                    continue
+                is_terminal, symbol = right[0]
+                new = {symbol} if is_terminal else first[symbol]
+                if not new <= first[left]:
+                    first[left] |= new
+                    changed = True
+
+        follow: Dict[int, Set[int]] = {nt: set() for nt in range(len(self._nt_names))}
+        follow[self._augmented].add(_EOF)
+        changed = True
+        while changed:
+            changed = False
+            for left, right in self._productions:
+                for k, (is_terminal, symbol) in enumerate(right):
+                    if is_terminal:
+                        continue
+                    if k + 1 < len(right):
+                        next_terminal, next_symbol = right[k + 1]
+                        new = {next_symbol} if next_terminal else first[next_symbol]
+                    else:
+                        new = follow[left]
+                    if not new <= follow[symbol]:
+                        follow[symbol] |= new
+                        changed = True
+        return follow
+
+    def production(self, index: int) -> Tuple[str, str]:
+        """(izquierdo, derecho) original de una producción usada en el bosque"""
+        left = self._nt_names[self._productions[index][0]]
+        return left or '', self._origins[index][0]
+
+    # Análisis
+    def _matches(self, string: str, pos: int) -> List[int]:
+        """Terminal que reconoce el analizador léxico en pos (lista vacía si ninguno)"""
+        terminal = self._lexer.match(string, pos)
+        return [] if terminal is None else [self._terminal_ids[terminal]]
+
+    def parse_forest(self, string: str) -> Optional[ForestNode]:
+        """
+        Construye el bosque empaquetado de todas las derivaciones de la cadena
+
+        Returns:
+            El nodo raíz (símbolo inicial, 0, len(string)), o None si la cadena
+            no pertenece al lenguaje o es vacía (ver parse para la cadena vacía)
+        """
+        if self._start is None or not string:
+            self._furthest = (0, {0: _StackNode(0, 0)})
+            return None
+        stats = self._stats
+        budget = self._budget
+        length = len(string)
+
+        # Solo se crean los niveles alcanzados: nivel → {estado: nodo} y aristas nuevas pendientes
+        levels: Dict[int, Dict[int, _StackNode]] = {0: {}}
+        pending: Dict[int, List[Tuple[_StackNode, _StackNode]]] = {}
+        forest: Dict[Tuple[bool, int, int, int], ForestNode] = {}
+
+        def forest_node(is_terminal: bool, symbol: int, start: int, end: int) -> ForestNode:
+            key = (is_terminal, symbol, start, end)
+            node = forest.get(key)
+            if node is None:
+                name = self._terminal_names[symbol] if is_terminal else self._nt_names[symbol]
+                node = ForestNode(name, start, end)
+                forest[key] = node
+                if stats is not None:
+                    stats.nodes_allocated += 1
+            return node
+
+        def stack_node(state: int, level: int) -> _StackNode:
+            nodes = levels.setdefault(level, {})
+            node = nodes.get(state)
+            if node is None:
+                node = _StackNode(state, level)
+                nodes[state] = node
+                if stats is not None:
+                    stats.states_visited += 1
+            return node
+
+        initial = _StackNode(0, 0)
+        levels[0][0] = initial
+        for level in range(length + 1):
+            nodes = levels.pop(level, None)
+            if nodes is None:
+                continue  # Ningún camino llega a esta posición
+            self._furthest = (level, nodes)
+            if level == length:
+                levels[level] = nodes
+            matches = self._matches(string, level)
+            lookahead = set(matches)
+            if level == length:
+                lookahead.add(_EOF)
+
+            # Reducciones: cada arista nueva puede completar producciones que terminan en este nivel
+            queue = pending.pop(level, [])
+            while queue:
+                if budget is not None:
+                    budget.tick()
+                top, below = queue.pop()
+                for production, left, size, follow in self._reductions[top.state]:
+                    if follow.isdisjoint(lookahead):
+                        continue
+                    for origin, children in self._paths(top, below, size):
+                        target_state = self._goto[origin.state].get((False, left))
+                        if target_state is None:
+                            continue
+                        label = forest_node(False, left, origin.level, level)
+                        label.add_alternative(production, children)
+                        target = nodes.get(target_state)
+                        if target is None:
+                            target = nodes[target_state] = _StackNode(target_state, level)
+                            if stats is not None:
+                                stats.states_visited += 1
+                        if origin not in target.edges:
+                            target.edges[origin] = label
+                            queue.append((target, origin))
+                        if stats is not None:
+                            stats.production_uses[self.production(production)] += 1
+
+            # Desplazamientos: cada terminal que empieza aquí lleva a un nivel posterior
+            for terminal in matches:
+                end = level + len(self._terminal_names[terminal])
+                label = None
+                for node in nodes.values():
+                    target_state = self._goto[node.state].get((True, terminal))
+                    if target_state is None:
+                        continue
+                    if label is None:
+                        label = forest_node(True, terminal, level, end)
+                        if stats is not None:
+                            stats.tokens_matched += 1
+                    target = stack_node(target_state, end)
+                    if node not in target.edges:
+                        target.edges[node] = label
+                        pending.setdefault(end, []).append((target, node))
+
+        if self._accept_state is None:
+            return None
+        accept = levels.get(length, {}).get(self._accept_state)
+        if accept is None or initial not in accept.edges:
+            return None
+        return accept.edges[initial]
+
+    @staticmethod
+    def _paths(top: _StackNode, below: _StackNode,
+               size: int) -> Iterator[Tuple[_StackNode, Tuple[ForestNode, ...]]]:
+        """
+        Caminos de size aristas que empiezan por la arista top → below
+
+        Yields:
+            (nodo_al_final_del_camino, etiquetas de las aristas de izquierda a derecha)
+        """
+        first = top.edges[below]
+        if size == 1:
+            yield below, (first,)
+            return
+        stack = [(below, (first,))]
+        while stack:
+            node, labels = stack.pop()
+            for previous, label in node.edges.items():
+                path = (label,) + labels
+                if len(path) == size:
+                    yield previous, path
+                else:
+                    stack.append((previous, path))
+
+    def _parse(self, string: str) -> ParseResult:
+        """Analiza una cadena y extrae un árbol del bosque"""
+        if not string:
+            if self._start is not None and self._start in self._nullable:
+                return True, DerivationTree(self._epsilon_tree(self._start))
+            self.parse_forest(string)
+            return False, self._failure(string)
+
+        with _gc_paused():
+            if self._stats is None:
+                root = self.parse_forest(string)
+            else:
+                with self._stats.phase('bosque'):
+                    root = self.parse_forest(string)
+            if root is None:
+                return False, self._failure(string)
+
+            if self._stats is None:
+                return True, DerivationTree(self.extract_tree(root))
+            with self._stats.phase('arbol'):
+                return True, DerivationTree(self.extract_tree(root))
+
+    def _failure(self, string: str) -> ParseError:
+        """
+        Diagnóstico del último parse_forest fallido
+
+        El nivel más lejano que alcanzó la pila es donde murieron todos los
+        caminos. Allí se esperaba algún terminal desplazable desde sus nodos o
+        alguno de los que permitirían reducir (los conjuntos SIGUIENTE), salvo
+        los que ya había allí y no llevaron a nada.
+        """
+        level, nodes = self._furthest
+        tried = {self._terminal_names[terminal] for terminal in self._matches(string, level)}
+        if level == len(string):
+            tried.add(END_OF_INPUT)
+        expected: Set[str] = set()
+        for node in nodes.values():
+            for (is_terminal, symbol) in self._goto[node.state]:
+                if is_terminal:
+                    expected.add(self._terminal_names[symbol])
+            for _, _, _, follow in self._reductions[node.state]:
+                expected.update(END_OF_INPUT if terminal == _EOF else self._terminal_names[terminal]
+                                for terminal in follow)
+        return ParseError(string, level, expected - tried)
+
+    # Árboles
+    def extract_tree(self, root: ForestNode) -> TreeNode:
+        """
+        Extrae un árbol de derivación del bosque (con la forma de los de Type2Parser)
+
+        Los nodos se resuelven de menor a mayor longitud: cada uno toma la primera
+        alternativa cuyos hijos ya tienen árbol. Como no hay producciones ε, los
+        hijos solo tienen la misma longitud que el padre en producciones unitarias,
+        y esos grupos se repiten hasta que no hay progreso, de modo que los ciclos
+        (A → B, B → A) nunca se siguen.
+        """
+        reachable: List[ForestNode] = [root]
+        seen = {root}
+        for node in reachable:
+            for _, children in node.alternatives:
+                for child in children:
+                    if child not in seen:
+                        seen.add(child)
+                        reachable.append(child)
+        reachable.sort(key=lambda node: node.end - node.start)
+
+        trees: Dict[ForestNode, TreeNode] = {}
+        start = 0
+        while start < len(reachable):
+            span = reachable[start].end - reachable[start].start
+            end = start
+            while end < len(reachable) and reachable[end].end - reachable[end].start == span:
+                end += 1
+            pending = reachable[start:end]
+            while pending:
+                unresolved = []
+                for node in pending:
+                    tree = self._first_available_tree(node, trees)
+                    if tree is None:
+                        unresolved.append(node)
+                    else:
+                        trees[node] = tree
+                if len(unresolved) == len(pending):
+                    break  # Solo quedan ciclos sin salida
+                pending = unresolved
+            start = end
+        return trees[root]
+
+    def _first_available_tree(self, node: ForestNode, trees: Dict[ForestNode, TreeNode]) -> Optional[TreeNode]:
+        """Árbol de la primera alternativa cuyos hijos ya tienen árbol (None si ninguna)"""
+        if not node.alternatives:
+            tree = TreeNode(node.symbol)
+            tree.add_child(TreeNode(node.symbol))
+            return tree
+        for production, children in node.alternatives:
+            if all(child in trees for child in children):
+                return self._production_tree(production, [trees[child] for child in children])
+        return None
+
+    def _production_tree(self, production: int, children: List[TreeNode]) -> TreeNode:
+        """Nodo de una producción original, restituyendo los símbolos anulables omitidos"""
+        left = self._productions[production][0]
+        right, symbols, kept = self._origins[production]
+        if symbols is None:  # Símbolo analizado como terminal (A → 'A')
+            return children[0]
+
+        node = TreeNode(self._nt_names[left])
+        given = dict(zip(kept, children))
+        for position, symbol in enumerate(symbols):
+            if position in given:
+                node.add_child(given[position])
+            elif symbol == 'ε' or symbol == '':
+                node.add_child(TreeNode('ε'))
+            else:
+                node.add_child(self._epsilon_tree(self._nt_ids[symbol]))
+        return node
+
+    def _epsilon_tree(self, nt: int) -> TreeNode:
+        """Árbol de la derivación vacía elegida para un no terminal anulable"""
+        tree = self._epsilon_trees.get(nt)
+        if tree is None:
+            _, symbols = self._nullable[nt]
+            tree = TreeNode(self._nt_names[nt])
+            children = [symbol for symbol in symbols if symbol != 'ε' and symbol != '']
+            if not children:
+                tree.add_child(TreeNode('ε'))
+            for symbol in children:
+                tree.add_child(self._epsilon_tree(self._nt_ids[symbol]))
+            self._epsilon_trees[nt] = tree
+        return tree
+
@@ -0,0 +1,262 @@
+"""
+Módulo para representar y trabajar con gramáticas formales (Tipo 2 y Tipo 3)
+"""
+
+from typing import Set, List, Dict, Tuple, Optional, Iterable, Mapping
+from collections import deque
+from types import MappingProxyType
+import json
+import sys
+
+
+class Grammar:
+    """Clase para representar una gramática formal G = (N, T, P, S)"""
+    
+    def __init__(self, name: str = "", grammar_type: str = "Tipo 2"):
+        """
+        Inicializa una gramática
+        
+        Args:
+            name: Nombre de la gramática
+            grammar_type: "Tipo 2" (Libre de Contexto) o "Tipo 3" (Regular)
+        """
+        self.name = name
+        self.type = grammar_type  # "Tipo 2" o "Tipo 3"
+        self.non_terminals: Set[str] = set()  # N
+        self.terminals: Set[str] = set()  # T
+        self.productions: Dict[str, List[str]] = {}  # P: {no_terminal: [producciones]}
+        self.start_symbol: Optional[str] = None  # S
+    
+    def add_non_terminal(self, symbol: str):
+        """Añade un símbolo no terminal"""
+        self.non_terminals.add(symbol)
+        if symbol not in self.productions:
+            self.productions[symbol] = []
+    
+    def add_terminal(self, symbol: str):
+        """Añade un símbolo terminal"""
+        self.terminals.add(symbol)
+    
+    def add_production(self, left: str, right: str):
+        """
+        Añade una producción left → right
+        
+        Args:
+            left: Lado izquierdo de la producción (debe ser no terminal)
+            right: Lado derecho de la producción
+        """
+        if left not in self.non_terminals:
+            self.add_non_terminal(left)
+        self.productions[left].append(right)
+    
+    def set_start_symbol(self, symbol: str):
+        """Establece el símbolo inicial"""
+        if symbol not in self.non_terminals:
+            self.add_non_terminal(symbol)
+        self.start_symbol = symbol
+    
+    def validate(self) -> Tuple[bool, str]:
+        """
+        Valida que la gramática esté bien formada
+        
+        Returns:
+            (es_válida, mensaje_error)
+        """
+        if not self.start_symbol:
+            return False, "No se ha definido el símbolo inicial"
+        
+        if self.start_symbol not in self.non_terminals:
+            return False, f"El símbolo inicial '{self.start_symbol}' no está en los no terminales"
+        
+        if len(self.non_terminals) == 0:
+            return False, "No hay símbolos no terminales definidos"
+        
+        if len(self.terminals) == 0:
+            return False, "No hay símbolos terminales definidos"
+        
+        if len(self.productions) == 0:
+            return False, "No hay producciones definidas"
+        
+        # Verificar que todas las producciones tengan su lado izquierdo en N
+        for left in self.productions:
+            if left not in self.non_terminals:
+                return False, f"La producción con lado izquierdo '{left}' no está en los no terminales"
+        
+        # Validar tipo de gramática
+        if self.type == "Tipo 3":
+            for left, rights in self.productions.items():
+                for right in rights:
+                    # Tipo 3: A → aB o A → a (forma normal derecha) o A → Ba o A → a (forma normal izquierda)
+                    # Para simplificar, validamos que tenga máximo un no terminal y que esté al final o inicio
+                    non_term_count = sum(1 for char in right if char in self.non_terminals)
+                    if non_term_count > 1:
+                        return False, f"Gramática Tipo 3: la producción {left} → {right} tiene más de un no terminal"
+        
+        return True, "Gramática válida"
+    
+    def freeze(self) -> 'FrozenGrammar':
+        """
+        Copia inmutable de la gramática (ver FrozenGrammar)
+        
+        Los cambios posteriores en esta gramática no afectan a la copia.
+        """
+        return FrozenGrammar(self.name, self.type, self.non_terminals, self.terminals,
+                             self.productions, self.start_symbol)
+    
+    def to_dict(self) -> dict:
+        """Convierte la gramática a un diccionario para serialización (sin compartir sus listas)"""
+        return {
+            "name": self.name,
+            "type": self.type,
+            "non_terminals": list(self.non_terminals),
+            "terminals": list(self.terminals),
+            "productions": {left: list(rights) for left, rights in self.productions.items()},
+            "start_symbol": self.start_symbol
+        }
+    
+    @classmethod
+    def from_dict(cls, data: dict) -> 'Grammar':
+        """Crea una gramática desde un diccionario (copia las producciones en lugar de compartirlas)"""
+        grammar = cls(data.get("name", ""), data.get("type", "Tipo 2"))
+        grammar.non_terminals = set(data.get("non_terminals", []))
+        grammar.terminals = set(data.get("terminals", []))
+        grammar.productions = {left: list(rights) for left, rights in data.get("productions", {}).items()}
+        grammar.start_symbol = data.get("start_symbol")
+        return grammar
+    
+    def save_to_file(self, filename: str):
+        """Guarda la gramática en un archivo JSON"""
+        with open(filename, 'w', encoding='utf-8') as f:
+            json.dump(self.to_dict(), f, indent=2, ensure_ascii=False)
+    
+    @classmethod
+    def load_from_file(cls, filename: str) -> 'Grammar':
+        """Carga una gramática desde un archivo JSON"""
+        with open(filename, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+        return cls.from_dict(data)
+    
+    def __str__(self):
+        """Representación en cadena de la gramática"""
+        result = f"Gramática: {self.name}\n"
+        result += f"Tipo: {self.type}\n"
+        result += f"N (No Terminales): {', '.join(sorted(self.non_terminals))}\n"
+        result += f"T (Terminales): {', '.join(sorted(self.terminals))}\n"
+        result += f"S (Símbolo Inicial): {self.start_symbol}\n"
+        result += "P (Producciones):\n"
+        for left in sorted(self.productions.keys()):
+            for right in self.productions[left]:
+                result += f"  {left} → {right}\n"
+        return result
+
+
+class FrozenGrammar:
+    """
+    Gramática inmutable, obtenida con Grammar.freeze()
+    
+    Ofrece la misma interfaz de lectura que Grammar (los parsers la aceptan
+    igual), con N y T como frozenset y cada lista de producciones como tupla.
+    Los símbolos se internan con sys.intern y los lados derechos repetidos se
+    comparten dentro de la gramática, así que cada texto se guarda una vez.
+    
+    La igualdad y el hash dependen solo del contenido (tipo, N, T, P en orden
+    y S), no del nombre, y el hash se calcula una vez: sirve de clave para
+    cachés y registros de parsers. fingerprint es un resumen estable entre
+    procesos y ejecuciones. Con pickle viaja como tuplas, sin diccionarios.
+    """
+    
+    __slots__ = ('name', 'type', 'non_terminals', 'terminals', 'start_symbol',
+                 '_productions', '_hash', '_fingerprint')
+    
+    def __init__(self, name: str, grammar_type: str, non_terminals: Iterable[str], terminals: Iterable[str],
+                 productions: Mapping[str, Iterable[str]], start_symbol: Optional[str]):
+        """
+        Args:
+            name: Nombre de la gramática (no cuenta para la igualdad)
+            grammar_type: "Tipo 2" o "Tipo 3"
+            non_terminals: N
+            terminals: T
+            productions: no_terminal → lados derechos, en orden
+            start_symbol: S
+        """
+        intern = sys.intern
+        non_terminals = frozenset(intern(symbol) for symbol in non_terminals)
+        terminals = frozenset(intern(symbol) for symbol in terminals)
+        # Los lados derechos repetidos (o iguales a un símbolo) se comparten sin llenar la tabla global de sys.intern
+        shared = {symbol: symbol for symbol in non_terminals | terminals}
+        rules = {intern(left): tuple(shared.setdefault(right, right) for right in rights)
+                 for left, rights in productions.items()}
+        set_attribute = object.__setattr__
+        set_attribute(self, 'name', name)
+        set_attribute(self, 'type', grammar_type)
+        set_attribute(self, 'non_terminals', non_terminals)
+        set_attribute(self, 'terminals', terminals)
+        set_attribute(self, 'start_symbol', intern(start_symbol) if start_symbol is not None else None)
+        set_attribute(self, '_productions', MappingProxyType(rules))
+        set_attribute(self, '_hash', hash(self._key()))
+        set_attribute(self, '_fingerprint', None)
+    
+    def _key(self) -> tuple:
+        """Contenido que define la igualdad (se construye al compararse, no se guarda)"""
+        return (self.type, self.non_terminals, self.terminals, tuple(self._productions.items()), self.start_symbol)
+    
+    @property
+    def productions(self) -> Mapping[str, Tuple[str, ...]]:
+        """P como diccionario de solo lectura: no_terminal → tupla de lados derechos"""
+        return self._productions
+    
+    @property
+    def fingerprint(self) -> str:
+        """Resumen SHA-256 del contenido, igual en cualquier proceso (para cachés persistentes)"""
+        if self._fingerprint is None:
+            import hashlib  # Importación diferida: solo se usa aquí
+            content = json.dumps([self.type, sorted(self.non_terminals), sorted(self.terminals),
+                                  list(self._productions.items()), self.start_symbol], ensure_ascii=False)
+            object.__setattr__(self, '_fingerprint', hashlib.sha256(content.encode('utf-8')).hexdigest())
+        return self._fingerprint
+    
+    def freeze(self) -> 'FrozenGrammar':
+        """Ya es inmutable: devuelve la misma gramática"""
+        return self
+    
+    def thaw(self) -> Grammar:
+        """Copia mutable de la gramática"""
+        grammar = Grammar(self.name, self.type)
+        grammar.non_terminals = set(self.non_terminals)
+        grammar.terminals = set(self.terminals)
+        grammar.productions = {left: list(rights) for left, rights in self._productions.items()}
+        grammar.start_symbol = self.start_symbol
+        return grammar
+    
+    # Las operaciones de lectura son las de Grammar
+    validate = Grammar.validate
+    to_dict = Grammar.to_dict
+    save_to_file = Grammar.save_to_file
+    __str__ = Grammar.__str__
+    
+    def __setattr__(self, name, value):
+        raise AttributeError("FrozenGrammar es inmutable; usa thaw() para obtener una copia modificable")
+    
+    def __delattr__(self, name):
+        raise AttributeError("FrozenGrammar es inmutable; usa thaw() para obtener una copia modificable")
+    
+    def __eq__(self, other) -> bool:
+        if not isinstance(other, FrozenGrammar):
+            return NotImplemented
+        return self is other or (self._hash == other._hash and self._key() == other._key())
+    
+    def __hash__(self) -> int:
+        return self._hash
+    
+    def __reduce__(self):
+        return (_restore_frozen, (self.name, self.type, tuple(self.non_terminals), tuple(self.terminals),
+                                  tuple(self._productions.items()), self.start_symbol))
+    
+    def __repr__(self):
+        return f"FrozenGrammar(name={self.name!r}, type={self.type!r}, non_terminals={len(self.non_terminals)})"
+
+
+def _restore_frozen(name: str, grammar_type: str, non_terminals: Tuple[str, ...], terminals: Tuple[str, ...],
+                    rules: Tuple[Tuple[str, Tuple[str, ...]], ...], start_symbol: Optional[str]) -> FrozenGrammar:
+    """Reconstruye una FrozenGrammar al deserializarla (vuelve a internar en el proceso destino)"""
+    return FrozenGrammar(name, grammar_type, non_terminals, terminals, dict(rules), start_symbol)
@@ -4,12 +4,25 @@ Interfaz gráfica de usuario para el Analizador Sintáctico
 
 import tkinter as tk
 from tkinter import ttk, filedialog, messagebox, scrolledtext
-from grammar import Grammar
-from parser import create_parser
-from generator import StringGenerator
+from .grammar import Grammar
+from .parser import ParseError, ParseResult, cached_parser, create_parser, _resolve_engine
+from .generator import StringGenerator
+from .tree import DerivationTree, TreeNode
+from .budget import Budget, BudgetExceeded
+from .incremental import IncrementalParser, ParseState
+from typing import Dict, Iterator, List, Optional, Tuple
 import json
 
 
+# Número de hijos que se crean en la vista del árbol cada vez que se expande un nodo
+TREE_CHUNK_SIZE = 500
+
+# Límites para que una gramática o cadena adversaria no congele la interfaz
+PARSE_TIMEOUT = 5.0  # segundos
+PARSE_MAX_STEPS = 5_000_000
+GENERATE_TIMEOUT = 5.0  # segundos
+
+
 class GrammarApp:
     """Aplicación principal con interfaz gráfica"""
     
@@ -19,6 +32,9 @@ class GrammarApp:
         self.root.geometry("1000x700")
         
         self.current_grammar: Grammar = None
+        # Análisis incremental (si es el motor elegido): se reutiliza mientras no cambie la gramática
+        self._incremental_parser: Optional[IncrementalParser] = None
+        self._incremental_state: Optional[ParseState] = None
         
         self._create_widgets()
     
@@ -168,12 +184,39 @@ class GrammarApp:
         self.result_label = ttk.Label(result_frame, text="", font=("Arial", 12))
         self.result_label.pack(pady=10)
         
+        # Cadena rechazada con la posición del fallo resaltada (solo visible tras un rechazo)
+        self.error_view = tk.Text(result_frame, height=1, wrap=tk.NONE, font=("Courier", 11))
+        self.error_view.tag_configure("fallo", background="#ffb3b3", foreground="red")
+        self.error_view.configure(state=tk.DISABLED)
+        
         # Árbol de derivación
         tree_frame = ttk.LabelFrame(main_frame, text="Árbol de Derivación")
         tree_frame.pack(fill=tk.BOTH, expand=True, pady=5)
         
-        self.tree_text = scrolledtext.ScrolledText(tree_frame, height=15, font=("Consolas", 10))
-        self.tree_text.pack(fill=tk.BOTH, expand=True, padx=5, pady=5)
+        # Búsqueda dentro del árbol
+        search_frame = ttk.Frame(tree_frame)
+        search_frame.pack(fill=tk.X, padx=5, pady=5)
+        
+        ttk.Label(search_frame, text="Buscar símbolo:").pack(side=tk.LEFT, padx=5)
+        self.tree_search_entry = ttk.Entry(search_frame, width=20)
+        self.tree_search_entry.pack(side=tk.LEFT, padx=5)
+        self.tree_search_entry.bind("<Return>", lambda event: self._search_tree())
+        ttk.Button(search_frame, text="Buscar Siguiente", command=self._search_tree).pack(side=tk.LEFT, padx=5)
+        
+        # Vista perezosa: los hijos de un nodo solo se crean al expandirlo
+        view_frame = ttk.Frame(tree_frame)
+        view_frame.pack(fill=tk.BOTH, expand=True, padx=5, pady=5)
+        
+        self.tree_view = ttk.Treeview(view_frame, show="tree", height=15)
+        tree_scroll = ttk.Scrollbar(view_frame, orient=tk.VERTICAL, command=self.tree_view.yview)
+        self.tree_view.configure(yscrollcommand=tree_scroll.set)
+        self.tree_view.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
+        tree_scroll.pack(side=tk.RIGHT, fill=tk.Y)
+        
+        self.tree_view.bind("<<TreeviewOpen>>", self._on_tree_open)
+        self.tree_view.bind("<<TreeviewSelect>>", self._on_tree_select)
+        
+        self._reset_tree_view()
     
     def _create_generate_tab(self, parent):
         """Crea la pestaña de generación de cadenas"""
@@ -362,26 +405,217 @@ class GrammarApp:
                 return
             self.current_grammar = grammar
         
-        string = self.parse_entry.get().strip()
+        raw = self.parse_entry.get()
+        string = raw.strip()
         if not string:
             messagebox.showwarning("Advertencia", "Ingrese una cadena para analizar")
             return
         
         try:
-            parser = create_parser(self.current_grammar)
-            is_accepted, tree = parser.parse(string)
+            budget = Budget(max_steps=PARSE_MAX_STEPS, timeout=PARSE_TIMEOUT)
+            # El mismo motor que create_parser y "reconocer" con engine="auto"; si es el
+            # incremental, se reutiliza el análisis anterior de la cadena editada
+            if _resolve_engine(self.current_grammar, "auto") == "incremental":
+                is_accepted, tree = self._parse_incremental(string, budget)
+            else:
+                parser = cached_parser(self.current_grammar)
+                is_accepted, tree = parser.parse(string, budget)
             
+            self._hide_parse_error()
             if is_accepted:
                 self.result_label.config(text="✓ CADENA ACEPTADA", foreground="green")
-                self.tree_text.delete(1.0, tk.END)
-                self.tree_text.insert(tk.END, str(tree))
+                self._show_tree(tree)
+            elif isinstance(tree, ParseError):
+                self.result_label.config(text="✗ CADENA RECHAZADA", foreground="red")
+                self._show_parse_error(tree, len(raw) - len(raw.lstrip()))
+                self._show_message_in_tree(str(tree))
             else:
                 self.result_label.config(text="✗ CADENA RECHAZADA", foreground="red")
-                self.tree_text.delete(1.0, tk.END)
-                self.tree_text.insert(tk.END, "No se pudo construir el árbol de derivación.")
+                self._show_message_in_tree("No se pudo construir el árbol de derivación.")
+        except BudgetExceeded as e:
+            self._hide_parse_error()
+            self.result_label.config(text="⚠ LÍMITE EXCEDIDO (sin decidir)", foreground="orange")
+            self._show_message_in_tree(str(e))
         except Exception as e:
             messagebox.showerror("Error", f"Error al analizar: {str(e)}")
     
+    def _show_parse_error(self, error: ParseError, leading: int):
+        """
+        Resalta la posición del fallo en la vista de error y en la entrada
+        
+        Args:
+            error: Diagnóstico del rechazo
+            leading: Espacios iniciales que se quitaron de la entrada antes de analizarla
+        """
+        start = error.position
+        end = start + max(len(error.found), 1)
+        self.error_view.configure(state=tk.NORMAL)
+        self.error_view.delete("1.0", tk.END)
+        # Un espacio final para poder marcar el fin de la cadena
+        self.error_view.insert("1.0", error.string + " ")
+        self.error_view.tag_add("fallo", f"1.0 + {start} chars", f"1.0 + {end} chars")
+        self.error_view.see(f"1.0 + {start} chars")
+        self.error_view.configure(state=tk.DISABLED)
+        self.error_view.pack(fill=tk.X, padx=5, pady=(0, 10))
+        
+        # En la entrada, seleccionar lo encontrado (o dejar el cursor al final si faltaba entrada)
+        self.parse_entry.focus_set()
+        self.parse_entry.selection_clear()
+        self.parse_entry.icursor(leading + start)
+        if error.found:
+            self.parse_entry.selection_range(leading + start, leading + start + len(error.found))
+    
+    def _hide_parse_error(self):
+        """Oculta la vista de error del último rechazo"""
+        self.error_view.pack_forget()
+    
+    def _parse_incremental(self, string: str, budget: Budget) -> ParseResult:
+        """Analiza reutilizando el análisis anterior si la gramática no cambió (solo se reanaliza lo editado)"""
+        # Se compara el contenido congelado: detecta también cambios hechos sobre la misma gramática
+        grammar = self.current_grammar.freeze()
+        if self._incremental_parser is None or self._incremental_parser.grammar != grammar:
+            self._incremental_parser = create_parser(grammar, engine="incremental")
+            self._incremental_state = None
+        
+        parser = self._incremental_parser
+        # El estado anterior se consume; si se agota el presupuesto, el próximo análisis empieza de cero
+        state, self._incremental_state = self._incremental_state, None
+        if state is None:
+            state = parser.parse_state(string, budget)
+        else:
+            state = parser.update(state, string, budget)
+        self._incremental_state = state
+        return state.accepted, state.tree if state.accepted else state.error
+    
+    # Vista perezosa del árbol de derivación
+    def _reset_tree_view(self):
+        """Vacía la vista del árbol y los índices auxiliares"""
+        self.tree_view.delete(*self.tree_view.get_children())
+        self._tree_nodes: Dict[str, TreeNode] = {}  # item → nodo
+        self._child_items: Dict[str, List[str]] = {}  # item → items de sus hijos ya creados
+        self._pending_items: Dict[str, str] = {}  # item → marcador "cargando" aún no expandido
+        self._more_items: Dict[str, str] = {}  # item padre → su item "… más"
+        self._search_iter = None
+        self._search_query = None
+    
+    def _show_tree(self, tree: DerivationTree):
+        """Muestra un árbol creando solo la raíz y su primer bloque de hijos"""
+        self._reset_tree_view()
+        self._tree_root_item = self._insert_tree_node("", tree.root)
+        self._expand_tree_item(self._tree_root_item)
+        self.tree_view.item(self._tree_root_item, open=True)
+    
+    def _show_message_in_tree(self, message: str):
+        """Muestra un mensaje en lugar del árbol"""
+        self._reset_tree_view()
+        self._tree_root_item = None
+        self.tree_view.insert("", tk.END, text=message)
+    
+    def _insert_tree_node(self, parent_item: str, node: TreeNode) -> str:
+        """Inserta un nodo; si tiene hijos se añade un marcador para que sea expandible"""
+        item = self.tree_view.insert(parent_item, tk.END, text=node.symbol)
+        self._tree_nodes[item] = node
+        if node.children:
+            self._pending_items[item] = self.tree_view.insert(item, tk.END, text="…")
+        return item
+    
+    def _expand_tree_item(self, item: str):
+        """Crea el primer bloque de hijos de un item la primera vez que se expande"""
+        placeholder = self._pending_items.pop(item, None)
+        if placeholder is None:
+            return
+        self.tree_view.delete(placeholder)
+        self._child_items[item] = []
+        self._load_tree_children(item)
+    
+    def _load_tree_children(self, item: str, up_to: int = 0):
+        """
+        Crea el siguiente bloque de hijos de un item
+        
+        Args:
+            item: Item padre ya expandido
+            up_to: Índice de hijo que debe quedar creado como mínimo
+        """
+        children = self._tree_nodes[item].children
+        created = self._child_items[item]
+        start = len(created)
+        end = min(len(children), max(start + TREE_CHUNK_SIZE, up_to + 1))
+        
+        # Quitar el item "… más" anterior antes de añadir el nuevo bloque
+        more_item = self._more_items.pop(item, None)
+        if more_item is not None:
+            self.tree_view.delete(more_item)
+        
+        for child in children[start:end]:
+            created.append(self._insert_tree_node(item, child))
+        
+        if end < len(children):
+            more_item = self.tree_view.insert(item, tk.END, text=f"… {len(children) - end} nodos más")
+            self._more_items[item] = more_item
+    
+    def _on_tree_open(self, event):
+        """Crea los hijos del item que se acaba de expandir"""
+        self._expand_tree_item(self.tree_view.focus())
+    
+    def _on_tree_select(self, event):
+        """Al seleccionar un item "… más" se carga el siguiente bloque de hijos"""
+        for item in self.tree_view.selection():
+            parent = self.tree_view.parent(item)
+            if self._more_items.get(parent) == item:
+                self._load_tree_children(parent)
+    
+    def _iter_tree_matches(self, root: TreeNode, query: str) -> Iterator[Tuple[int, ...]]:
+        """Recorre el árbol en preorden devolviendo la ruta de índices de cada coincidencia"""
+        if query in root.symbol.casefold():
+            yield ()
+        # Una sola ruta que crece y se acorta con el recorrido: solo se copia al devolverla
+        nodes = [root]  # rama en curso, de la raíz hacia abajo
+        next_child = [0]  # por nodo de la rama, el siguiente hijo a visitar
+        path: List[int] = []  # índices de la rama (uno menos que nodos)
+        while nodes:
+            node, index = nodes[-1], next_child[-1]
+            if index == len(node.children):
+                nodes.pop()
+                next_child.pop()
+                if path:
+                    path.pop()
+                continue
+            next_child[-1] = index + 1
+            child = node.children[index]
+            path.append(index)
+            if query in child.symbol.casefold():
+                yield tuple(path)
+            nodes.append(child)
+            next_child.append(0)
+    
+    def _search_tree(self):
+        """Busca la siguiente coincidencia y expande solo la rama que lleva a ella"""
+        query = self.tree_search_entry.get().strip().casefold()
+        if not query or not getattr(self, "_tree_root_item", None):
+            return
+        
+        if query != self._search_query or self._search_iter is None:
+            self._search_query = query
+            self._search_iter = self._iter_tree_matches(self._tree_nodes[self._tree_root_item], query)
+        
+        path = next(self._search_iter, None)
+        if path is None:
+            self._search_iter = None
+            messagebox.showinfo("Búsqueda", f"No hay más coincidencias para '{query}'")
+            return
+        
+        item = self._tree_root_item
+        for index in path:
+            self._expand_tree_item(item)
+            if index >= len(self._child_items[item]):
+                self._load_tree_children(item, index)
+            self.tree_view.item(item, open=True)
+            item = self._child_items[item][index]
+        
+        self.tree_view.selection_set(item)
+        self.tree_view.focus(item)
+        self.tree_view.see(item)
+    
     def _generate_strings(self):
         """Genera las primeras 10 cadenas"""
         if not self.current_grammar:
@@ -394,7 +628,12 @@ class GrammarApp:
         
         try:
             generator = StringGenerator(self.current_grammar)
-            strings = generator.generate_strings(10)
+            exceeded = None
+            try:
+                strings = generator.generate_strings(10, Budget(timeout=GENERATE_TIMEOUT))
+            except BudgetExceeded as e:
+                exceeded = e
+                strings = e.partial or []
             
             self.strings_listbox.delete(0, tk.END)
             if strings:
@@ -402,6 +641,8 @@ class GrammarApp:
                     self.strings_listbox.insert(tk.END, f"{i}. {s}")
             else:
                 self.strings_listbox.insert(tk.END, "No se pudieron generar cadenas")
+            if exceeded is not None:
+                self.strings_listbox.insert(tk.END, f"⚠ {exceeded} (resultado parcial)")
         except Exception as e:
             messagebox.showerror("Error", f"Error al generar cadenas: {str(e)}")
     
@@ -0,0 +1,298 @@
+"""
+Módulo de análisis incremental para gramáticas Tipo 2
+
+Tras una edición pequeña de la cadena (desplazamiento, caracteres borrados y
+texto insertado) se reutilizan los resultados memoizados que no dependen de la
+zona editada y solo se vuelve a analizar lo dañado. Los subárboles que no
+cambian se comparten entre el árbol anterior y el nuevo.
+"""
+
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+from .grammar import Grammar
+from .parser import END_OF_INPUT, ParseError, ParseResult, Type2Parser, _Call, _ProductionInfo
+from .budget import Budget
+from .stats import ParseStats
+from .tree import DerivationTree
+
+
+class ParseState:
+    """
+    Resultado de un análisis incremental
+
+    Guarda el texto, el resultado y una columna de llamadas memoizadas por
+    posición (len(text) + 1 columnas, la última para el fin de la entrada).
+    Los fines y alcances de cada llamada son relativos a su columna, de modo
+    que las columnas posteriores a una edición se reutilizan sin cambios. El
+    estado se consume al pasarlo a IncrementalParser.reparse(). Si la cadena
+    se rechaza, error describe el fallo más lejano.
+    """
+
+    def __init__(self, text: str, accepted: bool, tree: Optional[DerivationTree],
+                 columns: List[Dict[str, _Call]], reach: List[int], error: Optional[ParseError] = None):
+        self.text = text
+        self.accepted = accepted
+        self.tree = tree
+        self.error = error
+        self._columns: Optional[List[Dict[str, _Call]]] = columns
+        self._reach: Optional[List[int]] = reach  # columna → mayor alcance examinado de sus llamadas
+
+    @property
+    def consumed(self) -> bool:
+        """True si la memo ya se reutilizó en otro análisis"""
+        return self._columns is None
+
+    def memo_size(self) -> int:
+        """Número de llamadas memoizadas"""
+        return sum(len(column) for column in self._columns or [])
+
+
+def diff_edit(old: str, new: str) -> Tuple[int, int, str]:
+    """
+    Edición mínima que transforma old en new (prefijo y sufijo comunes)
+
+    Returns:
+        (desplazamiento, caracteres_borrados, texto_insertado)
+    """
+    limit = min(len(old), len(new))
+    # Búsquedas binarias comparando porciones: el trabajo por carácter lo hace la comparación de cadenas
+    low, high = 0, limit
+    while low < high:
+        middle = (low + high + 1) // 2
+        if old[:middle] == new[:middle]:
+            low = middle
+        else:
+            high = middle - 1
+    prefix = low
+
+    low, high = 0, limit - prefix
+    while low < high:
+        middle = (low + high + 1) // 2
+        if old[len(old) - middle:] == new[len(new) - middle:]:
+            low = middle
+        else:
+            high = middle - 1
+    suffix = low
+
+    return prefix, len(old) - prefix - suffix, new[prefix:len(new) - suffix]
+
+
+class IncrementalParser(Type2Parser):
+    """
+    Parser Tipo 2 cuyas llamadas memoizadas se reutilizan entre ediciones
+
+    Usa el mismo motor que Type2Parser, así que acepta las mismas cadenas,
+    pero además cada llamada (símbolo, posición) recuerda hasta dónde
+    examinó la entrada, directamente o a través de las llamadas que hizo, y
+    el fallo más lejano que se produjo en ella. Tras una edición solo se
+    descartan las llamadas que examinaron la zona editada; las demás, con sus
+    fines, sus subárboles y su parte del diagnóstico, se reutilizan.
+
+    La poda por longitud restante de Type2Parser no se aplica: depende del
+    fin de la entrada, que cambia con cada edición.
+
+    El coste de reanalizar es proporcional a las llamadas descartadas, entre
+    ellas todas las que contienen la edición desde la raíz: en una lista
+    recursiva, las de los elementos anteriores a ella. Si la gramática es
+    ambigua, el árbol puede ser otra derivación válida que la de un análisis
+    desde cero.
+    """
+
+    def __init__(self, grammar: Grammar):
+        super().__init__(grammar)
+        # Un terminal examina hasta max_length caracteres, y al menos si la entrada termina
+        self._span = max(self._lexer.max_length, 1)
+        self._created: List[_Call] = []  # llamadas nuevas del análisis en curso
+
+    def _parse(self, string: str) -> ParseResult:
+        """Analiza una cadena desde cero (ver parse)"""
+        state = self._run(string, [{} for _ in range(len(string) + 1)], [0] * (len(string) + 1))
+        return state.accepted, state.tree if state.accepted else state.error
+
+    def parse_state(self, text: str, budget: Optional[Budget] = None,
+                    stats: Optional[ParseStats] = None) -> ParseState:
+        """
+        Analiza una cadena desde cero y devuelve el estado para reanalizarla tras editarla
+
+        Raises:
+            BudgetExceeded: Si se agota el presupuesto antes de decidir
+        """
+        with self._session(budget, stats):
+            return self._run(text, [{} for _ in range(len(text) + 1)], [0] * (len(text) + 1))
+
+    def reparse(self, state: ParseState, offset: int, deleted: int, inserted: str,
+                budget: Optional[Budget] = None, stats: Optional[ParseStats] = None) -> ParseState:
+        """
+        Reanaliza tras reemplazar text[offset:offset + deleted] por inserted
+
+        Args:
+            state: Estado de un análisis anterior (queda consumido)
+            offset: Posición de la edición
+            deleted: Número de caracteres borrados desde offset
+            inserted: Texto insertado en offset
+
+        Returns:
+            Estado nuevo; su árbol comparte los subárboles no afectados por la edición
+
+        Raises:
+            ValueError: Si la edición no cabe en el texto o el estado ya fue consumido
+            BudgetExceeded: Si se agota el presupuesto (el estado anterior tampoco es reutilizable)
+        """
+        if state.consumed:
+            raise ValueError("El estado ya se reutilizó en otro análisis")
+        text = state.text
+        if offset < 0 or deleted < 0 or offset + deleted > len(text):
+            raise ValueError(f"Edición fuera del texto: [{offset}, {offset + deleted}) con longitud {len(text)}")
+
+        columns, reach = state._columns, state._reach
+        state._columns = state._reach = None
+
+        # Antes de la edición solo sobreviven las llamadas que no examinaron más allá de offset
+        for i in [i for i, examined in enumerate(reach[:offset]) if i + examined > offset]:
+            limit = offset - i
+            kept = {symbol: call for symbol, call in columns[i].items() if call.examined <= limit}
+            columns[i] = kept
+            reach[i] = max((call.examined for call in kept.values()), default=0)
+
+        # Las columnas posteriores solo miran texto que no cambió: se desplazan tal cual
+        columns = columns[:offset] + [{} for _ in range(len(inserted))] + columns[offset + deleted:]
+        reach = reach[:offset] + [0] * len(inserted) + reach[offset + deleted:]
+        new_text = text[:offset] + inserted + text[offset + deleted:]
+
+        with self._session(budget, stats):
+            return self._run(new_text, columns, reach)
+
+    def update(self, state: ParseState, text: str, budget: Optional[Budget] = None,
+               stats: Optional[ParseStats] = None) -> ParseState:
+        """Reanaliza con el texto nuevo completo, deduciendo la edición con diff_edit"""
+        offset, deleted, inserted = diff_edit(state.text, text)
+        return self.reparse(state, offset, deleted, inserted, budget, stats)
+
+    def _run(self, text: str, columns: List[Dict[str, _Call]], reach: List[int]) -> ParseState:
+        """Analiza el símbolo inicial sobre las llamadas memoizadas dadas"""
+        start = self.grammar.start_symbol
+        self._created = []
+        self._begin(text, columns)
+        try:
+            if self._stats is None:
+                root = self._analyze(start)
+            else:
+                with self._stats.phase('analisis'):
+                    root = self._analyze(start)
+            self._settle(reach)
+        finally:
+            self._finish()
+            self._created = []
+
+        node = root.ends.get(len(text))
+        if node is not None:
+            return ParseState(text, True, DerivationTree(node), columns, reach)
+        if not text:
+            error = ParseError(text, 0, self._first_terminals_of(start))
+        else:
+            position, expected = self._collect_failure(root)
+            # Si se reconoció solo un prefijo, allí habría bastado con que terminara la cadena
+            end = max(root.ends, default=-1)
+            if end > position:
+                position, expected = end, {END_OF_INPUT}
+            elif end == position >= 0:
+                expected.add(END_OF_INPUT)
+            error = ParseError(text, max(position, 0), expected)
+        return ParseState(text, False, None, columns, reach, error)
+
+    def _settle(self, reach: List[int]):
+        """
+        Cierra las llamadas nuevas para poder reutilizarlas
+
+        El alcance de cada una pasa a incluir el de las llamadas que hizo. Las
+        columnas se recorren de la última a la primera; dentro de una columna
+        (recursión por la izquierda) se itera hasta el punto fijo.
+        """
+        by_column: Dict[int, List[_Call]] = {}
+        for call in self._created:
+            by_column.setdefault(call.start, []).append(call)
+
+        for column in sorted(by_column, reverse=True):
+            calls = by_column[column]
+            calls.reverse()  # Las llamadas suelen crearse antes que aquellas a las que llaman
+            changed = True
+            while changed:
+                changed = False
+                for call in calls:
+                    examined = call.examined
+                    for offset, callee in call.callees:
+                        if offset + callee.examined > examined:
+                            examined = offset + callee.examined
+                    if examined > call.examined:
+                        call.examined = examined
+                        changed = True
+            for call in calls:
+                call.waiters = call.seen = None
+                if call.examined > reach[column]:
+                    reach[column] = call.examined
+
+    def _collect_failure(self, root: _Call) -> Tuple[int, Set[str]]:
+        """
+        Fallo más lejano entre las llamadas alcanzables desde root
+
+        Son las mismas que crearía un análisis desde cero, así que el
+        diagnóstico no depende de qué llamadas se reutilizaron.
+        """
+        furthest, expected = -1, set()
+        visited: Set[int] = set()
+        pending = [(0, root)]
+        while pending:
+            pos, call = pending.pop()
+            if id(call) in visited:
+                continue
+            visited.add(id(call))
+            if call.failure is not None:
+                position = pos + call.failure[0]
+                if position > furthest:
+                    furthest, expected = position, set(call.failure[1])
+                elif position == furthest:
+                    expected.update(call.failure[1])
+            pending.extend((pos + offset, callee) for offset, callee in call.callees)
+        return furthest, expected
+
+    def _new_call(self, symbol: str, pos: int) -> _Call:
+        """Crea la llamada y la anota para cerrarla al terminar"""
+        call = super()._new_call(symbol, pos)
+        self._created.append(call)
+        return call
+
+    def _call(self, symbol: str, pos: int) -> _Call:
+        """Como en Type2Parser, anotando la llamada en la que la hace"""
+        caller = self._current
+        callee = super()._call(symbol, pos)
+        if caller is not None:
+            caller.callees.append((pos - caller.start, callee))
+        return callee
+
+    def _examine(self, end: int):
+        """Anota que la llamada en curso examinó la entrada hasta end (exclusivo)"""
+        call = self._current
+        if call is not None and end - call.start > call.examined:
+            call.examined = end - call.start
+
+    def _token_at(self, pos: int) -> Optional[str]:
+        """Como en Type2Parser; el terminal más largo depende de hasta max_length caracteres o del fin"""
+        self._examine(min(pos + self._span, len(self._text) + 1))
+        return super()._token_at(pos)
+
+    def _is_hopeless(self, info: _ProductionInfo, index: int, pos: int) -> bool:
+        """Como Type2Parser._is_hopeless, pero solo con el carácter de pos (sin la cota de longitud restante)"""
+        if info.suffix_min[index] == 0:
+            return False
+        self._examine(pos + 1)
+        return pos >= len(self._text) or self._text[pos] not in info.suffix_first[index]
+
+    def _note_failure(self, pos: int, expected: Iterable[str]):
+        """Guarda el fallo más lejano en la llamada en curso, relativo a su columna"""
+        call = self._current
+        relative = pos - call.start
+        failure = call.failure
+        if failure is None or relative > failure[0]:
+            call.failure = (relative, frozenset(expected))
+        elif relative == failure[0] and not failure[1].issuperset(expected):
+            call.failure = (relative, failure[1].union(expected))
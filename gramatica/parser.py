@@ -0,0 +1,1367 @@
+"""
+Módulo para parsing de gramáticas (Tipo 2 y Tipo 3)
+"""
+
+from typing import Dict, FrozenSet, Iterable, List, NamedTuple, Optional, Tuple, Set, Union
+from collections import deque
+from contextlib import contextmanager
+from functools import lru_cache
+import io
+import json
+import math
+import re
+from .grammar import FrozenGrammar, Grammar
+from .tree import DerivationTree, TreeNode
+from .budget import Budget, BudgetExceeded
+from .stats import ParseStats
+import time
+
+
+# Marca de "fin de la cadena" en los terminales esperados (ningún terminal es la cadena vacía)
+END_OF_INPUT = ''
+
+
+class ParseError:
+    """
+    Diagnóstico de una cadena rechazada
+    
+    Guarda la posición más lejana a la que llegó el análisis y los terminales
+    que se esperaban allí. Los motores lo calculan durante el propio análisis,
+    sin repetirlo. Es falso en contexto booleano, como el None que ocupaba su
+    lugar, para que "if arbol:" siga distinguiendo aceptación de rechazo.
+    """
+    
+    __slots__ = ('string', 'position', 'expected', 'reason', '_found')
+    
+    def __init__(self, string: str, position: int, expected: Iterable[str] = (),
+                 reason: Optional[str] = None, found: Optional[str] = None):
+        """
+        Args:
+            string: Cadena analizada
+            position: Desplazamiento del fallo (len(string) si falta entrada)
+            expected: Terminales esperados en position (END_OF_INPUT si valía terminar)
+            reason: Explicación cuando el rechazo no depende de un terminal concreto
+            found: Terminal reconocido en position, si el motor llegó a separarlo
+        """
+        self.string = string
+        self.position = position
+        self.expected: FrozenSet[str] = frozenset(expected)
+        self.reason = reason
+        self._found = found
+    
+    @property
+    def found(self) -> str:
+        """Terminal (o carácter) encontrado en la posición del fallo; vacío en el fin de la cadena"""
+        if self._found is not None:
+            return self._found
+        return self.string[self.position:self.position + 1]
+    
+    @property
+    def line(self) -> int:
+        """Línea del fallo (desde 1)"""
+        return self.string.count('\n', 0, self.position) + 1
+    
+    @property
+    def column(self) -> int:
+        """Columna del fallo dentro de su línea (desde 1)"""
+        return self.position - (self.string.rfind('\n', 0, self.position) + 1) + 1
+    
+    def __bool__(self) -> bool:
+        return False
+    
+    def __eq__(self, other) -> bool:
+        if not isinstance(other, ParseError):
+            return NotImplemented
+        return (self.string, self.position, self.expected, self.reason, self.found) == \
+               (other.string, other.position, other.expected, other.reason, other.found)
+    
+    def __hash__(self) -> int:
+        return hash((self.string, self.position, self.expected, self.reason, self.found))
+    
+    def __repr__(self):
+        return f"ParseError(position={self.position}, expected={sorted(self.expected)!r}, found={self.found!r})"
+    
+    def __str__(self):
+        location = f"posición {self.position}"
+        if '\n' in self.string:
+            location += f" (línea {self.line}, columna {self.column})"
+        found = f"'{self.found}'" if self.found else "el fin de la cadena"
+        if self.reason:
+            return f"{location}: {self.reason}"
+        if not self.expected:
+            return f"{location}: no se esperaba {found}"
+        names = [f"'{terminal}'" for terminal in sorted(self.expected) if terminal != END_OF_INPUT]
+        if END_OF_INPUT in self.expected:
+            names.append("el fin de la cadena")
+        expected = names[0] if len(names) == 1 else ", ".join(names[:-1]) + " o " + names[-1]
+        return f"{location}: se esperaba {expected}, se encontró {found}"
+
+
+class GreedyLexer:
+    """
+    Analizador léxico común a todos los motores
+    
+    En cada posición reconoce el terminal más largo que empieza allí, sin
+    volver atrás: con los terminales "a", "ab" y "b", "abb" se separa en
+    "ab" "b" aunque "a" "b" "b" también encajaría. Los motores deciden la
+    pertenencia al lenguaje sobre esta secuencia de terminales.
+    """
+    
+    def __init__(self, terminals: Iterable[str]):
+        self.terminals = sorted({terminal for terminal in terminals if terminal}, key=len, reverse=True)
+        self.max_length = len(self.terminals[0]) if self.terminals else 0
+        # En una alternancia re prueba las opciones en orden: la primera que encaja es la más larga
+        self._pattern = re.compile("|".join(map(re.escape, self.terminals))) if self.terminals else None
+    
+    def match(self, string: str, pos: int) -> Optional[str]:
+        """Terminal más largo que empieza en pos (None si ninguno)"""
+        found = self._pattern.match(string, pos) if self._pattern is not None else None
+        return found.group() if found else None
+    
+    def tokenize(self, string: str) -> Tuple[List[str], int]:
+        """
+        Separa la cadena en terminales
+        
+        Returns:
+            (terminales, posición en la que se detuvo); la posición es
+            len(string) si la cadena se separó entera
+        """
+        if self._pattern is None:
+            return [], 0
+        # findall salta lo que no encaja: si los terminales cubren toda la cadena, no hubo huecos
+        tokens = self._pattern.findall(string)
+        if sum(map(len, tokens)) == len(string):
+            return tokens, len(string)
+        tokens = []
+        pos = 0
+        while pos < len(string):
+            found = self._pattern.match(string, pos)
+            if found is None:
+                break
+            tokens.append(found.group())
+            pos = found.end()
+        return tokens, pos
+
+
+# (aceptada, árbol) o (False, diagnóstico del rechazo)
+ParseResult = Tuple[bool, Union[DerivationTree, ParseError]]
+
+
+class Parser:
+    """Clase base para parsers"""
+    
+    def __init__(self, grammar: Grammar):
+        self.grammar = grammar
+        # Presupuesto y estadísticas de la llamada en curso (None si no se pidieron)
+        self._budget: Optional[Budget] = None
+        self._stats: Optional[ParseStats] = None
+    
+    def parse(self, string: str, budget: Optional[Budget] = None,
+              stats: Optional[ParseStats] = None) -> ParseResult:
+        """
+        Analiza si una cadena pertenece al lenguaje
+        
+        Args:
+            string: Cadena a analizar
+            budget: Límite opcional de pasos, tiempo y memoria
+            stats: Objeto opcional donde se acumulan contadores y tiempos
+        
+        Returns:
+            (True, árbol_de_derivación) si se acepta, o (False, ParseError) con
+            la posición más lejana alcanzada y los terminales esperados allí
+        
+        Raises:
+            BudgetExceeded: Si se agota el presupuesto antes de decidir
+        """
+        if budget is None and stats is None:
+            return self._parse(string)
+        
+        with self._session(budget, stats):
+            return self._parse(string)
+    
+    @contextmanager
+    def _session(self, budget: Optional[Budget], stats: Optional[ParseStats]):
+        """Activa el presupuesto y las estadísticas durante una llamada"""
+        self._budget = budget
+        self._stats = stats
+        try:
+            if budget is not None:
+                budget.start()
+            if stats is None:
+                yield
+            else:
+                with stats.measure():
+                    yield
+        finally:
+            if budget is not None:
+                budget.stop()
+            self._budget = None
+            self._stats = None
+    
+    def _parse(self, string: str) -> ParseResult:
+        """Implementación del análisis en cada motor (ver parse)"""
+        raise NotImplementedError
+    
+    def recognize(self, string: str, budget: Optional[Budget] = None) -> bool:
+        """
+        Decide si una cadena pertenece al lenguaje sin construir el árbol
+        
+        Los motores que pueden decidir más rápido sin árbol sobrescriben este método.
+        """
+        return self.parse(string, budget)[0]
+
+
+class Type3Parser(Parser):
+    """
+    Parser para gramáticas Tipo 3 (Regulares) usando autómata finito
+    
+    La cadena se separa con GreedyLexer y el autómata avanza por esos terminales.
+    """
+    
+    def __init__(self, grammar: Grammar):
+        super().__init__(grammar)
+        # Preprocesar terminales ordenados por longitud (más largos primero)
+        self._sorted_terminals = sorted(self.grammar.terminals, key=len, reverse=True)
+        self._lexer = GreedyLexer(self.grammar.terminals)
+        self.automaton = self._build_automaton()
+    
+    def _build_automaton(self) -> dict:
+        """
+        Construye un autómata finito no determinista desde la gramática regular
+        Returns: dict con estados y transiciones
+        """
+        # Estados: no terminales + estado final
+        states = set(self.grammar.non_terminals)
+        states.add('FINAL')  # Estado de aceptación
+        
+        transitions = {}  # {estado: {símbolo: [estados_destino]}}
+        
+        # Inicializar transiciones
+        for state in states:
+            transitions[state] = {}
+        
+        # Construir transiciones desde las producciones
+        for left, rights in self.grammar.productions.items():
+            for right in rights:
+                # Para gramáticas regulares, las producciones pueden ser:
+                # A → a (terminal simple)
+                # A → aB (terminal seguido de no terminal)
+                # A → ε (cadena vacía)
+                
+                if right == '' or right == 'ε':
+                    # Producción vacía - transición directa al final
+                    if 'ε' not in transitions[left]:
+                        transitions[left]['ε'] = []
+                    transitions[left]['ε'].append('FINAL')
+                elif right in self.grammar.terminals:
+                    # A → a (solo terminal)
+                    terminal = right
+                    if terminal not in transitions[left]:
+                        transitions[left][terminal] = []
+                    transitions[left][terminal].append('FINAL')
+                else:
+                    # Intentar parsear A → aB o A → terminal_multi_carácter
+                    # Buscar el terminal más largo al inicio
+                    matched_terminal = None
+                    remaining = right
+                    
+                    # Buscar terminal en el inicio
+                    for terminal in self._sorted_terminals:
+                        if remaining.startswith(terminal):
+                            matched_terminal = terminal
+                            remaining = remaining[len(terminal):]
+                            break
+                    
+                    if matched_terminal:
+                        # Permitir separar el no terminal con espacios (A → a B) y nombres de varios caracteres
+                        remaining = remaining.strip()
+                        if len(remaining) == 0:
+                            # A → terminal (lleva al final)
+                            if matched_terminal not in transitions[left]:
+                                transitions[left][matched_terminal] = []
+                            transitions[left][matched_terminal].append('FINAL')
+                        elif remaining in self.grammar.non_terminals:
+                            # A → terminal B
+                            if matched_terminal not in transitions[left]:
+                                transitions[left][matched_terminal] = []
+                            transitions[left][matched_terminal].append(remaining)
+        
+        return {
+            'states': states,
+            'transitions': transitions,
+            'initial': self.grammar.start_symbol,
+            'final': 'FINAL'
+        }
+    
+    def _try_match_terminal(self, string: str, pos: int) -> Optional[Tuple[int, str]]:
+        """
+        Intenta hacer match de un terminal en la posición dada
+        Prueba terminales más largos primero para evitar conflictos
+        """
+        terminal = self._lexer.match(string, pos)
+        if terminal is None:
+            return None
+        return (pos + len(terminal), terminal)
+    
+    def _parse(self, string: str) -> ParseResult:
+        """Analiza una cadena usando el autómata finito"""
+        budget = self._budget
+        stats = self._stats
+        
+        if not string:  # Cadena vacía
+            # Verificar si hay producción vacía
+            if '' in self.grammar.productions.get(self.grammar.start_symbol, []) or \
+               'ε' in self.grammar.productions.get(self.grammar.start_symbol, []):
+                root = TreeNode(self.grammar.start_symbol)
+                root.add_child(TreeNode('ε'))
+                return True, DerivationTree(root)
+            return False, ParseError(string, 0, self._expected_after({self.grammar.start_symbol}))
+        
+        # Simular autómata finito no determinista con terminales multi-carácter
+        current_states = {self.grammar.start_symbol}
+        
+        # Guardar rastro para construir el árbol
+        trace = []  # Lista de (estado, terminal_matcheado, estados_siguientes)
+        
+        pos = 0
+        while pos < len(string):
+            if budget is not None:
+                budget.tick()
+            
+            next_states = set()
+            used_transitions = []
+            matched_terminal = None
+            
+            # Intentar hacer match con terminales (más largos primero)
+            if stats is None:
+                match_result = self._try_match_terminal(string, pos)
+            else:
+                started = time.perf_counter()
+                match_result = self._try_match_terminal(string, pos)
+                stats.add_time('lexico', time.perf_counter() - started)
+                stats.states_visited += len(current_states)
+                if match_result is not None:
+                    stats.tokens_matched += 1
+                    stats.trace('token', match_result[1], pos)
+            
+            if match_result is None:
+                # No hay match posible
+                return False, ParseError(string, pos, self._expected_after(current_states))
+            
+            new_pos, matched_terminal = match_result
+            
+            # Procesar transiciones con este terminal
+            for state in current_states:
+                if matched_terminal in self.automaton['transitions'].get(state, {}):
+                    for next_state in self.automaton['transitions'][state][matched_terminal]:
+                        next_states.add(next_state)
+                        used_transitions.append((state, matched_terminal, next_state))
+            
+            if not next_states:
+                return False, ParseError(string, pos, self._expected_after(current_states), found=matched_terminal)
+            
+            trace.append((current_states, matched_terminal, used_transitions))
+            current_states = next_states
+            pos = new_pos
+        
+        # Verificar si llegamos al estado final
+        if self._is_accepting(current_states):
+            if stats is None:
+                tree = self._build_tree_from_trace(string, trace)
+            else:
+                with stats.phase('arbol'):
+                    tree = self._build_tree_from_trace(string, trace)
+                stats.nodes_allocated += len(trace) + 1
+            return True, tree
+        
+        return False, ParseError(string, len(string), self._expected_after(current_states))
+    
+    def _expected_after(self, states: Set[str]) -> Set[str]:
+        """Terminales con transición desde algún estado (y END_OF_INPUT si alguno acepta)"""
+        transitions = self.automaton['transitions']
+        expected = {terminal for state in states for terminal in transitions.get(state, {})
+                    if terminal != 'ε'}
+        if self._is_accepting(states):
+            expected.add(END_OF_INPUT)
+        return expected
+    
+    def recognize(self, string: str, budget: Optional[Budget] = None) -> bool:
+        """Decide la pertenencia sin guardar el rastro ni construir el árbol"""
+        return self.recognize_stream(io.StringIO(string), max(len(string), 1), budget)[0]
+    
+    def _is_accepting(self, states: Set[str]) -> bool:
+        """Verifica si algún estado es final o llega al final con una producción vacía"""
+        final = self.automaton['final']
+        transitions = self.automaton['transitions']
+        return any(state == final or final in transitions.get(state, {}).get('ε', ())
+                   for state in states)
+    
+    def recognize_stream(self, source, chunk_size: int = 1 << 16,
+                         budget: Optional[Budget] = None) -> Tuple[bool, Optional[int]]:
+        """
+        Reconoce una entrada leída por bloques sin cargarla completa en memoria
+        
+        Solo se conserva el conjunto de estados actual y un bloque de entrada,
+        por lo que la memoria es constante sea cual sea el tamaño de la entrada.
+        Los terminales partidos entre dos bloques se reconocen igual que en parse
+        (se reserva la cola del bloque hasta tener el terminal más largo completo).
+        
+        Args:
+            source: Objeto con método read (archivo de texto o binario, mmap, io.BytesIO...)
+            chunk_size: Tamaño de cada bloque leído
+            budget: Límite opcional de pasos (un paso por terminal), tiempo y memoria
+        
+        Returns:
+            (aceptada, desplazamiento_del_fallo) donde el desplazamiento es None si se
+            acepta; se mide en caracteres para texto y en bytes para entradas binarias
+        
+        Raises:
+            BudgetExceeded: Si se agota el presupuesto antes de decidir
+        """
+        if budget is not None:
+            with budget:
+                return self._recognize_stream(source, chunk_size, budget)
+        return self._recognize_stream(source, chunk_size, None)
+    
+    def _recognize_stream(self, source, chunk_size: int, budget: Optional[Budget]) -> Tuple[bool, Optional[int]]:
+        """Recorrido por bloques (ver recognize_stream)"""
+        transitions = self.automaton['transitions']
+        states = frozenset([self.grammar.start_symbol])
+        # Transiciones entre conjuntos de estados ya calculadas: (estados, terminal) → estados
+        step_cache = {}
+        
+        buffer = source.read(chunk_size)
+        eof = not buffer
+        binary = isinstance(buffer, (bytes, bytearray))
+        
+        # Terminales agrupados por longitud (más largos primero) para el match más largo
+        by_length = {}  # longitud → {terminal_en_la_entrada: terminal}
+        for terminal in self._sorted_terminals:
+            unit = terminal.encode('utf-8') if binary else terminal
+            if unit:
+                by_length.setdefault(len(unit), {})[unit] = terminal
+        lengths = sorted(by_length, reverse=True)
+        max_length = lengths[0] if lengths else 1
+        
+        offset = 0  # Desplazamiento absoluto de buffer[0]
+        while True:
+            # Sin EOF solo se avanza mientras cabe el terminal más largo en el bloque
+            limit = len(buffer) if eof else len(buffer) - max_length + 1
+            i = 0
+            while i < limit:
+                if budget is not None:
+                    budget.tick()
+                
+                for length in lengths:
+                    terminal = by_length[length].get(buffer[i:i + length])
+                    if terminal is not None:
+                        break
+                else:
+                    return False, offset + i
+                
+                next_states = step_cache.get((states, terminal))
+                if next_states is None:
+                    next_states = frozenset(next_state for state in states
+                                            for next_state in transitions.get(state, {}).get(terminal, ()))
+                    step_cache[(states, terminal)] = next_states
+                if not next_states:
+                    return False, offset + i
+                
+                states = next_states
+                i += length
+            
+            if eof:
+                break
+            
+            chunk = source.read(chunk_size)
+            eof = not chunk
+            buffer = buffer[i:] + chunk
+            offset += i
+        
+        if self._is_accepting(states):
+            return True, None
+        return False, offset + len(buffer)
+    
+    def _build_tree_from_trace(self, string: str, trace: List) -> DerivationTree:
+        """
+        Construye el árbol de derivación A → a B → ... desde el rastro
+        
+        Se recorre el rastro hacia atrás desde un estado de aceptación para
+        quedarse con un camino de estados que consume todos los terminales;
+        el árbol tiene la misma forma que el de derive_tree.
+        """
+        final = self.automaton['final']
+        transitions = self.automaton['transitions']
+        targets = {next_state for _, _, next_state in trace[-1][2]}
+        goal = final if final in targets else next(
+            state for state in targets if final in transitions.get(state, {}).get('ε', ()))
+        
+        steps = []  # (estado, terminal, destino)
+        target = goal
+        for _, _, used_transitions in reversed(trace):
+            for state, terminal, next_state in used_transitions:
+                if next_state == target:
+                    steps.append((state, terminal, next_state))
+                    target = state
+                    break
+        steps.reverse()
+        
+        root = TreeNode(self.grammar.start_symbol)
+        current = root
+        for state, terminal, target in steps:
+            current.add_child(TreeNode(terminal))
+            if target != final:
+                child = TreeNode(target)
+                current.add_child(child)
+                current = child
+        if goal != final:
+            current.add_child(TreeNode('ε'))
+        return DerivationTree(root)
+    
+    def derive_tree(self, string: str) -> Optional[DerivationTree]:
+        """
+        Construye el árbol de derivación A → a B → ... siguiendo un camino del autómata
+        que consuma exactamente los terminales de GreedyLexer
+        
+        Returns:
+            El árbol, o None si la cadena no pertenece al lenguaje
+        """
+        transitions = self.automaton['transitions']
+        final = self.automaton['final']
+        start = (0, self.grammar.start_symbol)
+        
+        # Búsqueda en anchura sobre (posición, estado) guardando de dónde se llegó
+        parents = {start: None}
+        queue = deque([start])
+        goal = None
+        while queue:
+            node = queue.popleft()
+            pos, state = node
+            if pos == len(string) and (state == final or final in transitions.get(state, {}).get('ε', ())):
+                goal = node
+                break
+            terminal = self._lexer.match(string, pos)
+            if terminal is None:
+                continue
+            for target in transitions.get(state, {}).get(terminal, ()):
+                next_node = (pos + len(terminal), target)
+                if next_node not in parents:
+                    parents[next_node] = (node, terminal)
+                    queue.append(next_node)
+        
+        if goal is None:
+            return None
+        
+        steps = []  # (estado, terminal, destino)
+        node = goal
+        while parents[node] is not None:
+            previous, terminal = parents[node]
+            steps.append((previous[1], terminal, node[1]))
+            node = previous
+        steps.reverse()
+        
+        root = TreeNode(self.grammar.start_symbol)
+        current = root
+        for state, terminal, target in steps:
+            current.add_child(TreeNode(terminal))
+            if target != final:
+                child = TreeNode(target)
+                current.add_child(child)
+                current = child
+        if goal[1] != final:
+            current.add_child(TreeNode('ε'))
+        return DerivationTree(root)
+
+
+class _Call:
+    """
+    Análisis memoizado de un símbolo a partir de una posición (su columna)
+    
+    ends guarda, por cada fin alcanzado (relativo a la columna), el nodo de la
+    primera derivación que llegó a él. Mientras dura el análisis, waiters
+    guarda las continuaciones que esperan cada fin nuevo y seen los pasos ya
+    encolados; al terminar se liberan (None) y la llamada ya no cambia.
+    """
+    
+    __slots__ = ('symbol', 'start', 'ends', 'waiters', 'seen', 'examined', 'failure', 'callees')
+    
+    def __init__(self, symbol: str, start: int):
+        self.symbol = symbol
+        self.start = start  # columna en el análisis que la creó
+        self.ends: Dict[int, TreeNode] = {}
+        self.waiters: Optional[List[Tuple['_Call', '_ProductionInfo', int, Tuple[TreeNode, ...]]]] = []
+        self.seen: Optional[Set[Tuple[str, int, int]]] = set()
+        # Solo los usa IncrementalParser: alcance examinado y fallo más lejano
+        # (relativos a la columna) y llamadas hechas (columna relativa, llamada)
+        self.examined = 0
+        self.failure: Optional[Tuple[int, FrozenSet[str]]] = None
+        self.callees: List[Tuple[int, '_Call']] = []
+
+
+class Type2Parser(Parser):
+    """
+    Parser para gramáticas Tipo 2 (Libres de Contexto) descendente y memoizado
+    
+    Los terminales se reconocen con GreedyLexer (el más largo en cada
+    posición) y sobre esa secuencia el análisis es exacto: cada par (símbolo,
+    posición) se analiza una sola vez y guarda todos los fines que alcanza;
+    quien lo pidió continúa desde cada uno, también desde los que aparecen
+    después, y así se resuelven la recursión por la izquierda y las
+    producciones ε. Solo se guardan los fines tras los que puede venir el
+    terminal siguiente (conjuntos SIGUIENTE), de modo que una lista recursiva
+    por la derecha no acumula todos sus prefijos.
+    
+    El trabajo pendiente se guarda en una pila explícita: la profundidad del
+    árbol no está limitada por la recursión de Python. Si hay varias
+    derivaciones, el árbol es el de la primera que se completa.
+    """
+    
+    def __init__(self, grammar: Grammar):
+        super().__init__(grammar)
+        # Preprocesar terminales ordenados por longitud (más largos primero) para matching correcto
+        self._sorted_terminals = sorted(self.grammar.terminals, key=len, reverse=True)
+        self._sorted_non_terminals = sorted(self.grammar.non_terminals, key=len, reverse=True)
+        self._lexer = GreedyLexer(self.grammar.terminals)
+        self._symbols_cache: Dict[str, List[str]] = {}  # producción → símbolos
+        # Cotas de longitud y primeros caracteres para podar alternativas sin explorarlas
+        self._bounds: Dict[str, Tuple[float, float, FrozenSet[str]]] = {}
+        self._compute_symbol_bounds()
+        self._production_table: Dict[str, List[_ProductionInfo]] = {
+            left: [self._production_info(right) for right in rights]
+            for left, rights in self.grammar.productions.items()
+        }
+        # Fallo más lejano del análisis en curso: posición y terminales esperados allí
+        self._furthest = -1
+        self._expected: Set[str] = set()
+        self._truncated = -1  # mayor posición de una alternativa podada por falta de entrada
+        # Primeros terminales de cada no terminal y de cada sufijo, y terminales SIGUIENTE
+        self._first_terminals: Optional[Dict[str, FrozenSet[str]]] = None
+        self._suffix_expected: Dict[Tuple[str, int], FrozenSet[str]] = {}
+        self._follow = self._follow_terminals()
+        # Estado del análisis en curso
+        self._text = ''
+        self._columns: List[Dict[str, _Call]] = []  # posición → {símbolo: llamada}
+        self._tokens: Dict[int, Optional[str]] = {}  # posición → terminal del analizador léxico
+        self._tasks: List[Tuple[_Call, _ProductionInfo, int, int, Tuple[TreeNode, ...]]] = []
+        self._current: Optional[_Call] = None  # llamada cuyo paso se está ejecutando
+    
+    def _parse(self, string: str) -> ParseResult:
+        """
+        Analiza una cadena (ver la descripción de la clase)
+        """
+        start = self.grammar.start_symbol
+        if string:
+            # Si la longitud de la cadena queda fuera de lo que puede generar S, no hace falta analizar
+            min_length, max_length, _ = self._symbol_bounds(start)
+            if not min_length <= len(string) <= max_length:
+                if self._stats is not None:
+                    self._stats.pruned_branches += 1
+                if min_length == math.inf:
+                    return False, ParseError(string, 0, reason="la gramática no genera ninguna cadena")
+                if len(string) < min_length:
+                    return False, ParseError(string, len(string),
+                                             reason=f"la cadena es más corta que la mínima ({min_length:g} caracteres)")
+                return False, ParseError(string, int(max_length), {END_OF_INPUT},
+                                         reason=f"la cadena es más larga que la máxima ({max_length:g} caracteres)")
+        
+        self._furthest = -1
+        self._expected = set()
+        self._truncated = -1
+        self._begin(string, [{} for _ in range(len(string) + 1)])
+        try:
+            if self._stats is None:
+                root = self._analyze(start)
+            else:
+                with self._stats.phase('analisis'):
+                    root = self._analyze(start)
+        finally:
+            self._finish()
+        
+        node = root.ends.get(len(string))
+        if node is not None:
+            return True, DerivationTree(node)
+        if not string:
+            return False, ParseError(string, 0, self._first_terminals_of(start))
+        # Si se reconoció solo un prefijo, allí habría bastado con que terminara la cadena
+        if root.ends:
+            self._note_failure(max(root.ends), (END_OF_INPUT,))
+        # Una alternativa que pasaba del fallo más lejano solo se descartó por falta de entrada
+        if self._truncated >= self._furthest:
+            return False, ParseError(string, len(string), reason="la cadena termina antes de tiempo")
+        return False, ParseError(string, max(self._furthest, 0), self._expected)
+    
+    def _begin(self, text: str, columns: List[Dict[str, _Call]]):
+        """Prepara el análisis de text sobre las columnas dadas"""
+        self._text = text
+        self._columns = columns
+        self._tokens = {}
+        self._tasks = []
+        self._current = None
+    
+    def _finish(self):
+        """Olvida el estado del análisis en curso"""
+        self._text = ''
+        self._columns = []
+        self._tokens = {}
+        self._tasks = []
+        self._current = None
+    
+    def _analyze(self, start: str) -> _Call:
+        """Analiza start en la posición 0 hasta agotar el trabajo pendiente"""
+        root = self._call(start, 0)
+        tasks = self._tasks
+        budget = self._budget
+        while tasks:
+            if budget is not None:
+                budget.tick()
+            self._step(*tasks.pop())
+        return root
+    
+    def _token_at(self, pos: int) -> Optional[str]:
+        """Terminal que reconoce el analizador léxico en pos (None si ninguno o en el fin)"""
+        tokens = self._tokens
+        if pos in tokens:
+            return tokens[pos]
+        token = tokens[pos] = self._lexer.match(self._text, pos)
+        return token
+    
+    def _call(self, symbol: str, pos: int) -> _Call:
+        """Llamada memoizada de symbol en pos; si es nueva, encola sus producciones"""
+        column = self._columns[pos]
+        call = column.get(symbol)
+        stats = self._stats
+        if call is not None:
+            if stats is not None:
+                stats.memo_hits += 1
+            return call
+        
+        call = column[symbol] = self._new_call(symbol, pos)
+        if stats is not None:
+            stats.recursive_calls += 1
+            stats.trace('llamada', symbol, pos)
+        infos = self._production_table.get(symbol, ())
+        for i in range(len(infos) - 1, -1, -1):  # La primera producción se analiza primero
+            self._tasks.append((call, infos[i], 0, pos, ()))
+        
+        # Un símbolo que también es terminal puede reconocerse como tal (A → 'A')
+        if symbol in self.grammar.terminals:
+            caller, self._current = self._current, call
+            if self._token_at(pos) == symbol:
+                leaf = TreeNode(symbol)
+                if stats is not None:
+                    stats.tokens_matched += 1
+                    stats.nodes_allocated += 1
+                    stats.trace('token', symbol, pos)
+                self._complete(call, pos + len(symbol), (leaf,))
+            else:
+                self._note_failure(pos, (symbol,))
+            self._current = caller
+        return call
+    
+    def _new_call(self, symbol: str, pos: int) -> _Call:
+        """Crea la llamada de symbol en pos"""
+        return _Call(symbol, pos)
+    
+    def _step(self, call: _Call, info: '_ProductionInfo', index: int, pos: int,
+              children: Tuple[TreeNode, ...]):
+        """
+        Continúa la producción info de call desde su símbolo index en pos
+        
+        Avanza por los terminales y ε hasta el primer no terminal, cuya
+        llamada reanudará el paso con cada fin que alcance, o hasta completar
+        la producción.
+        """
+        self._current = call
+        stats = self._stats
+        symbols = info.symbols
+        terminals = self.grammar.terminals
+        if index == 0 and stats is not None:
+            stats.production_uses[(call.symbol, info.text)] += 1
+        
+        while index < len(symbols):
+            symbol = symbols[index]
+            if symbol == 'ε' or symbol == '':
+                children += (TreeNode('ε'),)
+                index += 1
+                continue
+            
+            # Lo que falta de la producción no puede encajar en lo que queda de la entrada
+            if self._is_hopeless(info, index, pos):
+                self._note_pruned(info, index, pos)
+                if stats is not None:
+                    stats.pruned_branches += 1
+                    stats.trace('poda', call.symbol, info.text, pos)
+                return
+            
+            if symbol in self._production_table:
+                callee = self._call(symbol, pos)
+                self._current = call
+                if callee.waiters is not None:
+                    callee.waiters.append((call, info, index, children))
+                for end, node in list(callee.ends.items()):
+                    self._resume(call, info, index + 1, pos + end, children + (node,))
+                return
+            
+            if symbol in terminals and self._token_at(pos) == symbol:
+                node = TreeNode(symbol)
+                node.add_child(TreeNode(symbol))
+                if stats is not None:
+                    stats.tokens_matched += 1
+                    stats.nodes_allocated += 2
+                    stats.trace('token', symbol, pos)
+                children += (node,)
+                pos += len(symbol)
+                index += 1
+                continue
+            
+            if symbol in terminals:
+                self._note_failure(pos, (symbol,))
+            if stats is not None:
+                stats.backtracks += 1
+                stats.production_failures[(call.symbol, info.text)] += 1
+                stats.trace('retroceso', call.symbol, info.text, pos)
+            return
+        
+        self._complete(call, pos, children)
+    
+    def _resume(self, call: _Call, info: '_ProductionInfo', index: int, pos: int,
+                children: Tuple[TreeNode, ...]):
+        """Encola un paso de call salvo que ya se encolara otro igual (con otra derivación)"""
+        key = (info.text, index, pos)
+        if key not in call.seen:
+            call.seen.add(key)
+            self._tasks.append((call, info, index, pos, children))
+    
+    def _complete(self, call: _Call, end: int, children: Tuple[TreeNode, ...]):
+        """Registra que call llega hasta end y reanuda a quienes la esperan"""
+        relative = end - call.start
+        if relative in call.ends or not self._may_end(call.symbol, end):
+            return
+        node = TreeNode(call.symbol)
+        node.children.extend(children)
+        if self._stats is not None:
+            self._stats.nodes_allocated += 1
+        call.ends[relative] = node
+        for waiter, info, index, waiting in call.waiters:
+            self._resume(waiter, info, index + 1, end, waiting + (node,))
+    
+    def _may_end(self, symbol: str, end: int) -> bool:
+        """Verifica si tras symbol puede venir lo que hay en end (su terminal o el fin de la cadena)"""
+        follow = self._follow.get(symbol, _END_ONLY)
+        # El terminal se busca también en el fin (no hay ninguno): así cuenta como examinado
+        if self._token_at(end) in follow or end == len(self._text) and END_OF_INPUT in follow:
+            return True
+        self._note_failure(end, follow)
+        return False
+    
+    def _note_failure(self, pos: int, expected: Iterable[str]):
+        """Registra que en pos se esperaba alguno de los terminales dados (solo cuenta el fallo más lejano)"""
+        if pos > self._furthest:
+            self._furthest = pos
+            self._expected = set(expected)
+        elif pos == self._furthest:
+            self._expected.update(expected)
+    
+    def _note_pruned(self, info: '_ProductionInfo', index: int, pos: int):
+        """
+        Registra la poda de info.symbols[index:] en pos
+        
+        Si se debió al carácter de pos (o al fin de la cadena), es un fallo en
+        pos. Si el carácter encaja pero no queda entrada suficiente, la
+        alternativa habría llegado más allá de pos antes de quedarse sin
+        entrada: se anota para informar de un final prematuro.
+        """
+        minimum = info.suffix_min[index]
+        if minimum == 0:
+            return
+        string = self._text
+        if pos >= len(string) or string[pos] not in info.suffix_first[index]:
+            self._note_failure(pos, self._suffix_expected_terminals(info, index))
+        elif minimum > len(string) - pos and pos > self._truncated:
+            self._truncated = pos
+    
+    def _suffix_expected_terminals(self, info: '_ProductionInfo', index: int) -> FrozenSet[str]:
+        """Terminales con los que puede empezar info.symbols[index:] (con caché)"""
+        key = (info.text, index)
+        expected = self._suffix_expected.get(key)
+        if expected is None:
+            expected = self._sequence_first_terminals(info.symbols[index:], self._first_terminals_of_all())
+            self._suffix_expected[key] = expected
+        return expected
+    
+    def _first_terminals_of(self, symbol: str) -> FrozenSet[str]:
+        """Terminales con los que puede empezar lo que deriva symbol"""
+        return self._sequence_first_terminals([symbol], self._first_terminals_of_all())
+    
+    def _first_terminals_of_all(self) -> Dict[str, FrozenSet[str]]:
+        """Primeros terminales de cada no terminal (punto fijo, calculado una vez)"""
+        if self._first_terminals is None:
+            terminals = self.grammar.terminals
+            firsts = {left: frozenset([left]) if left in terminals else frozenset()
+                      for left in self._production_table}
+            changed = True
+            while changed:
+                changed = False
+                for left, infos in self._production_table.items():
+                    first = firsts[left]
+                    for info in infos:
+                        first = first | self._sequence_first_terminals(info.symbols, firsts)
+                    if first != firsts[left]:
+                        firsts[left] = first
+                        changed = True
+            self._first_terminals = firsts
+        return self._first_terminals
+    
+    def _follow_terminals(self) -> Dict[str, FrozenSet[str]]:
+        """
+        Terminales que pueden seguir a cada no terminal (conjuntos SIGUIENTE)
+        
+        END_OF_INPUT indica que el no terminal puede cerrar la cadena.
+        """
+        firsts = self._first_terminals_of_all()
+        follow: Dict[str, Set[str]] = {left: set() for left in self._production_table}
+        follow.setdefault(self.grammar.start_symbol, set()).add(END_OF_INPUT)
+        changed = True
+        while changed:
+            changed = False
+            for left, infos in self._production_table.items():
+                for info in infos:
+                    for index, symbol in enumerate(info.symbols):
+                        if symbol not in self._production_table:
+                            continue
+                        rest = info.symbols[index + 1:]
+                        new = self._sequence_first_terminals(rest, firsts)
+                        if info.suffix_min[index + 1] == 0:
+                            new = new | follow[left]
+                        if not new <= follow[symbol]:
+                            follow[symbol] |= new
+                            changed = True
+        return {symbol: frozenset(terminals) for symbol, terminals in follow.items()}
+    
+    def _sequence_first_terminals(self, symbols: List[str], firsts: Dict[str, FrozenSet[str]]) -> FrozenSet[str]:
+        """Primeros terminales de una secuencia de símbolos, saltando los que pueden ser vacíos"""
+        result: Set[str] = set()
+        for symbol in symbols:
+            if symbol == 'ε' or symbol == '':
+                continue
+            if symbol in firsts:
+                result |= firsts[symbol]
+            elif symbol in self.grammar.terminals:
+                result.add(symbol)
+            if self._symbol_bounds(symbol)[0] > 0:
+                break
+        return frozenset(result)
+    
+    def _parse_production_symbols(self, production: str) -> List[str]:
+        """
+        Parsea los símbolos de una producción, reconociendo terminales multi-carácter
+        Prioriza no terminales cuando hay ambigüedad (el resultado se guarda en caché)
+        """
+        symbols = self._symbols_cache.get(production)
+        if symbols is None:
+            symbols = self._split_production(production)
+            self._symbols_cache[production] = symbols
+        return symbols
+    
+    def _split_production(self, production: str) -> List[str]:
+        """Separa una producción en símbolos (ver _parse_production_symbols)"""
+        return split_production(production, self._sorted_non_terminals, self._sorted_terminals)
+    
+    def _symbol_bounds(self, symbol: str) -> Tuple[float, float, FrozenSet[str]]:
+        """
+        Cotas de lo que puede consumir un símbolo en este parser
+        
+        Returns:
+            (longitud_mínima, longitud_máxima, primeros_caracteres); la mínima es
+            math.inf si el símbolo nunca tiene éxito y la máxima si no está acotada
+        """
+        bounds = self._bounds.get(symbol)
+        if bounds is not None:
+            return bounds
+        if symbol == 'ε' or symbol == '':
+            return 0, 0, frozenset()
+        if symbol in self.grammar.terminals:
+            return len(symbol), len(symbol), frozenset(symbol[:1])
+        return math.inf, 0, frozenset()
+    
+    def _production_info(self, production: str) -> '_ProductionInfo':
+        """Símbolos de una producción con las cotas de cada sufijo"""
+        symbols = self._parse_production_symbols(production)
+        size = len(symbols)
+        suffix_min: List[float] = [0] * (size + 1)
+        suffix_max: List[float] = [0] * (size + 1)
+        suffix_first: List[FrozenSet[str]] = [frozenset()] * (size + 1)
+        for i in range(size - 1, -1, -1):
+            low, high, first = self._symbol_bounds(symbols[i])
+            suffix_min[i] = low + suffix_min[i + 1]
+            suffix_max[i] = high + suffix_max[i + 1]
+            # Si el símbolo puede ser vacío, el sufijo también puede empezar por lo que le sigue
+            suffix_first[i] = first | suffix_first[i + 1] if low == 0 else first
+        return _ProductionInfo(production, symbols, suffix_min, suffix_max, suffix_first)
+    
+    def _compute_symbol_bounds(self):
+        """
+        Calcula en self._bounds la longitud mínima, máxima y primeros caracteres de cada no terminal
+        
+        Las componentes fuertemente conexas de la relación "A usa B" se procesan
+        en orden de dependencias, iterando dentro de cada una hasta el punto fijo.
+        Una componente cuya recursión puede añadir caracteres (A → α B β con B en
+        la misma componente y α β no siempre vacío) no tiene longitud máxima.
+        """
+        bounds = self._bounds
+        terminals = self.grammar.terminals
+        # Las producciones se separan en símbolos una sola vez; sus cotas cambian en cada ronda
+        rules = {left: [self._parse_production_symbols(right) for right in rights]
+                 for left, rights in self.grammar.productions.items()}
+        graph = {left: [symbol for symbols in sequences for symbol in symbols]
+                 for left, sequences in rules.items()}
+        
+        for component in _strongly_connected_components(graph):
+            members = set(component)
+            for left in component:
+                # Un símbolo que también es terminal puede acabar analizándose como terminal
+                if left in terminals:
+                    bounds[left] = (len(left), len(left), frozenset(left[:1]))
+                else:
+                    bounds[left] = (math.inf, 0, frozenset())
+            
+            # Longitudes mínimas y primeros caracteres (solo producciones que pueden tener éxito)
+            changed = True
+            while changed:
+                changed = False
+                for left in component:
+                    low, high, first = bounds[left]
+                    for symbols in rules[left]:
+                        sequence_low, _, sequence_first = self._sequence_bounds(symbols)
+                        if sequence_low < math.inf:
+                            low = min(low, sequence_low)
+                            first = first | sequence_first
+                    if low != bounds[left][0] or first != bounds[left][2]:
+                        bounds[left] = (low, high, first)
+                        changed = True
+            
+            # ¿La recursión dentro de la componente puede bombear caracteres?
+            unbounded = False
+            for left in component:
+                for symbols in rules[left]:
+                    if self._sequence_bounds(symbols)[0] == math.inf:
+                        continue
+                    recursive = [i for i, symbol in enumerate(symbols) if symbol in members]
+                    if recursive and any(self._symbol_bounds(symbol)[2]
+                                         for i, symbol in enumerate(symbols) if i != recursive[0]):
+                        unbounded = True
+            
+            # Longitudes máximas: sin bombeo el punto fijo se alcanza en pocas rondas
+            rounds = 0
+            changed = not unbounded
+            while changed:
+                changed = False
+                rounds += 1
+                for left in component:
+                    low, high, first = bounds[left]
+                    for symbols in rules[left]:
+                        sequence_low, sequence_high, _ = self._sequence_bounds(symbols)
+                        if sequence_low < math.inf:
+                            high = max(high, sequence_high)
+                    if high != bounds[left][1]:
+                        bounds[left] = (low, high, first)
+                        changed = True
+                if changed and rounds > len(component) + 1:
+                    unbounded = True
+                    break
+            if unbounded:
+                for left in component:
+                    low, _, first = bounds[left]
+                    bounds[left] = (low, math.inf, first)
+    
+    def _sequence_bounds(self, symbols: List[str]) -> Tuple[float, float, FrozenSet[str]]:
+        """Cotas de una secuencia de símbolos con las cotas calculadas hasta ahora (como _symbol_bounds)"""
+        low = high = 0
+        first: FrozenSet[str] = frozenset()
+        nullable = True
+        for symbol in symbols:
+            symbol_low, symbol_high, symbol_first = self._symbol_bounds(symbol)
+            low += symbol_low
+            high += symbol_high
+            if nullable:
+                first = first | symbol_first
+                nullable = symbol_low == 0
+        return low, high, first
+    
+    def _is_hopeless(self, info: '_ProductionInfo', index: int, pos: int) -> bool:
+        """Verifica en O(1) si info.symbols[index:] no puede tener éxito desde pos"""
+        minimum = info.suffix_min[index]
+        string = self._text
+        if minimum > len(string) - pos:
+            return True
+        return minimum > 0 and string[pos] not in info.suffix_first[index]
+
+
+# Símbolo que no es no terminal (ni inicial): solo puede ir seguido del fin de la cadena
+_END_ONLY = frozenset([END_OF_INPUT])
+
+
+class _ProductionInfo(NamedTuple):
+    """Producción preprocesada para Type2Parser"""
+    text: str
+    symbols: List[str]
+    suffix_min: List[float]  # longitud mínima que consume symbols[i:]
+    suffix_max: List[float]  # longitud máxima (math.inf si no está acotada)
+    suffix_first: List[FrozenSet[str]]  # caracteres con los que puede empezar symbols[i:] si no es vacío
+
+
+def _strongly_connected_components(graph: Dict[str, List[str]]) -> List[List[str]]:
+    """
+    Componentes fuertemente conexas de un grafo (algoritmo de Tarjan, iterativo)
+    
+    Args:
+        graph: nodo → sucesores (los sucesores que no son nodos se ignoran)
+    
+    Returns:
+        Componentes ordenadas de modo que cada una aparece después de todas
+        las componentes a las que llega
+    """
+    index: Dict[str, int] = {}
+    low: Dict[str, int] = {}
+    stack: List[str] = []
+    on_stack: Set[str] = set()
+    components: List[List[str]] = []
+    
+    for root in graph:
+        if root in index:
+            continue
+        index[root] = low[root] = len(index)
+        stack.append(root)
+        on_stack.add(root)
+        work = [(root, iter(graph[root]))]
+        while work:
+            node, successors = work[-1]
+            descended = False
+            for target in successors:
+                if target not in graph:
+                    continue
+                if target not in index:
+                    index[target] = low[target] = len(index)
+                    stack.append(target)
+                    on_stack.add(target)
+                    work.append((target, iter(graph[target])))
+                    descended = True
+                    break
+                if target in on_stack:
+                    low[node] = min(low[node], index[target])
+            if descended:
+                continue
+            
+            work.pop()
+            if work:
+                parent = work[-1][0]
+                low[parent] = min(low[parent], low[node])
+            if low[node] == index[node]:
+                component = []
+                while True:
+                    member = stack.pop()
+                    on_stack.discard(member)
+                    component.append(member)
+                    if member == node:
+                        break
+                components.append(component)
+    
+    return components
+    
+
+
+def split_production(production: str, non_terminals: List[str], terminals: List[str]) -> List[str]:
+    """
+    Separa el lado derecho de una producción en símbolos
+    
+    Si hay espacios se separa por ellos; si no, se reconocen no terminales
+    (con prioridad) y terminales de varios caracteres, y el resto se toma
+    carácter a carácter.
+    
+    Args:
+        production: Lado derecho de la producción
+        non_terminals: No terminales ordenados de más largo a más corto
+        terminals: Terminales ordenados de más largo a más corto
+    """
+    if not production.strip():
+        return []
+    
+    # Si la producción contiene espacios, split por espacios
+    if ' ' in production:
+        return [s.strip() for s in production.split() if s.strip()]
+    
+    # Si no hay espacios, intentar identificar símbolos
+    # Esto es más complejo: necesitamos distinguir entre caracteres individuales
+    # y terminales multi-carácter, y también reconocer no terminales con apóstrofes como "S'"
+    symbols = []
+    i = 0
+    while i < len(production):
+        char = production[i]
+        remaining = production[i:]
+        matched = False
+        
+        # PRIMERO: Verificar si hay un no terminal que empiece aquí (incluyendo apóstrofes)
+        # Buscar no terminales de mayor longitud primero (para capturar "S'" antes que "S")
+        for nt in non_terminals:
+            if remaining.startswith(nt):
+                symbols.append(nt)
+                i += len(nt)
+                matched = True
+                break
+        
+        if matched:
+            continue
+        
+        # Si no es no terminal, buscar terminales multi-carácter
+        for terminal in terminals:
+            if remaining.startswith(terminal):
+                symbols.append(terminal)
+                i += len(terminal)
+                matched = True
+                break
+        
+        # Si no encontramos nada, tratar como carácter individual
+        if not matched:
+            symbols.append(char)
+            i += 1
+    
+    return symbols
+
+
+def parse_batch(parser: Parser, strings: Iterable[str], budget: Optional[Budget] = None,
+                stats: Optional[ParseStats] = None) -> Tuple[List[Optional[bool]], ParseStats]:
+    """
+    Analiza un lote de cadenas acumulando las estadísticas de todas
+    
+    Args:
+        parser: Parser a usar
+        strings: Cadenas a analizar
+        budget: Presupuesto aplicado a cada cadena por separado
+        stats: Estadísticas donde acumular (se crean si no se dan)
+    
+    Returns:
+        (resultados, estadísticas) donde cada resultado es True/False,
+        o None si se agotó el presupuesto para esa cadena
+    """
+    if stats is None:
+        stats = ParseStats()
+    
+    results: List[Optional[bool]] = []
+    for string in strings:
+        try:
+            results.append(parser.parse(string, budget, stats)[0])
+        except BudgetExceeded:
+            results.append(None)
+    return results, stats
+
+
+# Modos de uso de un parser: "parse" (árbol o diagnóstico) y "recognize" (solo pertenencia)
+ENGINE_MODES = ("parse", "recognize")
+
+# Motor recomendado por el banco diferencial (differential.py): (huella de la gramática, modo) → motor
+ENGINE_RECOMMENDATIONS: Dict[Tuple[str, str], str] = {}
+
+
+def load_engine_recommendations(path: str) -> int:
+    """
+    Carga un archivo de recomendaciones de differential.save_recommendation
+    
+    A partir de entonces create_parser(gramatica, "auto", modo) usa el motor
+    recomendado en ese modo para las gramáticas con la misma huella
+    (FrozenGrammar.fingerprint). Las entradas de un solo modo de archivos
+    antiguos ("engine" y "mode") se cargan para el modo en que se midieron.
+    
+    Returns:
+        Número de recomendaciones (gramática y modo) en el archivo
+    """
+    with open(path, 'r', encoding='utf-8') as f:
+        recommendations = json.load(f)
+    loaded = {}
+    for fingerprint, entry in recommendations.items():
+        by_mode = {entry.get("mode", "parse"): entry} if "engine" in entry else entry
+        for mode in ENGINE_MODES:
+            if isinstance(by_mode.get(mode), dict) and by_mode[mode].get("engine"):
+                loaded[(fingerprint, mode)] = by_mode[mode]["engine"]
+    ENGINE_RECOMMENDATIONS.update(loaded)
+    return len(loaded)
+
+
+def _resolve_engine(grammar: Grammar, engine: str, mode: str = "parse") -> str:
+    """Motor concreto para engine="auto" en el modo dado"""
+    if engine != "auto":
+        return engine
+    if mode not in ENGINE_MODES:
+        raise ValueError(f"Modo desconocido: {mode}")
+    # Solo se calcula la huella si hay recomendaciones cargadas
+    recommended = ENGINE_RECOMMENDATIONS and ENGINE_RECOMMENDATIONS.get((grammar.freeze().fingerprint, mode))
+    return recommended or ("tipo3" if grammar.type == "Tipo 3" else "tipo2")
+
+
+def create_parser(grammar: Grammar, engine: str = "auto", mode: str = "parse") -> Parser:
+    """
+    Factory para crear el parser apropiado según el tipo de gramática
+    
+    Args:
+        grammar: Gramática a analizar (Grammar o FrozenGrammar)
+        engine: "auto" (el recomendado para la gramática en ese modo si se
+            cargó alguna recomendación, y si no según el tipo), "tipo2", "tipo3", "regex"
+            (expresión regular compilada, solo para gramáticas Tipo 3),
+            "incremental" (memoizado y reutilizable tras editar la cadena),
+            "glr" (LR generalizado, acepta cualquier gramática libre de contexto),
+            "cyk" (tabla CYK con máscaras de bits) o "cyk-paralelo" (la tabla
+            CYK repartida entre procesos para cadenas largas)
+        mode: Uso previsto con engine="auto": "parse" (árbol) o "recognize"
+            (solo recognize); cada modo tiene su propia recomendación
+    """
+    engine = _resolve_engine(grammar, engine, mode)
+    
+    if engine == "tipo3":
+        return Type3Parser(grammar)
+    if engine == "tipo2":
+        return Type2Parser(grammar)
+    if engine == "regex":
+        if grammar.type != "Tipo 3":
+            raise ValueError("El motor 'regex' solo admite gramáticas Tipo 3")
+        # Importación diferida: regex_compiler depende de este módulo
+        from .regex_compiler import RegexType3Parser
+        return RegexType3Parser(grammar)
+    if engine == "incremental":
+        from .incremental import IncrementalParser
+        return IncrementalParser(grammar)
+    if engine == "glr":
+        from .glr import GLRParser
+        return GLRParser(grammar)
+    if engine == "cyk":
+        from .cyk import CYKParser
+        return CYKParser(grammar)
+    if engine == "cyk-paralelo":
+        from .cyk import ParallelCYKParser
+        return ParallelCYKParser(grammar)
+    raise ValueError(f"Motor de análisis desconocido: {engine}")
+
+
+# Parsers compartidos por cached_parser (los más usados recientemente)
+PARSER_CACHE_SIZE = 64
+
+
+def cached_parser(grammar: Grammar, engine: str = "auto", mode: str = "parse") -> Parser:
+    """
+    Parser compartido para una gramática, construido una sola vez por contenido
+    
+    La clave es la gramática congelada (Grammar.freeze), de modo que dos
+    gramáticas con las mismas producciones comparten parser aunque sean objetos
+    distintos, y modificar después la original no afecta al parser guardado.
+    Los parsers guardan estado durante cada llamada: no compartir uno entre hilos.
+    
+    Args:
+        grammar: Gramática (mutable o congelada)
+        engine: Motor, como en create_parser
+        mode: Uso previsto con engine="auto", como en create_parser
+    """
+    frozen = grammar.freeze()
+    return _cached_parser(frozen, _resolve_engine(frozen, engine, mode))
+
+
+@lru_cache(maxsize=PARSER_CACHE_SIZE)
+def _cached_parser(grammar: FrozenGrammar, engine: str) -> Parser:
+    return create_parser(grammar, engine)
@@ -0,0 +1,522 @@
+"""
+Módulo para compilar gramáticas Tipo 3 a expresiones regulares de Python (re)
+
+La expresión se obtiene por eliminación de estados sobre el autómata de
+Type3Parser. Las expresiones intermedias se representan como tuplas y se
+simplifican al construirlas para que el resultado sea pequeño:
+
+    None                 ∅ (ninguna cadena)
+    EPSILON              ε
+    ('lit', texto)       literal (uno o varios terminales concatenados)
+    ('alt', frozenset)   alternativa
+    ('cat', tupla)       concatenación
+    ('star', expr)       clausura de Kleene
+
+RegexType3Parser solo usa re con expresiones no ambiguas, con las que re no
+retrocede más que un número lineal de veces; con las demás usa el autómata de
+Type3Parser.
+"""
+
+from typing import Dict, List, Optional, Tuple
+from collections import deque
+from functools import lru_cache
+import re
+
+from .grammar import Grammar
+from .parser import GreedyLexer, ParseResult, Parser, Type3Parser
+from .budget import Budget
+
+
+EPSILON = ('eps',)
+
+# Tamaño máximo (número de literales) de la expresión antes de renunciar y usar el autómata
+DEFAULT_MAX_REGEX_SIZE = 5000
+
+# Primer carácter de uso privado con el que se codifican los terminales (ver terminal_codes)
+_CODE_BASE = 0xF0000
+
+# Precedencias al imprimir: alternativa < concatenación < postfijo (x*, x?) < átomo
+_ALT, _CAT, _POSTFIX, _ATOM = range(4)
+
+
+# Constructores con simplificación
+def _alt(a, b):
+    """a | b"""
+    if a is None:
+        return b
+    if b is None:
+        return a
+    items = set()
+    for expr in (a, b):
+        if expr[0] == 'alt':
+            items.update(expr[1])
+        else:
+            items.add(expr)
+    if len(items) == 1:
+        return items.pop()
+    return ('alt', frozenset(items))
+
+
+def _cat(a, b):
+    """a b"""
+    if a is None or b is None:
+        return None
+    if a == EPSILON:
+        return b
+    if b == EPSILON:
+        return a
+    parts: List[tuple] = []
+    for expr in (a, b):
+        for part in (expr[1] if expr[0] == 'cat' else (expr,)):
+            # Unir literales consecutivos en uno solo
+            if part[0] == 'lit' and parts and parts[-1][0] == 'lit':
+                parts[-1] = ('lit', parts[-1][1] + part[1])
+            else:
+                parts.append(part)
+    if len(parts) == 1:
+        return parts[0]
+    return ('cat', tuple(parts))
+
+
+def _star(a):
+    """a*"""
+    if a is None or a == EPSILON:
+        return EPSILON
+    if a[0] == 'star':
+        return a
+    if a[0] == 'alt' and EPSILON in a[1]:
+        # (ε | x)* = x*
+        rest = None
+        for item in a[1]:
+            if item != EPSILON:
+                rest = _alt(rest, item)
+        return _star(rest)
+    return ('star', a)
+
+
+@lru_cache(maxsize=1 << 16)
+def _size(expr) -> int:
+    """Número de literales (aproxima la longitud de la expresión impresa)"""
+    if expr is None or expr == EPSILON:
+        return 0
+    kind = expr[0]
+    if kind == 'lit':
+        return len(expr[1])
+    if kind == 'star':
+        return _size(expr[1]) + 1
+    return sum(_size(item) for item in expr[1]) + 1
+
+
+# Impresión
+def _split_head(expr) -> Tuple[tuple, tuple]:
+    """Separa una expresión en (primer elemento, resto) para factorizar prefijos comunes"""
+    if expr[0] == 'lit':
+        text = expr[1]
+        return ('lit', text[0]), (('lit', text[1:]) if len(text) > 1 else EPSILON)
+    if expr[0] == 'cat':
+        head, rest = _split_head(expr[1][0])
+        tail = EPSILON
+        for part in expr[1][1:]:
+            tail = _cat(tail, part)
+        return head, _cat(rest, tail)
+    return expr, EPSILON
+
+
+def _escape_class(char: str) -> str:
+    """Escapa un carácter dentro de una clase [...]"""
+    return '\\' + char if char in '\\]^-[' else char
+
+
+# Forma impresa: la expresión tal como se escribe para re, con las alternativas ya
+# factorizadas. Sobre ella se imprime el texto y se comprueba que re no retrocede de más.
+#   ('never',)  ('empty',)  ('lit', texto)  ('class', caracteres)
+#   ('star', x)  ('opt', x)  ('seq', partes)  ('alt', partes)
+_NEVER = ('never',)
+_EMPTY = ('empty',)
+
+
+def _layout(expr) -> tuple:
+    """Forma impresa de una expresión"""
+    if expr is None:
+        return _NEVER
+    if expr == EPSILON:
+        return _EMPTY
+    kind = expr[0]
+    if kind == 'lit':
+        return expr
+    if kind == 'star':
+        return ('star', _layout(expr[1]))
+    if kind == 'cat':
+        return ('seq', tuple(_layout(part) for part in expr[1]))
+    return _layout_alt(expr[1])
+
+
+def _layout_alt(items) -> tuple:
+    """Alternativa: clase de caracteres, prefijos comunes factorizados y ε como '?'"""
+    optional = EPSILON in items
+    items = [item for item in items if item != EPSILON]
+
+    # Agrupar alternativas por su primer elemento: ab|ac → a(?:b|c)
+    groups: Dict[tuple, List[tuple]] = {}
+    for item in items:
+        head, rest = _split_head(item)
+        groups.setdefault(head, []).append(rest)
+
+    chars = []
+    pieces = []
+    for head, rests in groups.items():
+        if len(rests) == 1:
+            item = _cat(head, rests[0])
+            if item[0] == 'lit' and len(item[1]) == 1:
+                chars.append(item[1])
+            else:
+                pieces.append(_layout(item))
+            continue
+        tail = None
+        for rest in rests:
+            tail = _alt(tail, rest)
+        pieces.append(('seq', (_layout(head), _layout(tail))))
+
+    if len(chars) == 1:
+        pieces.append(('lit', chars[0]))
+    elif chars:
+        pieces.append(('class', tuple(sorted(chars))))
+
+    pieces.sort(key=_print)
+    node = pieces[0] if len(pieces) == 1 else ('alt', tuple(pieces))
+    return ('opt', node) if optional else node
+
+
+def _print(node) -> Tuple[str, int]:
+    """Imprime una forma impresa devolviendo (texto, precedencia)"""
+    kind = node[0]
+    if kind == 'never':
+        return '(?!)', _ATOM  # nunca coincide
+    if kind == 'empty':
+        return '', _CAT
+    if kind == 'lit':
+        return re.escape(node[1]), _ATOM if len(node[1]) == 1 else _CAT
+    if kind == 'class':
+        return '[' + ''.join(_escape_class(c) for c in node[1]) + ']', _ATOM
+    if kind == 'star':
+        return _group(node[1], _ATOM) + '*', _POSTFIX
+    if kind == 'opt':
+        return _group(node[1], _ATOM) + '?', _POSTFIX
+    if kind == 'seq':
+        return ''.join(_group(part, _CAT) for part in node[1]), _CAT
+    return '|'.join(_print(part)[0] for part in node[1]), _ALT
+
+
+def _group(node, minimum: int) -> str:
+    """Imprime una forma impresa agrupándola con (?:...) si su precedencia es menor que la requerida"""
+    text, precedence = _print(node)
+    if precedence < minimum:
+        return f'(?:{text})'
+    return text
+
+
+class _Backtracking(Exception):
+    """La expresión puede hacer retroceder a re un número no lineal de veces"""
+
+
+# Pares de posiciones que se exploran como mucho al buscar ambigüedades
+MAX_AMBIGUITY_PAIRS = 1 << 18
+
+
+class _Positions:
+    """
+    Autómata de posiciones (Glushkov) de una forma impresa
+
+    Cada carácter de un literal y cada clase es una posición. re retrocede
+    por los caminos que consumen cada prefijo, así que la expresión es segura
+    si el autómata no es ambiguo (ninguna cadena tiene dos caminos de
+    aceptación, luego cada prefijo llega a cada posición por un solo camino) y
+    la expresión no repite caminos por su estructura: ninguna transición se
+    obtiene de dos formas (como en (?:a*b*)*) y ninguna subexpresión acepta la
+    cadena vacía de dos formas. Así re trabaja O(n·posiciones).
+    """
+
+    def __init__(self):
+        self.chars: List[frozenset] = []  # posición → caracteres que consume
+        self.edges: List[Dict[str, set]] = []  # posición → {carácter: posiciones siguientes}
+
+    def add(self, chars: frozenset) -> int:
+        self.chars.append(chars)
+        self.edges.append({})
+        return len(self.chars) - 1
+
+    def connect(self, sources: List[int], targets: List[int]):
+        for source in sources:
+            edges = self.edges[source]
+            for target in targets:
+                for char in self.chars[target]:
+                    following = edges.setdefault(char, set())
+                    if target in following:
+                        raise _Backtracking()
+                    following.add(target)
+
+    def build(self, node) -> Tuple[bool, List[int], List[int]]:
+        """(anulable, primeras posiciones, últimas posiciones) de la forma impresa"""
+        kind = node[0]
+        if kind == 'never':
+            return False, [], []
+        if kind == 'empty':
+            return True, [], []
+        if kind in ('lit', 'class'):
+            units = [frozenset(node[1])] if kind == 'class' else [frozenset(char) for char in node[1]]
+            positions = [self.add(chars) for chars in units]
+            for source, target in zip(positions, positions[1:]):
+                self.connect([source], [target])
+            return False, positions[:1], positions[-1:]
+        if kind in ('star', 'opt'):
+            nullable, first, last = self.build(node[1])
+            if nullable:
+                raise _Backtracking()  # La cadena vacía se acepta de dos formas
+            if kind == 'star':
+                self.connect(last, first)
+            return True, first, last
+        if kind == 'seq':
+            nullable, first, last = True, [], []
+            for part in node[1]:
+                part_nullable, part_first, part_last = self.build(part)
+                self.connect(last, part_first)
+                if nullable:
+                    first = first + part_first
+                last = last + part_last if part_nullable else part_last
+                nullable = nullable and part_nullable
+            return nullable, first, last
+        nullable, first, last = False, [], []
+        for part in node[1]:
+            part_nullable, part_first, part_last = self.build(part)
+            if part_nullable and nullable:
+                raise _Backtracking()  # Dos alternativas aceptan la cadena vacía
+            nullable = nullable or part_nullable
+            first = first + part_first
+            last = last + part_last
+        return nullable, first, last
+
+    def check_unambiguous(self, first: List[int], last: List[int]):
+        """
+        Busca dos caminos distintos que acepten la misma cadena
+
+        Se recorre el producto del autómata consigo mismo desde el par inicial;
+        hay ambigüedad si un par de posiciones distintas es alcanzable y desde
+        él se llega a un par de posiciones finales.
+        """
+        initial = self.add(frozenset())  # Estado inicial: sus transiciones son las primeras posiciones
+        self.connect([initial], first)
+        finals = set(last)
+        start = (initial, initial)
+        predecessors: Dict[Tuple[int, int], set] = {start: set()}
+        queue = deque([start])
+        while queue:
+            pair = queue.popleft()
+            left, right = self.edges[pair[0]], self.edges[pair[1]]
+            for char, left_targets in left.items():
+                right_targets = right.get(char)
+                if right_targets is None:
+                    continue
+                for p in left_targets:
+                    for q in right_targets:
+                        target = (p, q)
+                        if target not in predecessors:
+                            if len(predecessors) > MAX_AMBIGUITY_PAIRS:
+                                raise _Backtracking()
+                            predecessors[target] = set()
+                            queue.append(target)
+                        predecessors[target].add(pair)
+
+        # Pares desde los que se llega a un par final, recorriendo hacia atrás
+        stack = [pair for pair in predecessors if pair[0] in finals and pair[1] in finals]
+        useful = set(stack)
+        while stack:
+            pair = stack.pop()
+            if pair[0] != pair[1]:
+                raise _Backtracking()
+            for previous in predecessors[pair]:
+                if previous not in useful:
+                    useful.add(previous)
+                    stack.append(previous)
+
+
+def _is_linear(node) -> bool:
+    """True si re.fullmatch decide en tiempo lineal con esta forma impresa (ver _Positions)"""
+    positions = _Positions()
+    try:
+        _, first, last = positions.build(node)
+        positions.check_unambiguous(first, last)
+    except (_Backtracking, RecursionError):
+        return False
+    return True
+
+
+# Eliminación de estados
+def terminal_codes(grammar: Grammar) -> Optional[Dict[str, str]]:
+    """
+    Código de un carácter para cada terminal, o None si no hace falta
+
+    Si ningún terminal es prefijo de otro, la cadena se separa en terminales
+    de una sola forma, que es la del analizador léxico voraz, y la expresión
+    puede aplicarse al texto. Si no (como con "a" y "ab"), re probaría otras
+    separaciones: la expresión se escribe entonces sobre un carácter de uso
+    privado por terminal y se aplica a los terminales de GreedyLexer.
+    """
+    terminals = sorted(terminal for terminal in grammar.terminals if terminal)
+    # En orden lexicográfico, un terminal que es prefijo de otro lo es del siguiente
+    if not any(following.startswith(terminal) for terminal, following in zip(terminals, terminals[1:])):
+        return None
+    return {terminal: chr(_CODE_BASE + i) for i, terminal in enumerate(terminals)}
+
+
+def grammar_to_regex(grammar: Grammar, max_size: int = DEFAULT_MAX_REGEX_SIZE,
+                     codes: Optional[Dict[str, str]] = None) -> Optional[str]:
+    """
+    Convierte una gramática Tipo 3 en una expresión regular equivalente
+
+    Args:
+        grammar: Gramática Tipo 3
+        max_size: Tamaño máximo permitido durante la eliminación de estados
+        codes: Si se da, cada terminal se escribe con su código (ver terminal_codes)
+
+    Returns:
+        La expresión (para usar con re.fullmatch), o None si crece más de max_size
+    """
+    layout = _grammar_layout(grammar, max_size, codes)
+    return None if layout is None else _print(layout)[0]
+
+
+def _grammar_layout(grammar: Grammar, max_size: int,
+                    codes: Optional[Dict[str, str]] = None) -> Optional[tuple]:
+    """Forma impresa de la expresión de la gramática, o None si crece más de max_size"""
+    automaton = Type3Parser(grammar).automaton
+    start, accept = object(), object()  # Estados nuevos de inicio y aceptación
+
+    out_edges: Dict[object, Dict[object, tuple]] = {start: {}, accept: {}}
+    in_edges: Dict[object, Dict[object, tuple]] = {start: {}, accept: {}}
+    for state in automaton['states']:
+        out_edges[state] = {}
+        in_edges[state] = {}
+
+    def add_edge(source, target, expr):
+        expr = _alt(out_edges[source].get(target), expr)
+        out_edges[source][target] = expr
+        in_edges[target][source] = expr
+
+    add_edge(start, automaton['initial'], EPSILON)
+    add_edge(automaton['final'], accept, EPSILON)
+    for state, transitions in automaton['transitions'].items():
+        for symbol, targets in transitions.items():
+            label = EPSILON if symbol == 'ε' else ('lit', codes[symbol] if codes else symbol)
+            for target in targets:
+                add_edge(state, target, label)
+
+    # Descartar estados inalcanzables o que no llevan a la aceptación
+    useful = _reachable(start, out_edges) & _reachable(accept, in_edges)
+    for state in list(out_edges):
+        if state not in useful:
+            for target in out_edges.pop(state):
+                if target in in_edges:
+                    in_edges[target].pop(state, None)
+            for source in in_edges.pop(state):
+                if source in out_edges:
+                    out_edges[source].pop(state, None)
+    if start not in useful:
+        return _NEVER
+
+    remaining = [state for state in out_edges if state is not start and state is not accept]
+    while remaining:
+        # Eliminar primero el estado que crea menos aristas nuevas
+        remaining.sort(key=lambda s: (len(in_edges[s]) * len(out_edges[s]), str(s)), reverse=True)
+        state = remaining.pop()
+
+        loop = _star(out_edges[state].pop(state, None))
+        in_edges[state].pop(state, None)
+        sources = in_edges.pop(state)
+        targets = out_edges.pop(state)
+        for source in sources:
+            out_edges[source].pop(state, None)
+        for target in targets:
+            in_edges[target].pop(state, None)
+
+        for source, entering in sources.items():
+            for target, leaving in targets.items():
+                expr = _cat(_cat(entering, loop), leaving)
+                add_edge(source, target, expr)
+                if _size(out_edges[source][target]) > max_size:
+                    return None
+
+    return _layout(out_edges[start].get(accept))
+
+
+def _reachable(origin, edges: Dict[object, Dict[object, tuple]]) -> set:
+    """Estados alcanzables desde origin siguiendo las aristas dadas"""
+    seen = {origin}
+    stack = [origin]
+    while stack:
+        for target in edges[stack.pop()]:
+            if target not in seen:
+                seen.add(target)
+                stack.append(target)
+    return seen
+
+
+class RegexType3Parser(Parser):
+    """
+    Parser para gramáticas Tipo 3 que decide la pertenencia con el motor re de Python
+
+    re retrocede: con expresiones ambiguas o con cuantificadores anidados, como
+    (?:aa?)*b, tarda un tiempo exponencial en rechazar. Por eso solo se usa si
+    la expresión es determinista y no ambigua (ver _Positions). Si no lo es, o
+    si la expresión crece demasiado, la pertenencia se decide con el autómata
+    de Type3Parser. Los dos separan la cadena igual, con el terminal más largo
+    en cada posición (ver terminal_codes); el árbol de las cadenas aceptadas y
+    el diagnóstico de las rechazadas también los da Type3Parser.
+    """
+
+    def __init__(self, grammar: Grammar, max_size: int = DEFAULT_MAX_REGEX_SIZE):
+        super().__init__(grammar)
+        self._automaton_parser = Type3Parser(grammar)
+        self._lexer = GreedyLexer(grammar.terminals)
+        self._codes = terminal_codes(grammar)
+        layout = _grammar_layout(grammar, max_size, self._codes)
+        self.pattern_source = None if layout is None else _print(layout)[0]
+        self.pattern: Optional[re.Pattern] = None
+        if layout is not None and _is_linear(layout):
+            try:
+                self.pattern = re.compile(self.pattern_source)
+            except (re.error, RecursionError, OverflowError):
+                self.pattern = None
+
+    @property
+    def uses_fallback(self) -> bool:
+        """True si la expresión era demasiado grande o no es segura para re y se usa el autómata"""
+        return self.pattern is None
+
+    def recognize(self, string: str, budget: Optional[Budget] = None) -> bool:
+        """Decide la pertenencia con re.fullmatch (o con el autómata), sin construir el árbol"""
+        if self.pattern is not None:
+            return self._fullmatch(string)
+        return self._automaton_parser.recognize(string, budget)
+
+    def _fullmatch(self, string: str) -> bool:
+        """Aplica la expresión al texto o, si los terminales se codifican, a sus códigos"""
+        if self._codes is None:
+            return self.pattern.fullmatch(string) is not None
+        tokens, stop = self._lexer.tokenize(string)
+        if stop < len(string):
+            return False
+        return self.pattern.fullmatch("".join(map(self._codes.__getitem__, tokens))) is not None
+
+    def _parse(self, string: str) -> ParseResult:
+        """
+        Analiza una cadena con el autómata de Type3Parser, dentro de la llamada en curso
+
+        re no da el árbol ni el diagnóstico, así que aplicar antes la expresión
+        solo repetiría la decisión.
+        """
+        parser = self._automaton_parser
+        parser._budget, parser._stats = self._budget, self._stats
+        try:
+            return parser._parse(string)
+        finally:
+            parser._budget = parser._stats = None
@@ -0,0 +1,173 @@
+"""
+Módulo para buscar en un texto grande todas las subcadenas que pertenecen
+al lenguaje de una gramática Tipo 3
+"""
+
+from typing import Dict, Iterator, List, Optional, Tuple
+import mmap
+import re
+
+from .grammar import Grammar
+from .automata import LazyDFA, compile_regular
+
+
+# Modos de búsqueda
+LEFTMOST_LONGEST = "longest"  # coincidencias sin solapamiento, la más a la izquierda y más larga
+OVERLAPPING = "overlapping"  # todas las subcadenas del lenguaje, aunque se solapen
+
+
+class RegularScanner:
+    """
+    Buscador basado en el AFD de la gramática
+
+    Cada posición de inicio candidata se simula como un "hilo"; los hilos que
+    llegan al mismo estado del AFD se fusionan, por lo que el trabajo por
+    carácter está acotado por el número de estados del AFD y no por el de
+    inicios posibles. Solo se informan coincidencias no vacías.
+
+    OVERLAPPING recorre el texto una sola vez. LEFTMOST_LONGEST tiene que
+    seguir leyendo tras cada coincidencia por si se alarga, y después vuelve
+    a su fin: en el peor caso (coincidencias cortas seguidas de prefijos
+    largos de otras más largas) relee O(n²) caracteres.
+    """
+
+    def __init__(self, grammar: Grammar):
+        self.grammar = grammar
+        self._dfas: Dict[bool, LazyDFA] = {}  # binario → AFD
+        self._skip: Dict[bool, Optional[re.Pattern]] = {}
+
+    def _compiled(self, binary: bool) -> Tuple[LazyDFA, Optional[re.Pattern]]:
+        """AFD y expresión de salto (unidades que pueden iniciar una coincidencia)"""
+        if binary not in self._dfas:
+            dfa = compile_regular(self.grammar, binary)
+            starts = sorted(unit for unit in dfa.alphabet if dfa.step(dfa.initial, unit) != dfa.DEAD)
+            if not starts:
+                skip = None
+            elif binary:
+                skip = re.compile(b"[" + b"".join(re.escape(bytes([unit])) for unit in starts) + b"]")
+            else:
+                skip = re.compile("[" + "".join(re.escape(unit) for unit in starts) + "]")
+            self._dfas[binary] = dfa
+            self._skip[binary] = skip
+        return self._dfas[binary], self._skip[binary]
+
+    def scan(self, data, mode: str = LEFTMOST_LONGEST) -> Iterator[Tuple[int, int]]:
+        """
+        Busca las coincidencias en un texto, bytes o mmap
+
+        Args:
+            data: str (posiciones en caracteres) o bytes/bytearray/mmap (posiciones en bytes)
+            mode: LEFTMOST_LONGEST u OVERLAPPING
+
+        Yields:
+            Pares (inicio, fin) con data[inicio:fin] en el lenguaje
+        """
+        dfa, skip = self._compiled(not isinstance(data, str))
+        if skip is None:
+            return iter(())
+        if mode == LEFTMOST_LONGEST:
+            return self._scan_longest(data, dfa, skip)
+        if mode == OVERLAPPING:
+            return self._scan_overlapping(data, dfa, skip)
+        raise ValueError(f"Modo de búsqueda desconocido: {mode}")
+
+    def scan_file(self, filename: str, mode: str = LEFTMOST_LONGEST) -> Iterator[Tuple[int, int]]:
+        """Busca las coincidencias en un archivo mapeado en memoria (posiciones en bytes)"""
+        with open(filename, 'rb') as f:
+            try:
+                data = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            except ValueError:  # Archivo vacío
+                return
+            with data:
+                yield from self.scan(data, mode)
+
+    def _scan_longest(self, data, dfa: LazyDFA, skip: re.Pattern) -> Iterator[Tuple[int, int]]:
+        """Coincidencias más a la izquierda y más largas, sin solapamiento; se reanuda en el fin de cada una"""
+        step = dfa.step
+        accepting = dfa._accepting
+        dead = dfa.DEAD
+        initial = dfa.initial
+        length = len(data)
+
+        threads: Dict[int, int] = {}  # estado del AFD → inicio más a la izquierda que lo alcanza
+        best_start = best_end = -1
+        i = 0
+        while True:
+            if i >= length:
+                if best_start < 0:
+                    return
+                # Fin del texto con una coincidencia pendiente: se informa y se sigue tras ella
+                yield best_start, best_end
+                i = best_end
+                threads = {}
+                best_start = best_end = -1
+                continue
+
+            if best_start < 0:
+                if not threads:
+                    # Ningún hilo vivo: saltar directamente al siguiente inicio posible
+                    found = skip.search(data, i)
+                    if found is None:
+                        return
+                    i = found.start()
+                if initial not in threads:
+                    threads[initial] = i
+
+            unit = data[i]
+            advanced: Dict[int, int] = {}
+            for state, start in threads.items():
+                target = step(state, unit)
+                if target != dead and (best_start < 0 or start <= best_start):
+                    previous = advanced.get(target)
+                    if previous is None or start < previous:
+                        advanced[target] = start
+            threads = advanced
+            i += 1
+
+            for state, start in threads.items():
+                if accepting[state] and (best_start < 0 or start < best_start
+                                         or (start == best_start and i > best_end)):
+                    best_start, best_end = start, i
+
+            if best_start >= 0:
+                # Los hilos que empezaron después de la mejor coincidencia ya no pueden ganar
+                threads = {state: start for state, start in threads.items() if start <= best_start}
+                if not threads:
+                    yield best_start, best_end
+                    i = best_end
+                    best_start = best_end = -1
+
+    def _scan_overlapping(self, data, dfa: LazyDFA, skip: re.Pattern) -> Iterator[Tuple[int, int]]:
+        """Todas las coincidencias, ordenadas por fin y luego por inicio"""
+        step = dfa.step
+        accepting = dfa._accepting
+        dead = dfa.DEAD
+        initial = dfa.initial
+        length = len(data)
+
+        threads: Dict[int, List[int]] = {}  # estado del AFD → inicios que lo alcanzan
+        i = 0
+        while i < length:
+            if not threads:
+                found = skip.search(data, i)
+                if found is None:
+                    return
+                i = found.start()
+            threads.setdefault(initial, []).append(i)
+
+            unit = data[i]
+            advanced: Dict[int, List[int]] = {}
+            for state, starts in threads.items():
+                target = step(state, unit)
+                if target != dead:
+                    if target in advanced:
+                        advanced[target].extend(starts)
+                    else:
+                        advanced[target] = list(starts)
+            threads = advanced
+            i += 1
+
+            for state, starts in threads.items():
+                if accepting[state]:
+                    for start in sorted(starts):
+                        yield start, i
@@ -0,0 +1,457 @@
+"""
+Módulo de serialización de árboles de derivación
+
+Formatos de texto, escritos por trozos sin construir la cadena completa y
+sin recursión (sirven para árboles de cualquier profundidad):
+    "json":  cada nodo interno es una lista [símbolo, hijo, ...] y cada hoja
+             una cadena: ["S", ["A", "a"], "b"]
+    "sexpr": expresiones S: (S (A a) b), con comillas de JSON para los
+             símbolos con espacios, paréntesis o comillas
+    "dot":   grafo de Graphviz (solo escritura)
+
+Formato binario compacto: la derivación por la izquierda como secuencia de
+códigos, uno por no terminal en preorden (0 = hoja, 1 = el símbolo deriva su
+propio texto como terminal, k + 2 = k-ésima producción de la gramática), en
+varints de 7 bits. Los terminales no se guardan: salen de las producciones.
+El primer código indica cómo cuelgan los terminales: 0 = como hojas (motores
+Tipo 3), 1 = cada uno con una hoja de su mismo texto (motores Tipo 2).
+DerivationWriter guarda muchos árboles en un archivo con la huella de la
+gramática en la cabecera; read_derivations los recupera.
+
+Ejemplo:
+    text = dumps(tree, "sexpr")
+    same = loads(text, "sexpr")
+    data = encode_derivation(tree, grammar)
+    same = decode_derivation(data, grammar)
+"""
+
+from typing import BinaryIO, Dict, Iterable, Iterator, List, NamedTuple, Optional, TextIO, Tuple
+from array import array
+from functools import lru_cache
+from json.decoder import scanstring
+import json
+
+from .grammar import FrozenGrammar, Grammar
+from .parser import split_production
+from .tree import DerivationTree, TreeNode
+
+
+FORMATS = ("json", "sexpr", "dot")
+
+# Tamaño aproximado de cada trozo que producen los escritores
+CHUNK_SIZE = 1 << 16
+
+# Cabecera de los archivos de derivaciones: marca, versión y huella SHA-256 de la gramática
+MAGIC = b"GDRV"
+VERSION = 1
+
+# Códigos de la derivación que no son producciones
+LEAF = 0
+SELF_TERMINAL = 1
+FIRST_PRODUCTION = 2
+
+# Primer código: forma de los nodos terminales del árbol
+TERMINALS_BARE = 0
+TERMINALS_WRAPPED = 1
+
+_OPEN, _LEAF, _CLOSE = range(3)
+
+
+def _walk(root: TreeNode) -> Iterator[Tuple[int, Optional[TreeNode], bool]]:
+    """Recorre el árbol en preorden: (apertura | hoja | cierre, nodo, es_raíz)"""
+    stack: List[Tuple[Optional[TreeNode], bool]] = [(root, True)]
+    while stack:
+        node, is_root = stack.pop()
+        if node is None:
+            yield _CLOSE, None, False
+        elif node.children:
+            yield _OPEN, node, is_root
+            stack.append((None, False))
+            children = node.children
+            for index in range(len(children) - 1, -1, -1):
+                stack.append((children[index], False))
+        else:
+            yield _LEAF, node, is_root
+
+
+def _chunked(pieces: Iterable[str], size: int = CHUNK_SIZE) -> Iterator[str]:
+    """Agrupa trozos pequeños en trozos de unos `size` caracteres"""
+    buffer: List[str] = []
+    length = 0
+    for piece in pieces:
+        buffer.append(piece)
+        length += len(piece)
+        if length >= size:
+            yield "".join(buffer)
+            buffer.clear()
+            length = 0
+    if buffer:
+        yield "".join(buffer)
+
+
+def _quote(symbol: str) -> str:
+    return json.dumps(symbol, ensure_ascii=False)
+
+
+def _json_pieces(tree: DerivationTree) -> Iterator[str]:
+    for kind, node, is_root in _walk(tree.root):
+        if kind == _CLOSE:
+            yield "]"
+            continue
+        if not is_root:
+            yield ","
+        yield "[" + _quote(node.symbol) if kind == _OPEN else _quote(node.symbol)
+
+
+_SEXPR_SPECIAL = frozenset(' \t\r\n()";')
+
+
+def _atom(symbol: str) -> str:
+    """Símbolo tal cual, o entre comillas si contiene caracteres especiales (o es vacío)"""
+    if symbol and not any(char in _SEXPR_SPECIAL for char in symbol):
+        return symbol
+    return _quote(symbol)
+
+
+def _sexpr_pieces(tree: DerivationTree) -> Iterator[str]:
+    for kind, node, is_root in _walk(tree.root):
+        if kind == _CLOSE:
+            yield ")"
+            continue
+        if not is_root:
+            yield " "
+        yield "(" + _atom(node.symbol) if kind == _OPEN else _atom(node.symbol)
+
+
+def _dot_pieces(tree: DerivationTree) -> Iterator[str]:
+    yield "digraph derivacion {\n  node [shape=ellipse];\n"
+    parents: List[int] = []
+    count = 0
+    for kind, node, _ in _walk(tree.root):
+        if kind == _CLOSE:
+            parents.pop()
+            continue
+        shape = "" if kind == _OPEN else ", shape=plaintext"
+        yield f"  n{count} [label={_quote(node.symbol)}{shape}];\n"
+        if parents:
+            yield f"  n{parents[-1]} -> n{count};\n"
+        if kind == _OPEN:
+            parents.append(count)
+        count += 1
+    yield "}\n"
+
+
+_WRITERS = {"json": _json_pieces, "sexpr": _sexpr_pieces, "dot": _dot_pieces}
+
+
+def iter_format(tree: DerivationTree, fmt: str = "json") -> Iterator[str]:
+    """
+    Trozos del árbol en el formato indicado, de unos CHUNK_SIZE caracteres
+
+    Raises:
+        ValueError: Si el formato no existe
+    """
+    if fmt not in _WRITERS:
+        raise ValueError(f"Formato desconocido: {fmt} (se admiten {', '.join(FORMATS)})")
+    return _chunked(_WRITERS[fmt](tree))
+
+
+def dump(tree: DerivationTree, stream: TextIO, fmt: str = "json"):
+    """Escribe el árbol en un flujo de texto, trozo a trozo"""
+    for chunk in iter_format(tree, fmt):
+        stream.write(chunk)
+
+
+def dumps(tree: DerivationTree, fmt: str = "json") -> str:
+    """El árbol como cadena en el formato indicado"""
+    return "".join(iter_format(tree, fmt))
+
+
+def _load_nested(text: str, fmt: str) -> DerivationTree:
+    """Reconstruye un árbol de JSON o de expresiones S sin recursión"""
+    opening, closing = ("[", "]") if fmt == "json" else ("(", ")")
+    separators = " \t\r\n," if fmt == "json" else " \t\r\n"
+    stack: List[TreeNode] = []
+    root: Optional[TreeNode] = None
+    opened = False  # el siguiente símbolo es el de un nodo recién abierto
+    position = 0
+    length = len(text)
+    while position < length:
+        char = text[position]
+        if char in separators:
+            position += 1
+            continue
+        if char == opening:
+            if opened:
+                raise ValueError(f"posición {position}: falta el símbolo del nodo")
+            opened = True
+            position += 1
+            continue
+        if char == closing:
+            if opened or not stack:
+                raise ValueError(f"posición {position}: '{closing}' inesperado")
+            stack.pop()
+            position += 1
+            continue
+        if char == '"':
+            symbol, position = scanstring(text, position + 1)
+        elif fmt == "sexpr":
+            end = position
+            while end < length and text[end] not in _SEXPR_SPECIAL:
+                end += 1
+            symbol, position = text[position:end], end
+        else:
+            raise ValueError(f"posición {position}: carácter inesperado {char!r}")
+
+        node = TreeNode(symbol)
+        if stack:
+            stack[-1].add_child(node)
+        elif root is None:
+            root = node
+        else:
+            raise ValueError(f"posición {position}: hay más de un árbol")
+        if opened:
+            stack.append(node)
+            opened = False
+    if root is None or stack or opened:
+        raise ValueError("el árbol está incompleto")
+    return DerivationTree(root)
+
+
+def loads(text: str, fmt: str = "json") -> DerivationTree:
+    """
+    Reconstruye un árbol escrito con dumps
+
+    Raises:
+        ValueError: Si el texto no es válido o el formato no se puede cargar (DOT)
+    """
+    if fmt == "dot":
+        raise ValueError("El formato DOT solo se puede escribir")
+    if fmt not in _WRITERS:
+        raise ValueError(f"Formato desconocido: {fmt} (se admiten {', '.join(FORMATS)})")
+    return _load_nested(text, fmt)
+
+
+def load(stream: TextIO, fmt: str = "json") -> DerivationTree:
+    """Reconstruye un árbol de un flujo de texto escrito con dump"""
+    return loads(stream.read(), fmt)
+
+
+# Derivación por la izquierda
+class _ProductionTable(NamedTuple):
+    """Producciones numeradas en el orden de la gramática"""
+    productions: List[Tuple[str, Tuple[str, ...]]]  # índice → (izquierdo, símbolos)
+    index: Dict[Tuple[str, Tuple[str, ...]], int]  # (izquierdo, símbolos) → primer índice
+    non_terminals: frozenset  # símbolos con producciones
+    terminals: frozenset
+
+
+@lru_cache(maxsize=16)
+def _production_table(grammar: FrozenGrammar) -> _ProductionTable:
+    sorted_non_terminals = sorted(grammar.non_terminals, key=len, reverse=True)
+    sorted_terminals = sorted(grammar.terminals, key=len, reverse=True)
+    productions = []
+    index: Dict[Tuple[str, Tuple[str, ...]], int] = {}
+    for left, rights in grammar.productions.items():
+        for right in rights:
+            # '' y 'ε' son la misma producción; los motores la dibujan con una hoja ε
+            symbols = tuple(split_production(right, sorted_non_terminals, sorted_terminals)) or ('ε',)
+            key = (left, symbols)
+            index.setdefault(key, len(productions))
+            productions.append(key)
+    return _ProductionTable(productions, index, frozenset(grammar.productions), frozenset(grammar.terminals))
+
+
+def leftmost_derivation(tree: DerivationTree, grammar: Grammar) -> array:
+    """
+    Códigos de la derivación por la izquierda del árbol (ver el formato en el módulo)
+
+    Raises:
+        ValueError: Si algún nodo no corresponde a una producción de la gramática
+    """
+    table = _production_table(grammar.freeze())
+    if tree.root.symbol != grammar.start_symbol:
+        raise ValueError(f"La raíz {tree.root.symbol!r} no es el símbolo inicial de la gramática")
+    codes = array('L', [TERMINALS_BARE])
+    style: Optional[int] = None
+    stack = [tree.root]
+    while stack:
+        node = stack.pop()
+        children = node.children
+        if not children:
+            codes.append(LEAF)
+            continue
+        if len(children) == 1 and not children[0].children and children[0].symbol == node.symbol \
+                and node.symbol in table.terminals:
+            codes.append(SELF_TERMINAL)
+            continue
+        key = (node.symbol, tuple(child.symbol for child in children))
+        production = table.index.get(key)
+        if production is None:
+            raise ValueError(f"El nodo {node.symbol} → {' '.join(key[1])} no corresponde a ninguna producción")
+        codes.append(production + FIRST_PRODUCTION)
+        for index in range(len(children) - 1, -1, -1):
+            child = children[index]
+            if child.symbol in table.non_terminals:
+                stack.append(child)
+                continue
+            if child.symbol not in table.terminals:  # ε
+                shape = TERMINALS_BARE if not child.children else None
+            elif not child.children:
+                shape = TERMINALS_BARE
+            elif len(child.children) == 1 and not child.children[0].children \
+                    and child.children[0].symbol == child.symbol:
+                shape = TERMINALS_WRAPPED
+            else:
+                shape = None
+            if shape is None:
+                raise ValueError(f"El terminal {child.symbol!r} tiene hijos")
+            if child.symbol in table.terminals:
+                if style is None:
+                    style = shape
+                elif style != shape:
+                    raise ValueError(f"El terminal {child.symbol!r} no cuelga igual que los demás")
+    if style is not None:
+        codes[0] = style
+    return codes
+
+
+def tree_from_derivation(codes: Iterable[int], grammar: Grammar) -> DerivationTree:
+    """
+    Reconstruye el árbol a partir de los códigos de leftmost_derivation
+
+    Raises:
+        ValueError: Si los códigos no forman una derivación de la gramática
+    """
+    table = _production_table(grammar.freeze())
+    root = TreeNode(grammar.start_symbol)
+    stack = [root]
+    codes = iter(codes)
+    style = next(codes, None)
+    if style not in (TERMINALS_BARE, TERMINALS_WRAPPED):
+        raise ValueError(f"Forma de los terminales desconocida: {style}")
+    for code in codes:
+        if not stack:
+            raise ValueError("Sobran códigos al final de la derivación")
+        node = stack.pop()
+        if code == LEAF:
+            continue
+        if code == SELF_TERMINAL:
+            node.add_child(TreeNode(node.symbol))
+            continue
+        if not FIRST_PRODUCTION <= code < len(table.productions) + FIRST_PRODUCTION:
+            raise ValueError(f"Código de producción fuera de rango: {code}")
+        left, symbols = table.productions[code - FIRST_PRODUCTION]
+        if left != node.symbol:
+            raise ValueError(f"La producción {code - FIRST_PRODUCTION} expande {left}, no {node.symbol}")
+        children = [TreeNode(symbol) for symbol in symbols]
+        node.children.extend(children)
+        for child in reversed(children):
+            if child.symbol in table.non_terminals:
+                stack.append(child)
+            elif style == TERMINALS_WRAPPED and child.symbol in table.terminals:
+                child.add_child(TreeNode(child.symbol))
+    if stack:
+        raise ValueError("La derivación está incompleta")
+    return DerivationTree(root)
+
+
+def pack_varints(values: Iterable[int]) -> bytes:
+    """Enteros no negativos en varints de 7 bits (LEB128)"""
+    data = bytearray()
+    for value in values:
+        while value >= 0x80:
+            data.append(value & 0x7F | 0x80)
+            value >>= 7
+        data.append(value)
+    return bytes(data)
+
+
+def unpack_varints(data: bytes) -> Iterator[int]:
+    """Enteros de pack_varints"""
+    value = 0
+    shift = 0
+    for byte in data:
+        value |= (byte & 0x7F) << shift
+        if byte & 0x80:
+            shift += 7
+        else:
+            yield value
+            value = 0
+            shift = 0
+    if shift:
+        raise ValueError("Varint incompleto al final de los datos")
+
+
+def encode_derivation(tree: DerivationTree, grammar: Grammar) -> bytes:
+    """Derivación por la izquierda del árbol, empaquetada en varints"""
+    return pack_varints(leftmost_derivation(tree, grammar))
+
+
+def decode_derivation(data: bytes, grammar: Grammar) -> DerivationTree:
+    """Árbol a partir de los bytes de encode_derivation"""
+    return tree_from_derivation(unpack_varints(data), grammar)
+
+
+class DerivationWriter:
+    """
+    Escribe muchos resultados de análisis en un flujo binario
+
+    Cada registro es la longitud (varint) seguida de la derivación; un
+    registro vacío es una cadena rechazada (None).
+
+    Ejemplo:
+        with open("resultados.gdrv", "wb") as f:
+            writer = DerivationWriter(f, grammar)
+            for accepted, result in results:
+                writer.write(result if accepted else None)
+    """
+
+    def __init__(self, stream: BinaryIO, grammar: Grammar):
+        self.stream = stream
+        self.grammar = grammar.freeze()
+        self.count = 0
+        stream.write(MAGIC + bytes([VERSION]) + bytes.fromhex(self.grammar.fingerprint))
+
+    def write(self, tree: Optional[DerivationTree]):
+        """Añade un árbol (o None para una cadena rechazada)"""
+        data = b"" if tree is None else encode_derivation(tree, self.grammar)
+        self.stream.write(pack_varints((len(data),)) + data)
+        self.count += 1
+
+
+def read_derivations(stream: BinaryIO, grammar: Grammar) -> Iterator[Optional[DerivationTree]]:
+    """
+    Recupera los árboles escritos con DerivationWriter (None para los rechazos)
+
+    Raises:
+        ValueError: Si el flujo no es un archivo de derivaciones o se escribió con otra gramática
+    """
+    frozen = grammar.freeze()
+    header = stream.read(len(MAGIC) + 33)
+    if header[:len(MAGIC)] != MAGIC or len(header) < len(MAGIC) + 33:
+        raise ValueError("No es un archivo de derivaciones")
+    if header[len(MAGIC)] != VERSION:
+        raise ValueError(f"Versión de archivo de derivaciones no admitida: {header[len(MAGIC)]}")
+    if header[len(MAGIC) + 1:].hex() != frozen.fingerprint:
+        raise ValueError("El archivo se escribió con otra gramática (la huella no coincide)")
+
+    data = stream.read()
+    view = memoryview(data)
+    position = 0
+    while position < len(data):
+        length = 0
+        shift = 0
+        while True:
+            if position >= len(data):
+                raise ValueError("Registro incompleto al final del archivo")
+            byte = data[position]
+            position += 1
+            length |= (byte & 0x7F) << shift
+            if not byte & 0x80:
+                break
+            shift += 7
+        if position + length > len(data):
+            raise ValueError("Registro incompleto al final del archivo")
+        yield decode_derivation(view[position:position + length], frozen) if length else None
+        position += length
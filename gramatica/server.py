@@ -0,0 +1,460 @@
+"""
+Servidor de reconocimiento por JSON delimitado por líneas (asyncio)
+
+Permite que otros servicios locales consulten la pertenencia de cadenas sin
+lanzar un proceso de Python por petición. Escucha en un socket Unix o en TCP
+local; cada línea es una petición y cada respuesta otra línea:
+
+    → {"id": 1, "grammar": "expr", "strings": ["a+b", "a+"], "deadline": 0.5}
+    ← {"id": 1, "results": [true, false]}
+
+Cada resultado es true/false, o null si se agotó el plazo antes de decidir
+(como en parse_batch), o {"error": ...} si el análisis de esa cadena falló;
+las demás cadenas de la petición se responden igual. Los errores de la
+petición (gramática desconocida, formato inválido) se responden con
+{"id": ..., "error": ...}.
+
+Las gramáticas se cargan una sola vez al arrancar (Grammar.load_from_file) y
+se congelan (Grammar.freeze): así viajan a los trabajadores como tuplas y cada
+proceso construye un solo parser por contenido, aunque varios identificadores
+apunten a la misma gramática.
+Todas las cadenas se analizan en el grupo de procesos, de modo que un lote
+grande nunca bloquea el bucle de eventos; las gramáticas Tipo 3 usan su
+propio motor (el recomendado o el autómata) y no el de --motor.
+
+Se admite encadenar peticiones sin esperar respuesta (las respuestas llegan en
+el orden en que terminan, identificadas por "id"). Cada conexión tiene un
+máximo de peticiones en curso: al alcanzarlo se deja de leer del socket, y el
+control de flujo del sistema operativo frena al cliente.
+
+Uso:
+    python -m gramatica.server --gramatica expr=punto2.json --socket /tmp/gramaticas.sock
+    python -m gramatica.server --gramatica punto2.json --puerto 8765
+"""
+
+from typing import Dict, List, Optional, Set, Tuple, Union
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+import argparse
+import asyncio
+import json
+import os
+import sys
+import time
+
+from .grammar import FrozenGrammar, Grammar
+from .parser import Parser, cached_parser, create_parser
+from .budget import Budget, BudgetExceeded
+
+
+# Longitud máxima de una línea (petición o respuesta)
+MAX_LINE = 16 * 1024 * 1024
+
+# Cadenas por tarea enviada al grupo de procesos: los lotes grandes se reparten entre trabajadores
+CHUNK_SIZE = 256
+
+
+class ServerError(Exception):
+    """Error devuelto por el servidor a una petición"""
+
+
+# Resultado de una cadena: aceptada, rechazada, None si venció el plazo o {"error": motivo}
+Result = Union[bool, None, Dict[str, str]]
+
+
+# Trabajadores: cada proceso construye sus parsers una sola vez al arrancar
+_worker_parsers: Dict[str, Parser] = {}
+
+
+def _engine_for(grammar: FrozenGrammar, engine: str) -> str:
+    """Motor de una gramática: el pedido para las Tipo 2 y el automático para las Tipo 3"""
+    return "auto" if grammar.type == "Tipo 3" else engine
+
+
+def _init_worker(grammars: Dict[str, FrozenGrammar], engine: str):
+    """Inicializa un proceso trabajador con las gramáticas ya cargadas"""
+    for grammar_id, grammar in grammars.items():
+        _worker_parsers[grammar_id] = cached_parser(grammar, _engine_for(grammar, engine), mode="recognize")
+
+
+def _recognize_all(parser: Parser, strings: List[str], deadline: Optional[float]) -> List[Result]:
+    """
+    Decide la pertenencia de cada cadena antes del plazo
+
+    Args:
+        deadline: Instante límite según time.monotonic (común a todos los procesos), o None
+
+    Returns:
+        True/False por cadena, None si el plazo se agotó antes de decidirla
+        o {"error": motivo} si el parser falló con ella
+    """
+    results: List[Result] = []
+    for string in strings:
+        budget = None
+        if deadline is not None:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                results.append(None)
+                continue
+            budget = Budget(timeout=remaining)
+        try:
+            results.append(parser.recognize(string, budget))
+        except BudgetExceeded:
+            results.append(None)
+        except Exception as e:  # Solo falla esta cadena; las demás del lote siguen
+            results.append({"error": f"{type(e).__name__}: {e}"})
+    return results
+
+
+def _recognize_in_worker(grammar_id: str, strings: List[str], deadline: Optional[float]) -> List[Result]:
+    """Tarea ejecutada en un proceso trabajador"""
+    return _recognize_all(_worker_parsers[grammar_id], strings, deadline)
+
+
+class ParseServer:
+    """
+    Servidor asyncio de reconocimiento con un grupo de procesos
+
+    Ejemplo:
+        server = ParseServer({"expr": "punto2.json"})
+        await server.start(path="/tmp/gramaticas.sock")
+        await server.serve_forever()
+    """
+
+    def __init__(self, grammars: Dict[str, str], workers: Optional[int] = None, max_in_flight: int = 64,
+                 default_deadline: Optional[float] = None, engine: str = "auto"):
+        """
+        Args:
+            grammars: Identificador → ruta del archivo JSON de la gramática
+            workers: Procesos trabajadores (por defecto, uno por CPU)
+            max_in_flight: Peticiones en curso por conexión antes de dejar de leer
+            default_deadline: Plazo en segundos para las peticiones que no indican uno
+            engine: Motor de create_parser para las gramáticas Tipo 2
+
+        Raises:
+            ValueError: Si alguna gramática es inválida o el motor no existe o no se le aplica
+        """
+        self.grammars: Dict[str, FrozenGrammar] = {
+            grammar_id: Grammar.load_from_file(path).freeze() for grammar_id, path in grammars.items()
+        }
+        for grammar_id, grammar in self.grammars.items():
+            is_valid, message = grammar.validate()
+            if not is_valid:
+                raise ValueError(f"Gramática '{grammar_id}' inválida: {message}")
+            # Un motor desconocido falla aquí, y no al arrancar cada trabajador
+            create_parser(grammar, _engine_for(grammar, engine), mode="recognize")
+
+        self.workers = workers or os.cpu_count() or 1
+        self.max_in_flight = max_in_flight
+        self.default_deadline = default_deadline
+        self.engine = engine
+        self._pool: Optional[ProcessPoolExecutor] = None
+        self._pool_slots: Optional[asyncio.Semaphore] = None
+        self._server: Optional[asyncio.AbstractServer] = None
+        # Conexión abierta → (escritor, peticiones en curso)
+        self._connections: Dict[asyncio.Task, Tuple[asyncio.StreamWriter, Set[asyncio.Task]]] = {}
+
+    async def start(self, path: Optional[str] = None, host: str = "127.0.0.1", port: int = 0):
+        """
+        Empieza a escuchar en un socket Unix (si se da path) o en TCP local
+
+        Returns:
+            La ruta del socket, o (host, puerto) con el puerto realmente asignado
+        """
+        self._pool = self._new_pool()
+        # Acota las tareas encoladas en el grupo: las demás esperan sin leer más peticiones
+        self._pool_slots = asyncio.Semaphore(self.workers * 2)
+
+        if path is not None:
+            if os.path.exists(path):
+                os.unlink(path)
+            self._server = await asyncio.start_unix_server(self._handle_connection, path, limit=MAX_LINE)
+            return path
+        self._server = await asyncio.start_server(self._handle_connection, host, port, limit=MAX_LINE)
+        return self._server.sockets[0].getsockname()[:2]
+
+    def _new_pool(self) -> ProcessPoolExecutor:
+        """Grupo de procesos con un parser por gramática"""
+        return ProcessPoolExecutor(self.workers, initializer=_init_worker, initargs=(self.grammars, self.engine))
+
+    async def serve_forever(self):
+        """Atiende conexiones hasta que se cancele"""
+        await self._server.serve_forever()
+
+    async def close(self):
+        """Deja de aceptar conexiones, cierra las abiertas y detiene los trabajadores"""
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+        # Cerrar el socket hace que la lectura termine; las peticiones en curso se abandonan
+        for writer, tasks in list(self._connections.values()):
+            writer.close()
+            for task in tasks:
+                task.cancel()
+        await asyncio.gather(*self._connections, return_exceptions=True)
+        if self._pool is not None:
+            self._pool.shutdown(cancel_futures=True)
+            self._pool = None
+
+    async def __aenter__(self) -> 'ParseServer':
+        return self
+
+    async def __aexit__(self, exc_type, exc_value, traceback):
+        await self.close()
+        return False
+
+    async def _handle_connection(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        """Lee peticiones de una conexión y las atiende en paralelo"""
+        in_flight = asyncio.Semaphore(self.max_in_flight)
+        write_lock = asyncio.Lock()
+        tasks: Set[asyncio.Task] = set()
+        self._connections[asyncio.current_task()] = (writer, tasks)
+        try:
+            while True:
+                # Con el máximo de peticiones en curso no se lee más: el cliente queda frenado
+                await in_flight.acquire()
+                try:
+                    line = await reader.readline()
+                except ValueError:
+                    in_flight.release()
+                    await self._send(writer, write_lock, {"id": None, "error": "Línea demasiado larga"})
+                    break
+                if not line:
+                    in_flight.release()
+                    break
+                task = asyncio.create_task(self._serve_request(line, writer, write_lock, in_flight))
+                tasks.add(task)
+                task.add_done_callback(tasks.discard)
+            # El cliente cerró su lado: terminar las respuestas pendientes
+            if tasks:
+                await asyncio.gather(*tasks, return_exceptions=True)
+        except ConnectionError:
+            pass
+        finally:
+            for task in tasks:
+                task.cancel()
+            self._connections.pop(asyncio.current_task(), None)
+            writer.close()
+            try:
+                await writer.wait_closed()
+            except ConnectionError:
+                pass
+
+    async def _serve_request(self, line: bytes, writer: asyncio.StreamWriter, write_lock: asyncio.Lock,
+                             in_flight: asyncio.Semaphore):
+        """Atiende una petición y escribe su respuesta"""
+        received = time.monotonic()
+        request_id = None
+        try:
+            request = json.loads(line)
+            if not isinstance(request, dict):
+                raise ValueError("La petición debe ser un objeto JSON")
+            request_id = request.get("id")
+            response = {"id": request_id, "results": await self._recognize(request, received)}
+        except KeyError as e:
+            response = {"id": request_id, "error": str(e.args[0])}  # str(e) añadiría comillas
+        except (ValueError, TypeError) as e:
+            response = {"id": request_id, "error": str(e)}
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:  # Un fallo interno (o un trabajador caído) también tiene respuesta
+            response = {"id": request_id, "error": f"Error interno: {type(e).__name__}: {e}"}
+        finally:
+            in_flight.release()
+        await self._send(writer, write_lock, response)
+
+    async def _recognize(self, request: dict, received: float) -> List[Result]:
+        """Reparte las cadenas de una petición entre los trabajadores"""
+        grammar_id = request.get("grammar")
+        if grammar_id not in self.grammars:
+            raise KeyError(f"Gramática desconocida: {grammar_id}")
+        strings = request["strings"] if "strings" in request else [request["string"]]
+        if not isinstance(strings, list):
+            raise TypeError("\"strings\" debe ser una lista de cadenas")
+        if not all(isinstance(string, str) for string in strings):
+            raise TypeError("Las cadenas deben ser texto")
+
+        seconds = request.get("deadline", self.default_deadline)
+        deadline = received + float(seconds) if seconds is not None else None
+
+        chunks = [strings[i:i + CHUNK_SIZE] for i in range(0, len(strings), CHUNK_SIZE)]
+        outcomes = await asyncio.gather(*(self._submit(grammar_id, chunk, deadline) for chunk in chunks),
+                                        return_exceptions=True)
+        results: List[Result] = []
+        for chunk, outcome in zip(chunks, outcomes):
+            if isinstance(outcome, asyncio.CancelledError):
+                raise outcome
+            if isinstance(outcome, BaseException):
+                # Un lote perdido (p. ej. un trabajador caído) solo afecta a sus cadenas
+                outcome = [{"error": f"Error interno: {type(outcome).__name__}: {outcome}"}] * len(chunk)
+            results.extend(outcome)
+        return results
+
+    async def _submit(self, grammar_id: str, strings: List[str], deadline: Optional[float]) -> List[Result]:
+        """Envía un lote al grupo de procesos cuando hay hueco"""
+        async with self._pool_slots:
+            if deadline is not None and time.monotonic() >= deadline:
+                return [None] * len(strings)  # El plazo venció esperando turno
+            loop = asyncio.get_running_loop()
+            pool = self._pool
+            try:
+                return await loop.run_in_executor(pool, _recognize_in_worker, grammar_id, strings, deadline)
+            except BrokenProcessPool:
+                # Un trabajador murió y el grupo ya no admite tareas: se sustituye para las siguientes
+                if self._pool is pool:
+                    pool.shutdown(wait=False)
+                    self._pool = self._new_pool()
+                raise
+
+    @staticmethod
+    async def _send(writer: asyncio.StreamWriter, write_lock: asyncio.Lock, response: dict):
+        """Escribe una respuesta respetando el control de flujo del socket"""
+        data = json.dumps(response, ensure_ascii=False).encode('utf-8') + b"\n"
+        async with write_lock:
+            if writer.is_closing():
+                return
+            writer.write(data)
+            await writer.drain()
+
+
+class ParseClient:
+    """
+    Cliente asyncio del servidor que admite varias peticiones en curso a la vez
+
+    Ejemplo:
+        client = await ParseClient.connect(path="/tmp/gramaticas.sock")
+        results = await client.recognize("expr", ["a+b", "a+"])
+        await client.close()
+    """
+
+    def __init__(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        self._reader = reader
+        self._writer = writer
+        self._next_id = 0
+        self._pending: Dict[int, asyncio.Future] = {}
+        self._receiver = asyncio.create_task(self._receive())
+
+    @classmethod
+    async def connect(cls, path: Optional[str] = None, host: str = "127.0.0.1",
+                      port: Optional[int] = None) -> 'ParseClient':
+        """Conecta por socket Unix (si se da path) o por TCP"""
+        if path is not None:
+            reader, writer = await asyncio.open_unix_connection(path, limit=MAX_LINE)
+        else:
+            reader, writer = await asyncio.open_connection(host, port, limit=MAX_LINE)
+        return cls(reader, writer)
+
+    async def recognize(self, grammar_id: str, strings: List[str],
+                        deadline: Optional[float] = None) -> List[Union[bool, None, ServerError]]:
+        """
+        Envía una petición y espera su respuesta
+
+        Args:
+            grammar_id: Identificador de la gramática en el servidor
+            strings: Cadenas a reconocer
+            deadline: Plazo en segundos desde que el servidor recibe la petición
+
+        Returns:
+            True/False por cadena, None si se agotó el plazo antes de decidirla
+            o un ServerError (no lanzado) si el análisis de esa cadena falló
+
+        Raises:
+            ServerError: Si el servidor rechazó la petición
+        """
+        self._next_id += 1
+        request_id = self._next_id
+        request = {"id": request_id, "grammar": grammar_id, "strings": strings}
+        if deadline is not None:
+            request["deadline"] = deadline
+
+        future = asyncio.get_running_loop().create_future()
+        self._pending[request_id] = future
+        self._writer.write(json.dumps(request, ensure_ascii=False).encode('utf-8') + b"\n")
+        await self._writer.drain()
+        response = await future
+        if "error" in response:
+            raise ServerError(response["error"])
+        return [ServerError(result["error"]) if isinstance(result, dict) else result
+                for result in response["results"]]
+
+    async def _receive(self):
+        """Reparte las respuestas entre las peticiones que las esperan"""
+        error: Exception = ConnectionError("Conexión cerrada por el servidor")
+        try:
+            while True:
+                line = await self._reader.readline()
+                if not line:
+                    break
+                response = json.loads(line)
+                future = self._pending.pop(response.get("id"), None)
+                if future is not None and not future.done():
+                    future.set_result(response)
+                elif response.get("id") is None and "error" in response:
+                    error = ServerError(response["error"])
+                    break
+        except (ConnectionError, ValueError) as e:
+            error = e
+        finally:
+            for future in self._pending.values():
+                if not future.done():
+                    future.set_exception(error)
+            self._pending.clear()
+
+    async def close(self):
+        """Cierra la conexión"""
+        self._writer.close()
+        try:
+            await self._writer.wait_closed()
+        except ConnectionError:
+            pass
+        self._receiver.cancel()
+        try:
+            await self._receiver
+        except asyncio.CancelledError:
+            pass
+
+    async def __aenter__(self) -> 'ParseClient':
+        return self
+
+    async def __aexit__(self, exc_type, exc_value, traceback):
+        await self.close()
+        return False
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Punto de entrada de línea de comandos"""
+    arg_parser = argparse.ArgumentParser(description="Servidor de reconocimiento por JSON delimitado por líneas")
+    arg_parser.add_argument("--gramatica", action="append", required=True,
+                            help="id=ruta.json (o solo ruta.json, con el nombre del archivo como id)")
+    arg_parser.add_argument("--socket", help="Ruta del socket Unix")
+    arg_parser.add_argument("--host", default="127.0.0.1")
+    arg_parser.add_argument("--puerto", type=int, default=8765)
+    arg_parser.add_argument("--procesos", type=int, help="Procesos trabajadores (uno por CPU por defecto)")
+    arg_parser.add_argument("--en-curso", type=int, default=64, help="Peticiones en curso por conexión")
+    arg_parser.add_argument("--plazo", type=float, help="Plazo por defecto en segundos")
+    arg_parser.add_argument("--motor", default="auto", help="Motor para las gramáticas Tipo 2")
+    args = arg_parser.parse_args(argv)
+
+    grammars = {}
+    for item in args.gramatica:
+        grammar_id, _, path = item.rpartition("=")
+        grammars[grammar_id or os.path.splitext(os.path.basename(path))[0]] = path
+
+    async def run():
+        async with ParseServer(grammars, args.procesos, args.en_curso, args.plazo, args.motor) as server:
+            address = await server.start(args.socket, args.host, args.puerto)
+            print(f"Escuchando en {address} con las gramáticas: {', '.join(grammars)}")
+            await server.serve_forever()
+
+    try:
+        asyncio.run(run())
+    except ValueError as e:  # Gramática inválida o motor desconocido
+        print(f"Error: {e}", file=sys.stderr)
+        return 2
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,125 @@
+"""
+Módulo de instrumentación de los parsers: contadores, tiempos por fase
+y ganchos para trazadores o perfiladores externos
+"""
+
+from typing import Callable, Dict, List, Optional, Tuple
+from collections import Counter
+from contextlib import contextmanager
+import time
+
+
+class ParseStats:
+    """
+    Estadísticas acumuladas de una o varias llamadas a Parser.parse
+
+    El mismo objeto puede pasarse a muchas llamadas (por ejemplo en un lote)
+    y los contadores se suman; merge() combina estadísticas de lotes distintos.
+    """
+
+    # Contadores enteros que todos los motores pueden incrementar
+    COUNTERS = (
+        'recursive_calls',  # llamadas recursivas del parser descendente
+        'backtracks',       # alternativas (producciones) que fallaron
+        'memo_hits',        # resultados reutilizados desde una tabla de memoización
+        'tokens_matched',   # terminales reconocidos en la entrada
+        'states_visited',   # estados del autómata o ítems de la tabla visitados
+        'nodes_allocated',  # nodos TreeNode creados
+        'pruned_branches',  # alternativas descartadas sin explorar (cotas de longitud o primer carácter)
+    )
+
+    def __init__(self, tracer: Optional[Callable[..., None]] = None, profiler=None):
+        """
+        Args:
+            tracer: Función opcional llamada como tracer(evento, *datos) en cada
+                evento del parser ("llamada", "retroceso", "poda", "token", "fase")
+            profiler: Perfilador opcional con métodos enable()/disable()
+                (por ejemplo cProfile.Profile()), activo solo durante parse
+        """
+        self.tracer = tracer
+        self.profiler = profiler
+        self.parses = 0
+        for name in self.COUNTERS:
+            setattr(self, name, 0)
+        self.phase_times: Dict[str, float] = {}  # fase → segundos
+        self.production_uses: Counter = Counter()  # (izquierdo, derecho) → intentos
+        self.production_failures: Counter = Counter()  # (izquierdo, derecho) → fallos
+
+    def trace(self, event: str, *data):
+        """Notifica un evento al trazador externo, si existe"""
+        if self.tracer is not None:
+            self.tracer(event, *data)
+
+    def add_time(self, phase: str, seconds: float):
+        """Acumula tiempo en una fase"""
+        self.phase_times[phase] = self.phase_times.get(phase, 0.0) + seconds
+
+    @contextmanager
+    def phase(self, name: str):
+        """Mide el tiempo de un bloque y lo acumula en la fase indicada"""
+        self.trace('fase', name, 'inicio')
+        started = time.perf_counter()
+        try:
+            yield self
+        finally:
+            self.add_time(name, time.perf_counter() - started)
+            self.trace('fase', name, 'fin')
+
+    @contextmanager
+    def measure(self):
+        """Delimita una llamada completa a parse (cuenta la llamada y activa el perfilador)"""
+        self.parses += 1
+        if self.profiler is not None:
+            self.profiler.enable()
+        try:
+            yield self
+        finally:
+            if self.profiler is not None:
+                self.profiler.disable()
+
+    def merge(self, other: 'ParseStats') -> 'ParseStats':
+        """Suma en este objeto las estadísticas de otro y lo devuelve"""
+        self.parses += other.parses
+        for name in self.COUNTERS:
+            setattr(self, name, getattr(self, name) + getattr(other, name))
+        for phase, seconds in other.phase_times.items():
+            self.add_time(phase, seconds)
+        self.production_uses.update(other.production_uses)
+        self.production_failures.update(other.production_failures)
+        return self
+
+    def hot_productions(self, count: int = 10) -> List[Tuple[Tuple[str, str], int, int]]:
+        """
+        Producciones más intentadas
+
+        Returns:
+            Lista de ((izquierdo, derecho), intentos, fallos) ordenada por intentos
+        """
+        return [(production, uses, self.production_failures[production])
+                for production, uses in self.production_uses.most_common(count)]
+
+    def to_dict(self) -> dict:
+        """Convierte las estadísticas a un diccionario serializable a JSON"""
+        result = {'parses': self.parses}
+        for name in self.COUNTERS:
+            result[name] = getattr(self, name)
+        result['phase_times'] = dict(self.phase_times)
+        result['hot_productions'] = [
+            {'left': left, 'right': right, 'uses': uses, 'failures': failures}
+            for (left, right), uses, failures in self.hot_productions()
+        ]
+        return result
+
+    def __str__(self):
+        """Resumen legible de las estadísticas"""
+        result = f"Análisis: {self.parses}\n"
+        for name in self.COUNTERS:
+            result += f"  {name}: {getattr(self, name)}\n"
+        for phase, seconds in sorted(self.phase_times.items()):
+            result += f"  tiempo[{phase}]: {seconds * 1000:.3f} ms\n"
+        hot = self.hot_productions(5)
+        if hot:
+            result += "Producciones más usadas:\n"
+            for (left, right), uses, failures in hot:
+                result += f"  {left} → {right}: {uses} intentos, {failures} fallos\n"
+        return result
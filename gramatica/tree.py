@@ -39,19 +39,21 @@ class DerivationTree:
         if node is None:
             node = self.root
         
-        result = prefix
-        if node != self.root:
-            result += "└── " if is_last else "├── "
-        result += node.symbol + "\n"
+        # Recorrido con pila explícita: los árboles profundos no agotan la recursión
+        lines = []
+        stack = [(node, prefix, is_last)]
+        while stack:
+            node, prefix, is_last = stack.pop()
+            if node is self.root:
+                lines.append(prefix + node.symbol + "\n")
+            else:
+                lines.append(prefix + ("└── " if is_last else "├── ") + node.symbol + "\n")
+                prefix += "    " if is_last else "│   "
+            last = len(node.children) - 1
+            for i in range(last, -1, -1):
+                stack.append((node.children[i], prefix, i == last))
         
-        if node != self.root:
-            prefix += "    " if is_last else "│   "
-        
-        for i, child in enumerate(node.children):
-            is_last_child = (i == len(node.children) - 1)
-            result += self.to_text(child, prefix, is_last_child)
-        
-        return result
+        return "".join(lines)
     
     def __str__(self):
         """Representación en cadena del árbol"""
@@ -0,0 +1,225 @@
+"""
+Módulo de conjuntos de visitados para la generación de cadenas
+
+StringGenerator registra cada forma sentencial explorada para no repetirla.
+Con muchas cadenas ese registro domina la memoria, así que se puede elegir:
+
+    ExactVisitedSet     set de Python: exacto, memoria sin límite
+    BloomVisitedSet     filtro de Bloom de tamaño fijo: memoria acotada, pero
+                        un falso positivo descarta una forma nueva (la
+                        generación puede omitir cadenas)
+    SpillingVisitedSet  guarda en memoria hasta un máximo y vuelca el resto a
+                        SQLite en disco: exacto, memoria acotada, más lento
+
+Todos ofrecen add(elemento) → True si era nuevo, en una sola consulta.
+"""
+
+from typing import Iterable, List, Optional
+from array import array
+from functools import lru_cache
+import math
+import os
+import random
+
+
+class VisitedSet:
+    """Clase base para los conjuntos de visitados"""
+
+    # True si nunca confunde un elemento nuevo con uno ya visto
+    exact = True
+
+    def add(self, item: str) -> bool:
+        """
+        Registra un elemento
+
+        Returns:
+            True si no estaba (o el conjunto no puede asegurar que estuviera)
+        """
+        raise NotImplementedError
+
+    def __len__(self) -> int:
+        """Número de elementos registrados"""
+        raise NotImplementedError
+
+    def false_positive_rate(self) -> float:
+        """Probabilidad estimada de tomar ahora un elemento nuevo por visitado"""
+        return 0.0
+
+    def close(self):
+        """Libera los recursos (archivos temporales)"""
+
+    def __enter__(self) -> 'VisitedSet':
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+        return False
+
+
+class ExactVisitedSet(VisitedSet):
+    """Conjunto exacto en memoria"""
+
+    def __init__(self):
+        self._items = set()
+
+    def add(self, item: str) -> bool:
+        items = self._items
+        if item in items:
+            return False
+        items.add(item)
+        return True
+
+    def __contains__(self, item: str) -> bool:
+        return item in self._items
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+
+@lru_cache(maxsize=None)
+def _bloom_patterns(hashes: int, count: int) -> List[int]:
+    """
+    Patrones de `hashes` bits de BloomVisitedSet
+
+    Solo dependen de k, así que se calculan una vez por proceso: cada
+    generación crea su filtro y sortear los patrones costaba más que usarlo.
+    La lista es compartida y no debe modificarse.
+    """
+    rng = random.Random(hashes)
+    return [sum(1 << bit for bit in rng.sample(range(64), hashes)) for _ in range(count)]
+
+
+class BloomVisitedSet(VisitedSet):
+    """
+    Filtro de Bloom por bloques con memoria fija
+
+    Cada elemento marca k bits dentro de una sola palabra de 64 bits, elegidos
+    de una tabla de patrones precalculados: una consulta es un acceso a memoria
+    y una operación de bits, sin bucle por hash. Usa el hash de la cadena que
+    Python ya guarda en cada str, por lo que solo es válido dentro del proceso.
+    """
+
+    exact = False
+
+    # Patrones distintos de k bits (más patrones, menos coincidencias entre elementos del mismo bloque)
+    PATTERNS = 1 << 12
+
+    def __init__(self, max_memory: int = 1 << 20, expected_items: Optional[int] = None):
+        """
+        Args:
+            max_memory: Bytes del filtro
+            expected_items: Elementos previstos, para elegir k (por defecto,
+                los que caben con ~1 % de falsos positivos: 10 bits por elemento)
+        """
+        self._blocks = array('Q', bytes(max(8, max_memory // 8 * 8)))
+        bits = len(self._blocks) * 64
+        if expected_items is None:
+            expected_items = max(1, bits // 10)
+        self._hashes = min(16, max(1, round(bits / expected_items * math.log(2))))
+        self._patterns = _bloom_patterns(self._hashes, self.PATTERNS)
+        self._count = 0
+
+    def add(self, item: str) -> bool:
+        value = hash(item)
+        blocks = self._blocks
+        block = (value >> 12) % len(blocks)
+        pattern = self._patterns[value & (self.PATTERNS - 1)]
+        word = blocks[block]
+        if word & pattern == pattern:
+            return False
+        blocks[block] = word | pattern
+        self._count += 1
+        return True
+
+    def __contains__(self, item: str) -> bool:
+        value = hash(item)
+        pattern = self._patterns[value & (self.PATTERNS - 1)]
+        return self._blocks[(value >> 12) % len(self._blocks)] & pattern == pattern
+
+    def __len__(self) -> int:
+        """Elementos nuevos registrados (sin contar los descartados por falsos positivos)"""
+        return self._count
+
+    def false_positive_rate(self) -> float:
+        """
+        Media sobre los bloques de la probabilidad de que un patrón caiga en bits ya marcados
+
+        Con s bits marcados en un bloque es C(s, k) / C(64, k); se mide sobre el
+        llenado real, no sobre una fórmula que supone bits independientes. Se
+        suma la probabilidad de repetir el patrón de otro elemento del bloque.
+        """
+        k = self._hashes
+        by_fill = [math.comb(s, k) / math.comb(64, k) for s in range(65)]
+        rate = sum(by_fill[bin(word).count('1')] for word in self._blocks) / len(self._blocks)
+        same_pattern = min(1.0, self._count / len(self._blocks) / self.PATTERNS)
+        return rate + (1 - rate) * same_pattern
+
+
+class SpillingVisitedSet(VisitedSet):
+    """
+    Conjunto exacto que vuelca a SQLite lo que no cabe en memoria
+
+    Los elementos volcados se resumen además en un filtro de Bloom, de modo que
+    casi todos los elementos nuevos se confirman sin consultar el disco.
+    """
+
+    def __init__(self, max_items: int = 100_000, path: Optional[str] = None, bloom_memory: int = 1 << 20):
+        """
+        Args:
+            max_items: Elementos que se guardan en memoria antes de volcar
+            path: Archivo SQLite (por defecto uno temporal que se borra al cerrar)
+            bloom_memory: Bytes del filtro de Bloom de los elementos volcados
+        """
+        # Importación diferida: sqlite3 y tempfile solo hacen falta si se elige este conjunto
+        import sqlite3
+        import tempfile
+        self.max_items = max_items
+        self._memory = set()
+        self._spilled = 0
+        self._bloom = BloomVisitedSet(bloom_memory)
+        self._owns_file = path is None
+        if path is None:
+            handle, path = tempfile.mkstemp(suffix=".sqlite", prefix="visitados_")
+            os.close(handle)
+        self.path = path
+        self._db = sqlite3.connect(path)
+        self._db.execute("PRAGMA journal_mode=OFF")
+        self._db.execute("PRAGMA synchronous=OFF")
+        self._db.execute("CREATE TABLE IF NOT EXISTS visited (item TEXT PRIMARY KEY) WITHOUT ROWID")
+
+    def add(self, item: str) -> bool:
+        memory = self._memory
+        if item in memory:
+            return False
+        if self._spilled and item in self._bloom and self._on_disk(item):
+            return False
+        memory.add(item)
+        if len(memory) >= self.max_items:
+            self._spill(memory)
+        return True
+
+    def _on_disk(self, item: str) -> bool:
+        """Consulta SQLite"""
+        return self._db.execute("SELECT 1 FROM visited WHERE item = ?", (item,)).fetchone() is not None
+
+    def _spill(self, items: Iterable[str]):
+        """Vuelca la parte en memoria al disco"""
+        self._db.executemany("INSERT OR IGNORE INTO visited VALUES (?)", ((item,) for item in items))
+        self._db.commit()
+        for item in items:
+            self._bloom.add(item)
+        self._spilled += len(self._memory)
+        self._memory = set()
+
+    def __contains__(self, item: str) -> bool:
+        return item in self._memory or (self._spilled > 0 and item in self._bloom and self._on_disk(item))
+
+    def __len__(self) -> int:
+        return len(self._memory) + self._spilled
+
+    def close(self):
+        if self._db is not None:
+            self._db.close()
+            self._db = None
+            if self._owns_file and os.path.exists(self.path):
+                os.unlink(self.path)
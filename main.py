@@ -1,10 +1,14 @@
 """
 Punto de entrada principal para la aplicación
 Analizador Sintáctico y Generador de Lenguajes
+
+Sin argumentos abre la interfaz gráfica; con una orden (reconocer, generar)
+trabaja sin interfaz y sin importar tkinter (ver gramatica/cli.py).
 """
 
-from gui import main
+import sys
 
-if __name__ == "__main__":
-    main()
+from gramatica.cli import main
 
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,7 @@
+"""Configuración de pytest: las pruebas importan el paquete desde la raíz del repositorio"""
+
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
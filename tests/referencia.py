@@ -0,0 +1,175 @@
+"""
+Referencia para las pruebas: gramáticas aleatorias pequeñas y un reconocedor de Earley
+
+El reconocedor sigue la semántica común de los motores: la cadena se separa
+con el analizador léxico voraz (el terminal más largo en cada posición) y se
+decide si la secuencia de terminales pertenece al lenguaje. Es lento pero
+simple, y no comparte código con los motores salvo la separación de
+producciones en símbolos.
+"""
+
+import random
+from typing import Dict, List, Optional, Set, Tuple
+
+from gramatica.grammar import Grammar
+from gramatica.parser import split_production
+from gramatica.tree import DerivationTree
+
+# Conjuntos de terminales; varios se solapan (uno es prefijo de otro)
+TERMINAL_SETS = [["a", "b"], ["a", "b", "c"], ["a", "ab", "b"], ["a", "aa", "b"], ["x", "xy", "y", "z"]]
+
+# Solo en gramáticas Tipo 2: "A" es terminal y, si la gramática lo tiene, también no terminal
+DUAL_TERMINAL_SET = ["a", "ab", "A"]
+
+NON_TERMINALS = ["S", "A", "B", "C"]
+
+
+def make_grammar(productions: Dict[str, List[str]], terminals: List[str], start: str = "S",
+                 grammar_type: str = "Tipo 2") -> Grammar:
+    """Construye una gramática con los no terminales de productions"""
+    return Grammar.from_dict({
+        "name": "prueba",
+        "type": grammar_type,
+        "non_terminals": list(productions),
+        "terminals": terminals,
+        "productions": productions,
+        "start_symbol": start,
+    })
+
+
+def random_grammar(rng: random.Random, regular: bool = False) -> Grammar:
+    """
+    Gramática aleatoria con 1 a 4 no terminales, producciones ε y recursión
+    (también por la izquierda); si regular, lineal por la derecha (Tipo 3)
+    y sin símbolos que sean a la vez terminal y no terminal
+    """
+    terminals = rng.choice(TERMINAL_SETS if regular else TERMINAL_SETS + [DUAL_TERMINAL_SET])
+    non_terminals = NON_TERMINALS[:rng.randint(1, len(NON_TERMINALS))]
+    productions = {}
+    for left in non_terminals:
+        rights = set()
+        for _ in range(rng.randint(1, 3)):
+            roll = rng.random()
+            if roll < 0.15:
+                rights.add("ε")
+            elif regular:
+                tail = " " + rng.choice(non_terminals) if roll < 0.75 else ""
+                rights.add(rng.choice(terminals) + tail)
+            else:
+                rights.add(" ".join(rng.choice(terminals + non_terminals) for _ in range(rng.randint(1, 3))))
+        productions[left] = sorted(rights)
+    return make_grammar(productions, terminals, grammar_type="Tipo 3" if regular else "Tipo 2")
+
+
+def random_strings(rng: random.Random, grammar: Grammar, count: int = 30, max_length: int = 6) -> List[str]:
+    """Cadenas sobre los caracteres de los terminales (incluida la vacía)"""
+    alphabet = sorted({char for terminal in grammar.terminals for char in terminal})
+    strings = {""}
+    while len(strings) < count:
+        strings.add("".join(rng.choice(alphabet) for _ in range(rng.randint(1, max_length))))
+    return sorted(strings)
+
+
+def tokenize(grammar: Grammar, string: str) -> Optional[List[str]]:
+    """Terminales del analizador léxico voraz, o None si algún carácter no encaja"""
+    terminals = sorted((terminal for terminal in grammar.terminals if terminal), key=len, reverse=True)
+    tokens = []
+    pos = 0
+    while pos < len(string):
+        for terminal in terminals:
+            if string.startswith(terminal, pos):
+                tokens.append(terminal)
+                pos += len(terminal)
+                break
+        else:
+            return None
+    return tokens
+
+
+def rules(grammar: Grammar) -> List[Tuple[str, Tuple[str, ...]]]:
+    """Producciones como (izquierda, símbolos) sin los ε"""
+    non_terminals = sorted(grammar.non_terminals, key=len, reverse=True)
+    terminals = sorted(grammar.terminals, key=len, reverse=True)
+    return [(left, tuple(symbol for symbol in split_production(right, non_terminals, terminals)
+                         if symbol not in ("ε", "")))
+            for left, rights in grammar.productions.items() for right in rights]
+
+
+def accepts(grammar: Grammar, string: str) -> bool:
+    """Reconocedor de Earley sobre los terminales de tokenize()"""
+    tokens = tokenize(grammar, string)
+    if tokens is None:
+        return False
+    productions = rules(grammar)
+    by_left: Dict[str, List[int]] = {}
+    for i, (left, _) in enumerate(productions):
+        by_left.setdefault(left, []).append(i)
+
+    # Símbolos anulables: al predecirlos también se avanza sobre ellos
+    nullable: Set[str] = set()
+    changed = True
+    while changed:
+        changed = False
+        for left, symbols in productions:
+            if left not in nullable and all(symbol in nullable for symbol in symbols):
+                nullable.add(left)
+                changed = True
+
+    # Ítems (producción, punto, origen); un símbolo con producciones que también
+    # es terminal puede reconocerse de las dos formas
+    chart: List[Set[Tuple[int, int, int]]] = [set() for _ in range(len(tokens) + 1)]
+    for k in range(len(tokens) + 1):
+        pending = [(i, 0, 0) for i in by_left.get(grammar.start_symbol, [])] if k == 0 else list(chart[k])
+        chart[k].update(pending)
+        while pending:
+            rule, dot, origin = pending.pop()
+            left, symbols = productions[rule]
+            added = []
+            if dot < len(symbols):
+                symbol = symbols[dot]
+                added.extend((i, 0, k) for i in by_left.get(symbol, []))
+                if symbol in nullable:
+                    added.append((rule, dot + 1, origin))
+                if symbol in grammar.terminals and k < len(tokens) and tokens[k] == symbol:
+                    chart[k + 1].add((rule, dot + 1, origin))
+            else:
+                added.extend((i, d + 1, o) for i, d, o in chart[origin]
+                             if d < len(productions[i][1]) and productions[i][1][d] == left)
+            for item in added:
+                if item not in chart[k]:
+                    chart[k].add(item)
+                    pending.append(item)
+
+    return any(productions[rule][0] == grammar.start_symbol and dot == len(productions[rule][1]) and origin == 0
+               for rule, dot, origin in chart[len(tokens)])
+
+
+def check_tree(grammar: Grammar, tree: DerivationTree, string: str):
+    """
+    Falla (AssertionError) si el árbol no es una derivación de string
+
+    Cada nodo interno usa una producción de su símbolo o reconoce su símbolo
+    como terminal (con una hoja igual como único hijo), y las hojas distintas
+    de ε son los terminales de tokenize().
+    """
+    non_terminals = sorted(grammar.non_terminals, key=len, reverse=True)
+    terminals = sorted(grammar.terminals, key=len, reverse=True)
+    expansions = {left: [["ε" if symbol == "" else symbol for symbol in split_production(right, non_terminals, terminals)]
+                         for right in rights]
+                  for left, rights in grammar.productions.items()}
+
+    assert tree.root.symbol == grammar.start_symbol
+    leaves = []
+    stack = [tree.root]
+    while stack:
+        node = stack.pop()
+        if node.is_leaf():
+            if node.symbol != "ε":
+                assert node.symbol in grammar.terminals, node.symbol
+                leaves.append(node.symbol)
+            continue
+        children = [child.symbol for child in node.children]
+        matched = node.symbol in grammar.terminals and children == [node.symbol] and node.children[0].is_leaf()
+        assert matched or children in expansions.get(node.symbol, []), (node.symbol, children)
+        stack.extend(reversed(node.children))
+    assert leaves == tokenize(grammar, string), (leaves, string)
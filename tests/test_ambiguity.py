@@ -0,0 +1,33 @@
+"""Pruebas del contador de derivaciones: cuenta sobre los terminales del analizador léxico voraz"""
+
+import random
+
+import pytest
+
+from gramatica.ambiguity import DerivationCounter
+
+from referencia import accepts, make_grammar, random_grammar, random_strings
+
+
+def test_counts_trees_of_ambiguous_grammar():
+    counter = DerivationCounter(make_grammar({"S": ["S S", "a"]}, ["a"]))
+    assert [counter.count("a" * n) for n in range(1, 6)] == [1, 1, 2, 5, 14]
+    assert counter.analyze("aaa").ambiguous
+
+
+def test_overlapping_terminals_follow_greedy_lexer():
+    grammar = make_grammar({"S": ["a B", "ab"], "B": ["b", "b B"]}, ["a", "ab", "b"])
+    counter = DerivationCounter(grammar)
+    # "abb" se separa en ab·b: ninguna derivación, aunque a·b·b encajaría en S → a B
+    assert counter.count("abb") == 0
+    assert counter.count("ab") == 1
+
+
+@pytest.mark.parametrize("seed", range(3))
+def test_random_grammars_match_reference(seed):
+    rng = random.Random(seed)
+    for _ in range(60):
+        grammar = random_grammar(rng)
+        counter = DerivationCounter(grammar)
+        for string in random_strings(rng, grammar, count=15):
+            assert (counter.count(string) > 0) == accepts(grammar, string), (grammar.productions, string)
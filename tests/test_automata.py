@@ -0,0 +1,76 @@
+"""Pruebas del AFD perezoso, de las operaciones de lenguajes y del buscador"""
+
+import random
+
+import pytest
+
+from gramatica.automata import compile_regular, difference, intersection, is_equivalent, shortest_string, union
+from gramatica.parser import Type3Parser
+from gramatica.scanner import OVERLAPPING, RegularScanner
+
+from referencia import accepts, make_grammar, random_grammar, random_strings
+
+
+def run(dfa, string) -> bool:
+    """Acepta o no la cadena el autómata (también productos, que no tienen accepts)"""
+    state = dfa.initial
+    for unit in string:
+        state = dfa.step(state, unit)
+    return dfa.is_accepting(state)
+
+
+def test_dfa_uses_greedy_tokens():
+    # Con a, ab y b, "abb" solo se separa como ab b
+    grammar = make_grammar({"S": ["a B", "ab"], "B": ["b", "b B"]}, ["a", "ab", "b"], grammar_type="Tipo 3")
+    dfa = compile_regular(grammar)
+    assert dfa.accepts("ab") and not dfa.accepts("abb")
+    assert compile_regular(grammar, binary=True).accepts(b"ab")
+    assert shortest_string(grammar) == "ab"
+
+
+@pytest.mark.parametrize("seed", range(4))
+def test_random_dfa_and_products(seed):
+    rng = random.Random(seed)
+    for _ in range(60):
+        first = random_grammar(rng, regular=True)
+        second = random_grammar(rng, regular=True)
+        dfa, binary, parser = compile_regular(first), compile_regular(first, binary=True), Type3Parser(first)
+        products = [(intersection(first, second), lambda x, y: x and y),
+                    (union(first, second), lambda x, y: x or y),
+                    (difference(first, second), lambda x, y: x and not y)]
+        for string in random_strings(rng, first):
+            expected, other = accepts(first, string), accepts(second, string)
+            assert dfa.accepts(string) == binary.accepts(string.encode()) == parser.recognize(string) == expected
+            for product, operation in products:
+                assert run(product, string) == operation(expected, other), (first.productions, second.productions, string)
+
+        witness = shortest_string(first)
+        assert witness is None or accepts(first, witness)
+        equivalent, counterexample = is_equivalent(first, second)
+        assert equivalent or accepts(first, counterexample) != accepts(second, counterexample)
+
+
+@pytest.mark.parametrize("seed", range(4))
+def test_random_scans_match_brute_force(seed):
+    rng = random.Random(seed)
+    for _ in range(40):
+        grammar = random_grammar(rng, regular=True)
+        scanner = RegularScanner(grammar)
+        alphabet = sorted({char for terminal in grammar.terminals for char in terminal})
+        for _ in range(5):
+            text = "".join(rng.choice(alphabet) for _ in range(rng.randint(0, 10)))
+            found = [(i, j) for j in range(len(text) + 1) for i in range(j) if accepts(grammar, text[i:j])]
+            assert list(scanner.scan(text, OVERLAPPING)) == found
+            assert list(scanner.scan(text.encode(), OVERLAPPING)) == found
+
+            # Más a la izquierda y más larga, reanudando en su fin
+            longest = []
+            i = 0
+            while i < len(text):
+                end = max((j for i2, j in found if i2 == i), default=None)
+                if end is None:
+                    i += 1
+                else:
+                    longest.append((i, end))
+                    i = end
+            assert list(scanner.scan(text)) == longest, (grammar.productions, text)
@@ -0,0 +1,22 @@
+"""Pruebas de la referencia del banco de benchmarks"""
+
+import json
+
+from gramatica.benchmark import main
+
+QUICK = ["--familias", "palabras_clave", "--rapido", "--repeticiones", "1"]
+
+
+def test_missing_baseline_is_written_then_compared(tmp_path):
+    path = tmp_path / "referencia.json"
+    assert main(["--referencia", str(path)] + QUICK) == 0
+    assert json.loads(path.read_text(encoding="utf-8"))["results"]
+    assert main(["--referencia", str(path), "--tolerancia", "100"] + QUICK) == 0
+
+
+def test_unreadable_baseline_is_a_clean_error(tmp_path, capsys):
+    for content in ["{", '{"results": [1]}', "[]"]:
+        path = tmp_path / "referencia.json"
+        path.write_text(content, encoding="utf-8")
+        assert main(["--referencia", str(path)] + QUICK) == 2
+        assert "Error: La referencia" in capsys.readouterr().err
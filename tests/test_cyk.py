@@ -0,0 +1,48 @@
+"""Pruebas de CYK: secuencial y en paralelo deciden como Type2Parser"""
+
+import random
+
+import pytest
+
+from gramatica import cyk
+from gramatica.cyk import CYKParser, ParallelCYKParser
+from gramatica.grammar import Grammar
+from gramatica.parser import Type2Parser
+
+from referencia import accepts, make_grammar, random_grammar, random_strings
+
+
+def test_overlapping_terminals_follow_greedy_lexer():
+    parser = CYKParser(make_grammar({"S": ["a B", "ab"], "B": ["b", "b B"]}, ["a", "ab", "b"]))
+    assert not parser.recognize("abb")
+    assert parser.recognize("ab")
+
+
+def test_identifiers_example_matches_type2():
+    grammar = Grammar.load_from_file("ejemplo_gramatica_identificadores.json")
+    parser, reference = CYKParser(grammar), Type2Parser(grammar)
+    for string in ["", "0", "a0", "0a", "ab9", "S", "SS", "a-b"]:
+        assert parser.recognize(string) == reference.recognize(string), string
+
+
+@pytest.mark.parametrize("seed", range(3))
+def test_random_grammars_match_reference(seed):
+    rng = random.Random(seed)
+    for _ in range(60):
+        grammar = random_grammar(rng)
+        parser, reference = CYKParser(grammar), Type2Parser(grammar)
+        for string in random_strings(rng, grammar, count=15):
+            expected = accepts(grammar, string)
+            assert parser.recognize(string) == reference.recognize(string) == expected, (grammar.productions, string)
+
+
+def test_parallel_matches_sequential(monkeypatch):
+    # Cualquier antidiagonal se reparte entre los trabajadores
+    monkeypatch.setattr(cyk, "MIN_TASK_WORK", 1)
+    rng = random.Random(7)
+    with ParallelCYKParser(make_grammar({"S": ["S S", "a", "ab S"]}, ["a", "ab", "b"]),
+                           processes=2, threshold=1) as parser:
+        sequential = CYKParser(parser.grammar)
+        for _ in range(20):
+            string = "".join(rng.choice(["a", "ab", "b"]) for _ in range(rng.randint(1, 12)))
+            assert parser.recognize(string) == sequential.recognize(string) == accepts(parser.grammar, string), string
@@ -0,0 +1,68 @@
+"""Pruebas del banco diferencial: comparación con la referencia y recomendación por modo"""
+
+import json
+
+import pytest
+
+from gramatica import differential
+from gramatica.differential import run_differential, save_recommendation
+from gramatica.parser import ENGINE_RECOMMENDATIONS, Type2Parser, create_parser, load_engine_recommendations
+
+from referencia import make_grammar
+
+GRAMMAR = make_grammar({"S": ["a B", "ab"], "B": ["b", "b B"]}, ["a", "ab", "b"])
+CORPUS = ["", "a", "ab", "abb", "abbb", "ba", "abab"]
+GRAMMAR_ACCEPTS = {string: Type2Parser(GRAMMAR).recognize(string) for string in CORPUS}
+
+
+@pytest.fixture(autouse=True)
+def clean_recommendations():
+    ENGINE_RECOMMENDATIONS.clear()
+    yield
+    ENGINE_RECOMMENDATIONS.clear()
+
+
+def test_engines_agree_on_overlapping_terminals():
+    for mode in ("parse", "recognize"):
+        report = run_differential(GRAMMAR, CORPUS, mode=mode, repetitions=1)
+        report.assert_consistent()
+        assert set(report.agreeing) == {"tipo2", "incremental", "glr", "cyk"}
+        assert report.recommended in report.agreeing
+
+
+def test_engine_that_disagrees_with_reference_is_not_recorded(monkeypatch, tmp_path):
+    class Negated(Type2Parser):
+        def recognize(self, string, budget=None):
+            return not super().recognize(string, budget)
+
+    def fake_create_parser(grammar, engine="auto", mode="parse"):
+        return Negated(grammar) if engine == "cyk" else create_parser(grammar, engine, mode)
+
+    monkeypatch.setattr(differential, "create_parser", fake_create_parser)
+    # tipo2 se añade a los motores pedidos y, aunque empaten, su decisión es la esperada
+    report = run_differential(GRAMMAR, CORPUS, ["cyk"], mode="recognize", repetitions=1)
+    assert report.agreeing == ["tipo2"] and report.recommended == "tipo2"
+    assert all(disagreement.expected == GRAMMAR_ACCEPTS[disagreement.string] for disagreement in report.disagreements)
+    path = tmp_path / "motores.json"
+    save_recommendation(str(path), report)
+    saved = json.loads(path.read_text(encoding="utf-8"))[report.fingerprint]
+    assert list(saved["recognize"]["throughput"]) == ["tipo2"]
+
+
+def test_recommendations_are_kept_per_mode(tmp_path):
+    path = str(tmp_path / "motores.json")
+    recognize = run_differential(GRAMMAR, CORPUS, ["cyk"], mode="recognize", repetitions=1)
+    parse = run_differential(GRAMMAR, CORPUS, ["glr"], mode="parse", repetitions=1)
+    save_recommendation(path, recognize._replace(recommended="cyk"))
+    save_recommendation(path, parse._replace(recommended="glr"))
+    ENGINE_RECOMMENDATIONS.clear()
+
+    assert load_engine_recommendations(path) == 2
+    assert type(create_parser(GRAMMAR)).__name__ == "GLRParser"
+    assert type(create_parser(GRAMMAR, mode="recognize")).__name__ == "CYKParser"
+    # Un archivo antiguo, medido solo en recognize, no cambia el motor de parse
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump({recognize.fingerprint: {"engine": "cyk", "mode": "recognize"}}, f)
+    ENGINE_RECOMMENDATIONS.clear()
+    assert load_engine_recommendations(path) == 1
+    assert type(create_parser(GRAMMAR)).__name__ == "Type2Parser"
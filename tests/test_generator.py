@@ -0,0 +1,44 @@
+"""Pruebas del generador: cadenas del lenguaje con cualquier conjunto de visitados"""
+
+import functools
+import random
+
+import pytest
+
+from gramatica.budget import Budget, BudgetExceeded
+from gramatica.generator import StringGenerator
+from gramatica.parser import Type2Parser
+from gramatica.visited import BloomVisitedSet, ExactVisitedSet, SpillingVisitedSet
+
+from referencia import accepts, make_grammar, random_grammar
+
+
+def generate(grammar, factory, count=12):
+    try:
+        return StringGenerator(grammar, factory).generate_strings(count, Budget(max_steps=2000))
+    except BudgetExceeded as exceeded:
+        return exceeded.partial
+
+
+def test_overlapping_terminals_only_yield_members():
+    # S S da "yxyx", que el analizador léxico separa en y·xy·x: no pertenece al lenguaje
+    grammar = make_grammar({"S": ["S S", "y x"]}, ["x", "xy", "y", "z"])
+    assert generate(grammar, ExactVisitedSet) == ["yx"]
+
+
+@pytest.mark.parametrize("seed", range(3))
+def test_random_grammars_with_every_visited_set(seed):
+    rng = random.Random(seed)
+    spilling = functools.partial(SpillingVisitedSet, max_items=8, bloom_memory=64)
+    bloom = functools.partial(BloomVisitedSet, max_memory=64)
+    for _ in range(25):
+        grammar = random_grammar(rng, regular=rng.random() < 0.3)
+        reference = Type2Parser(grammar)
+        exact = generate(grammar, ExactVisitedSet)
+        # El conjunto que vuelca a disco es exacto: la misma búsqueda y las mismas cadenas
+        assert generate(grammar, spilling) == exact, grammar.productions
+        # El filtro de Bloom puede descartar formas, pero nunca emitir cadenas ajenas al lenguaje
+        for strings in (exact, generate(grammar, bloom)):
+            assert len(set(strings)) == len(strings)
+            assert all(reference.recognize(string) and accepts(grammar, string) for string in strings), \
+                (grammar.productions, strings)
@@ -0,0 +1,37 @@
+"""Pruebas del parser GLR: mismas decisiones que Type2Parser y bosque con todas las derivaciones"""
+
+import random
+
+import pytest
+
+from gramatica.glr import GLRParser
+from gramatica.parser import Type2Parser
+
+from referencia import accepts, check_tree, make_grammar, random_grammar, random_strings
+
+
+def test_overlapping_terminals_use_greedy_tokens():
+    grammar = make_grammar({"S": ["a B", "ab"], "B": ["b", "b B"]}, ["a", "ab", "b"])
+    parser = GLRParser(grammar)
+    assert parser.parse("ab")[0] and parser.parse("abbb")[0] is False
+    assert Type2Parser(grammar).parse("abbb")[0] is False
+
+
+def test_forest_keeps_every_derivation():
+    grammar = make_grammar({"S": ["S S", "a"]}, ["a"])
+    root = GLRParser(grammar).parse_forest("aaa")
+    assert root is not None and root.is_ambiguous()
+    assert len(root.alternatives) == 2
+
+
+@pytest.mark.parametrize("seed", range(4))
+def test_random_grammars_match_type2(seed):
+    rng = random.Random(seed)
+    for _ in range(60):
+        grammar = random_grammar(rng)
+        parser, reference = GLRParser(grammar), Type2Parser(grammar)
+        for string in random_strings(rng, grammar):
+            accepted, tree = parser.parse(string)
+            assert accepted == reference.parse(string)[0] == accepts(grammar, string), (grammar.productions, string)
+            if accepted:
+                check_tree(grammar, tree, string)
@@ -0,0 +1,68 @@
+"""Pruebas del análisis incremental: reanalizar equivale a analizar desde cero"""
+
+import random
+
+import pytest
+
+from gramatica.incremental import IncrementalParser, diff_edit
+from gramatica.parser import Type2Parser
+
+from referencia import accepts, check_tree, make_grammar, random_grammar
+
+
+def test_diff_edit():
+    assert diff_edit("abcdef", "abXdef") == (2, 1, "X")
+    assert diff_edit("abc", "abc") == (3, 0, "")
+    assert diff_edit("", "ab") == (0, 0, "ab")
+    assert diff_edit("aaa", "aa") == (2, 1, "")
+
+
+@pytest.mark.parametrize("productions, terminals, string", [
+    ({"S": ["a a", "S a S", "a"]}, ["a"], "aaaaaaa"),
+    ({"S": ["a A"], "A": ["B C"], "B": ["B C", "a A a", "C"], "C": ["ε"]}, ["a"], "aaaaa"),
+    ({"L": ["L , a", "a"]}, ["a", ","], "a,a,a"),
+    ({"S": ["S b", "ε"]}, ["b"], "bbb"),
+])
+def test_same_result_as_type2(productions, terminals, string):
+    grammar = make_grammar(productions, terminals, start=next(iter(productions)))
+    accepted, tree = IncrementalParser(grammar).parse(string)
+    assert accepted == Type2Parser(grammar).parse(string)[0] == accepts(grammar, string) == True
+    check_tree(grammar, tree, string)
+
+
+def test_long_right_recursive_list():
+    grammar = make_grammar({"L": ["a , L", "a"]}, ["a", ","], start="L")
+    parser = IncrementalParser(grammar)
+    text = ",".join("a" * 2000)
+    state = parser.parse_state(text)
+    assert state.accepted
+    state = parser.reparse(state, 2000, 1, "a,a")
+    assert state.accepted and state.text.count("a") == 2001
+    state = parser.update(state, state.text + ",")
+    assert not state.accepted and state.error.position == len(state.text)
+
+
+@pytest.mark.parametrize("seed", range(4))
+def test_random_edits_match_fresh_parse(seed):
+    rng = random.Random(seed)
+    for _ in range(40):
+        grammar = random_grammar(rng)
+        parser = IncrementalParser(grammar)
+        reference = Type2Parser(grammar)
+        alphabet = sorted(grammar.terminals)
+        state = parser.parse_state("")
+        for _ in range(15):
+            offset = rng.randint(0, len(state.text))
+            deleted = rng.randint(0, min(2, len(state.text) - offset))
+            inserted = "".join(rng.choice(alphabet) for _ in range(rng.randint(0, 2)))
+            if len(state.text) - deleted + len(inserted) > 8:
+                state = parser.parse_state(state.text[:4])
+                continue
+            state = parser.reparse(state, offset, deleted, inserted)
+            fresh = parser.parse_state(state.text)
+            assert state.accepted == fresh.accepted == accepts(grammar, state.text), (grammar.productions, state.text)
+            assert state.accepted == reference.parse(state.text)[0]
+            if state.accepted:
+                check_tree(grammar, state.tree, state.text)
+            else:
+                assert state.error == fresh.error
@@ -0,0 +1,50 @@
+"""Pruebas de los motores Tipo 3: autómata y expresión regular"""
+
+import random
+
+import pytest
+
+from gramatica.parser import Type2Parser, Type3Parser
+from gramatica.regex_compiler import RegexType3Parser, terminal_codes
+
+from referencia import accepts, check_tree, make_grammar, random_grammar, random_strings
+
+
+def overlapping_grammar():
+    """S → aB | ab, B → b | bB con los terminales a, ab y b ("ab" es a la vez terminal y prefijo)"""
+    return make_grammar({"S": ["a B", "ab"], "B": ["b", "b B"]}, ["a", "ab", "b"], grammar_type="Tipo 3")
+
+
+@pytest.mark.parametrize("string, expected", [("ab", True), ("abb", False), ("a", False), ("abab", False)])
+def test_overlapping_terminals_use_greedy_tokens(string, expected):
+    grammar = overlapping_grammar()
+    assert terminal_codes(grammar) is not None
+    regex = RegexType3Parser(grammar)
+    assert regex.recognize(string) == expected
+    assert regex.parse(string)[0] == expected
+    assert Type3Parser(grammar).parse(string)[0] == expected
+    assert Type2Parser(grammar).parse(string)[0] == expected
+    assert accepts(grammar, string) == expected
+
+
+def test_prefix_free_terminals_match_the_text():
+    grammar = make_grammar({"S": ["ab S", "c"]}, ["ab", "c"], grammar_type="Tipo 3")
+    regex = RegexType3Parser(grammar)
+    assert terminal_codes(grammar) is None and not regex.uses_fallback
+    assert regex.recognize("ababc") and not regex.recognize("abac")
+
+
+@pytest.mark.parametrize("seed", range(4))
+def test_random_regular_grammars(seed):
+    rng = random.Random(seed)
+    for _ in range(60):
+        grammar = random_grammar(rng, regular=True)
+        engines = [Type3Parser(grammar), RegexType3Parser(grammar), Type2Parser(grammar)]
+        for string in random_strings(rng, grammar):
+            expected = accepts(grammar, string)
+            for engine in engines:
+                accepted, result = engine.parse(string)
+                assert accepted == expected, (type(engine).__name__, grammar.productions, string)
+                assert engine.recognize(string) == expected
+                if accepted:
+                    check_tree(grammar, result, string)
@@ -0,0 +1,54 @@
+"""Pruebas de serialización: los árboles de cada motor se recuperan iguales de todos los formatos"""
+
+import io
+import random
+
+import pytest
+
+from gramatica import serialize
+from gramatica.parser import create_parser
+from gramatica.tree import TreeNode
+
+from referencia import check_tree, random_grammar, random_strings
+
+
+def same_tree(first: TreeNode, second: TreeNode) -> bool:
+    stack = [(first, second)]
+    while stack:
+        a, b = stack.pop()
+        if a.symbol != b.symbol or len(a.children) != len(b.children):
+            return False
+        stack.extend(zip(a.children, b.children))
+    return True
+
+
+@pytest.mark.parametrize("seed", range(3))
+def test_random_trees_round_trip(seed):
+    rng = random.Random(seed)
+    for _ in range(30):
+        regular = rng.random() < 0.3
+        grammar = random_grammar(rng, regular=regular)
+        trees = []
+        for engine in (["tipo3", "regex"] if regular else []) + ["tipo2", "glr", "incremental"]:
+            parser = create_parser(grammar, engine)
+            for string in random_strings(rng, grammar, count=10):
+                accepted, tree = parser.parse(string)
+                if accepted:
+                    trees.append((string, tree))
+        for string, tree in trees:
+            for fmt in ("json", "sexpr"):
+                assert same_tree(serialize.loads(serialize.dumps(tree, fmt), fmt).root, tree.root), (fmt, string)
+            decoded = serialize.decode_derivation(serialize.encode_derivation(tree, grammar), grammar)
+            assert same_tree(decoded.root, tree.root), (grammar.productions, string)
+            check_tree(grammar, decoded, string)
+
+        # Flujo de derivaciones, con None para las cadenas rechazadas
+        stream = io.BytesIO()
+        writer = serialize.DerivationWriter(stream, grammar)
+        for _, tree in trees:
+            writer.write(tree)
+            writer.write(None)
+        stream.seek(0)
+        read = list(serialize.read_derivations(stream, grammar))
+        assert len(read) == 2 * len(trees) and read[1::2] == [None] * len(trees)
+        assert all(same_tree(tree.root, got.root) for (_, tree), got in zip(trees, read[::2]))
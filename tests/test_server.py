@@ -0,0 +1,55 @@
+"""Pruebas del servidor de reconocimiento con el cliente local"""
+
+import asyncio
+import json
+
+import pytest
+
+from gramatica.parser import Type2Parser
+from gramatica.server import ParseClient, ParseServer, ServerError, _recognize_all
+
+from referencia import make_grammar
+
+
+def write_grammar(path, productions, terminals, grammar_type):
+    grammar = make_grammar(productions, terminals, grammar_type=grammar_type)
+    path.write_text(json.dumps(grammar.to_dict()), encoding="utf-8")
+    return str(path)
+
+
+def test_recognizes_both_types_and_reports_unknown_grammar(tmp_path):
+    grammars = {
+        "regular": write_grammar(tmp_path / "regular.json", {"S": ["a B", "ab"], "B": ["b", "b B"]},
+                                 ["a", "ab", "b"], "Tipo 3"),
+        "parentesis": write_grammar(tmp_path / "parentesis.json", {"S": ["( S ) S", "ε"]}, ["(", ")"], "Tipo 2"),
+    }
+
+    async def run():
+        async with ParseServer(grammars, workers=1) as server:
+            path = await server.start(path=str(tmp_path / "servidor.sock"))
+            async with await ParseClient.connect(path=path) as client:
+                regular, balanced = await asyncio.gather(client.recognize("regular", ["ab", "abb", "a"]),
+                                                         client.recognize("parentesis", ["(())()", "(()"]))
+                assert regular == [True, False, False]
+                assert balanced == [True, False]
+                with pytest.raises(ServerError, match="^Gramática desconocida: otra$"):
+                    await client.recognize("otra", ["a"])
+
+    asyncio.run(run())
+
+
+def test_unknown_engine_fails_at_startup(tmp_path):
+    path = write_grammar(tmp_path / "g.json", {"S": ["a S", "a"]}, ["a"], "Tipo 2")
+    with pytest.raises(ValueError, match="Motor de análisis desconocido"):
+        ParseServer({"g": path}, engine="inexistente")
+
+
+def test_failure_is_reported_per_string():
+    class Fragile(Type2Parser):
+        def recognize(self, string, budget=None):
+            if string == "b":
+                raise RuntimeError("fallo")
+            return super().recognize(string, budget)
+
+    parser = Fragile(make_grammar({"S": ["a S", "a"]}, ["a", "b"]))
+    assert _recognize_all(parser, ["a", "b", "aa"], None) == [True, {"error": "RuntimeError: fallo"}, True]